@@ -18,7 +18,7 @@ import numpy as np
 from matcher import (
     build_attribute_index, run_matching, normalize_text,
     extract_product_attributes, load_and_clean_nl_list,
-    build_nl_lookup, build_brand_index
+    build_nl_lookup, build_brand_index, clear_text_caches
 )
 
 
@@ -106,17 +106,25 @@ def benchmark_normalize_text(n_iterations: int = 10000):
     print("="*70)
 
     for test_str in test_strings:
+        # Cold: caches emptied before every call, so this times the full
+        # regex cascade (catalog load / first sight of a query)
         start = time.perf_counter()
         for _ in range(n_iterations):
+            clear_text_caches()
             _ = normalize_text(test_str)
         end = time.perf_counter()
+        cold_ms = (end - start) * 1000
 
-        elapsed_ms = (end - start) * 1000
-        per_call_us = elapsed_ms * 1000 / n_iterations
+        # Warm: every call after the first is a cache hit
+        start = time.perf_counter()
+        for _ in range(n_iterations):
+            _ = normalize_text(test_str)
+        end = time.perf_counter()
+        warm_ms = (end - start) * 1000
 
         print(f"\nInput: {test_str}")
-        print(f"  Total: {elapsed_ms:.2f}ms ({n_iterations} calls)")
-        print(f"  Per call: {per_call_us:.2f}μs")
+        print(f"  Cold: {cold_ms:.2f}ms ({n_iterations} calls, {cold_ms * 1000 / n_iterations:.2f}μs/call)")
+        print(f"  Warm: {warm_ms:.2f}ms ({n_iterations} calls, {warm_ms * 1000 / n_iterations:.2f}μs/call)")
 
 
 def benchmark_build_attribute_index():
@@ -126,10 +126,9 @@ def benchmark_build_attribute_index():
 
     # Add normalized_name column (required for build_attribute_index)
     print("Adding normalized_name column...")
-    df_nl['normalized_name'] = df_nl.apply(
-        lambda row: f"{row['brand']} {row['uae_assetname']}".lower(),
-        axis=1
-    )
+    df_nl['normalized_name'] = [
+        f"{b} {n}".lower() for b, n in zip(df_nl['brand'].tolist(), df_nl['uae_assetname'].tolist())
+    ]
 
     # Benchmark: Current implementation
     print("\nBenchmarking CURRENT implementation...")
@@ -167,10 +166,9 @@ def benchmark_build_nl_lookup():
     # Generate synthetic catalog
     print("\nGenerating synthetic NL catalog (10,000 rows)...")
     df_nl = generate_synthetic_nl_catalog(10000)
-    df_nl['normalized_name'] = df_nl.apply(
-        lambda row: f"{row['brand']} {row['uae_assetname']}".lower(),
-        axis=1
-    )
+    df_nl['normalized_name'] = [
+        f"{b} {n}".lower() for b, n in zip(df_nl['brand'].tolist(), df_nl['uae_assetname'].tolist())
+    ]
 
     # Benchmark: Current implementation
     print("\nBenchmarking CURRENT implementation...")
@@ -206,10 +204,9 @@ def benchmark_build_brand_index():
     # Generate synthetic catalog
     print("\nGenerating synthetic NL catalog (10,000 rows)...")
     df_nl = generate_synthetic_nl_catalog(10000)
-    df_nl['normalized_name'] = df_nl.apply(
-        lambda row: f"{row['brand']} {row['uae_assetname']}".lower(),
-        axis=1
-    )
+    df_nl['normalized_name'] = [
+        f"{b} {n}".lower() for b, n in zip(df_nl['brand'].tolist(), df_nl['uae_assetname'].tolist())
+    ]
 
     # Benchmark: Current implementation
     print("\nBenchmarking CURRENT implementation...")
@@ -357,10 +354,9 @@ def benchmark_run_matching_end_to_end():
     # Generate synthetic data
     print("\nGenerating synthetic NL catalog (5,000 rows)...")
     df_nl = generate_synthetic_nl_catalog(5000)
-    df_nl['normalized_name'] = df_nl.apply(
-        lambda row: f"{row['brand']} {row['uae_assetname']}".lower(),
-        axis=1
-    )
+    df_nl['normalized_name'] = [
+        f"{b} {n}".lower() for b, n in zip(df_nl['brand'].tolist(), df_nl['uae_assetname'].tolist())
+    ]
 
     print("Generating synthetic input sheet (500 rows)...")
     df_input = generate_synthetic_input_sheet(500)
@@ -13,6 +13,9 @@ Version: FULLY FIXED + NL catalog rebuilt with years (Feb 2026)
 import io
 import json
 import os
+import re
+from collections import defaultdict
+from itertools import islice
 import streamlit as st
 import pandas as pd
 
@@ -20,7 +23,7 @@ from matcher import (
     load_and_clean_nl_list,
     build_nl_lookup,
     build_brand_index,
-    build_attribute_index,
+    load_or_build_attribute_index,
     build_signature_index,
     run_matching,
     parse_nl_sheet,
@@ -47,6 +50,7 @@ from matcher import (
     extract_model_family_key,
     normalize_text,
     normalize_brand,
+    warm_text_caches,
 )
 
 def _parse_alternatives(raw):
@@ -61,6 +65,19 @@ def _parse_alternatives(raw):
         return []
 
 
+def _parse_alt_ids(raw):
+    """Extract alternative UAE IDs from dicts (v2) or raw strings (v1)."""
+    alt_ids = []
+    for a in _parse_alternatives(raw):
+        if isinstance(a, dict):
+            aid = a.get('uae_assetid', '')
+            if aid:
+                alt_ids.append(aid)
+        elif isinstance(a, str):
+            alt_ids.append(a)
+    return alt_ids
+
+
 # ---------------------------------------------------------------------------
 # MMS enrichment: UAE → MMS mapping
 # ---------------------------------------------------------------------------
@@ -119,8 +136,8 @@ def load_mms_mapping():
             }
         else:
             # Ambiguous: multiple distinct MMS IDs for same UAE ID
-            cands = [{'mms_asset_id': r['MMS AssetId'], 'mms_asset_label': r['MMS Asset Label']}
-                     for _, r in grp.iterrows()]
+            cands = [{'mms_asset_id': mid, 'mms_asset_label': lbl}
+                     for mid, lbl in zip(grp['MMS AssetId'], grp['MMS Asset Label'])]
             mapping[uae_id] = {
                 'mms_asset_id': '',
                 'mms_asset_label': '',
@@ -254,6 +271,10 @@ st.sidebar.header("⚙️ Settings")
 # Fixed threshold at 85% - hybrid matching with auto-select handles everything
 threshold = SIMILARITY_THRESHOLD
 
+# Worker processes per sheet: MATCHING_JOBS env var, -1 = every usable CPU,
+# 1 = match in the server process (lowest memory)
+matching_jobs = int(os.environ.get('MATCHING_JOBS', '-1'))
+
 st.sidebar.markdown("**Confidence Tiers:**")
 st.sidebar.markdown("🟢 **HIGH (≥90%)** — MATCHED status (auto-selected if multiple variants)")
 st.sidebar.markdown("🟡 **MEDIUM (85-89%)** — REVIEW REQUIRED (attributes differ)")
@@ -358,6 +379,18 @@ _MMS_ANALYST_HIDE = {
 }
 
 
+# Result exports go through xlsxwriter, which streams cell data straight to
+# the XML writer instead of building an openpyxl cell object per value.
+# constant_memory is left off: pandas writes cells column by column and that
+# mode only accepts row-ordered writes. URL cells are kept as plain text.
+_EXPORT_ENGINE_KWARGS = {'options': {'strings_to_urls': False}}
+
+# Fixed category order for match_status — comparisons run on integer codes.
+_MATCH_STATUS_CATEGORIES = [
+    MATCH_STATUS_MATCHED, MATCH_STATUS_MULTIPLE,
+    MATCH_STATUS_SUGGESTED, MATCH_STATUS_NO_MATCH,
+]
+
 def _strip_mms_if_uae(cols):
     """Remove MMS columns from a list when Primary Output == UAE."""
     if primary_output_choice == 'MMS':
@@ -399,7 +432,7 @@ def _apply_analyst_review(df):
     return df[final]
 
 
-def _prepare_analyst_unmatched(df, df_nl_clean):
+def _prepare_analyst_unmatched(df, nl_name_by_id):
     """Prepare Unmatched sheet for Analyst View.
 
     - UAE mode: add nl_product_name (looked up from NL catalog), drop MMS cols.
@@ -412,11 +445,7 @@ def _prepare_analyst_unmatched(df, df_nl_clean):
             nl_names = []
             for uid in df['mapped_uae_assetid']:
                 uid_s = str(uid).strip() if pd.notna(uid) else ''
-                if uid_s:
-                    nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == uid_s]
-                    nl_names.append(nl_entry.iloc[0]['uae_assetname'] if len(nl_entry) > 0 else '')
-                else:
-                    nl_names.append('')
+                nl_names.append(nl_name_by_id.get(uid_s, '') if uid_s else '')
             insert_pos = list(df.columns).index('mapped_uae_assetid') + 1
             df.insert(insert_pos, 'nl_product_name', nl_names)
         _drop_mms = ['mms_asset_id', 'mms_asset_label', 'mms_lookup_status']
@@ -428,6 +457,143 @@ def _prepare_analyst_unmatched(df, df_nl_clean):
     return df
 
 
+def _build_summary_rows(results):
+    """Build Summary sheet rows: one per sheet, a spacer, then the TOTAL row.
+
+    Status counts come from one value_counts() per sheet and the per-sheet
+    auto-selected sums are reused for the totals.
+    """
+    status_counts = {name: df['match_status'].value_counts() for name, df in results.items()}
+    auto_selected_counts = {name: int(df['auto_selected'].sum()) for name, df in results.items()}
+
+    summary_rows = []
+    for sheet_name, df_result in results.items():
+        vc = status_counts[sheet_name]
+        total = len(df_result)
+        matched = int(vc.get(MATCH_STATUS_MATCHED, 0))
+        summary_rows.append({
+            'Sheet': sheet_name,
+            'Total Items': total,
+            'Matched': matched,
+            'Review Required': int(vc.get(MATCH_STATUS_SUGGESTED, 0)),
+            'No Match': int(vc.get(MATCH_STATUS_NO_MATCH, 0)),
+            'Auto-Selected': auto_selected_counts[sheet_name],
+            'Match Rate': f"{matched/total*100:.1f}%",
+        })
+
+    # Add totals row
+    total_items = sum(len(df) for df in results.values())
+    total_matched = sum(int(vc.get(MATCH_STATUS_MATCHED, 0)) for vc in status_counts.values())
+    total_review = sum(int(vc.get(MATCH_STATUS_SUGGESTED, 0)) for vc in status_counts.values())
+    total_no_match = sum(int(vc.get(MATCH_STATUS_NO_MATCH, 0)) for vc in status_counts.values())
+    total_auto_selected = sum(auto_selected_counts.values())
+
+    summary_rows.append({
+        'Sheet': '',
+        'Total Items': '',
+        'Matched': '',
+        'Review Required': '',
+        'No Match': '',
+        'Auto-Selected': '',
+        'Match Rate': '',
+    })
+    summary_rows.append({
+        'Sheet': 'TOTAL',
+        'Total Items': int(total_items),
+        'Matched': int(total_matched),
+        'Review Required': int(total_review),
+        'No Match': int(total_no_match),
+        'Auto-Selected': int(total_auto_selected),
+        'Match Rate': f"{total_matched/total_items*100:.1f}%",
+    })
+    return summary_rows
+
+
+def _partition_by_status(results):
+    """Split every result sheet by match_status in one groupby pass.
+
+    Returns (matched, unmatched, review): the first two are lists of
+    (sheet_name, frame) in sheet order; review frames already carry a
+    categorical 'Source Sheet' column, ready to be concatenated.
+    """
+    sheet_categories = list(results)
+    matched_writes, unmatched_writes, review_frames = [], [], []
+    for sheet_name, df_result in results.items():
+        parts = dict(list(df_result.groupby('match_status', sort=False, observed=True)))
+        matched = parts.get(MATCH_STATUS_MATCHED)
+        if matched is not None:
+            matched_writes.append((sheet_name, matched))
+        unmatched = parts.get(MATCH_STATUS_NO_MATCH)
+        if unmatched is not None:
+            unmatched_writes.append((sheet_name, unmatched))
+        review = parts.get(MATCH_STATUS_SUGGESTED)
+        if review is not None:
+            review = review.copy()
+            review.insert(0, 'Source Sheet', pd.Categorical(
+                [sheet_name] * len(review), categories=sheet_categories))
+            review_frames.append(review)
+    return matched_writes, unmatched_writes, review_frames
+
+
+def _build_auto_selected_details(results, df_nl_clean):
+    """Build the Auto-Selected Products sheet from per-sheet result frames.
+
+    Selected product names come from one hash join against the NL catalog
+    per sheet instead of a catalog scan per row. Original input columns
+    (url, grade, price…) are carried over, with blank cells left empty.
+    Returns an empty DataFrame when nothing was auto-selected.
+    """
+    nl_names = (
+        df_nl_clean[['uae_assetid', 'uae_assetname']]
+        .drop_duplicates('uae_assetid')
+        .rename(columns={'uae_assetid': 'mapped_uae_assetid',
+                         'uae_assetname': 'Selected Product'})
+    )
+    frames = []
+    for sheet_name, df_result in results.items():
+        auto_selected = df_result[df_result['auto_selected'] == True]
+        if len(auto_selected) == 0:
+            continue
+        merged = auto_selected.merge(nl_names, on='mapped_uae_assetid',
+                                     how='left', validate='m:1')
+        alt_ids = merged['alternatives'].map(_parse_alt_ids)
+        selected_ids = merged['mapped_uae_assetid']
+
+        # Original input metadata — keep only non-blank cells
+        orig_cols = [c for c in auto_selected.columns
+                     if c not in _MATCHER_ADDED_COLS and c != 'Source Sheet']
+        orig = merged[orig_cols]
+        orig = orig.where(orig.apply(lambda s: s.notna() & s.astype(str).str.strip().ne('')))
+        orig = orig.dropna(axis=1, how='all')
+
+        detail = pd.concat([
+            pd.DataFrame({
+                'Source Sheet': sheet_name,
+                'Your Product': merged['original_input'].astype(str),
+            }),
+            orig,
+        ], axis=1)
+        detail['Matched To'] = merged['matched_on']
+        detail['Match Score'] = merged['match_score'].map('{:.1f}%'.format)
+        detail['Selected ID'] = selected_ids
+        detail['Selected Product'] = merged['Selected Product'].fillna('N/A')
+        detail['Selection Reason'] = merged['selection_reason']
+        detail['Alternative IDs'] = alt_ids.map(lambda ids: ', '.join(ids) if ids else 'None')
+        detail['Total Variants'] = alt_ids.map(len) + 1
+        if mms_map:
+            mms = [_mms_lookup_single(uid, mms_map) for uid in selected_ids]
+            detail['mms_asset_id'] = [m[0] for m in mms]
+            detail['mms_asset_label'] = [m[1] for m in mms]
+            detail['mms_lookup_status'] = [m[2] for m in mms]
+            detail['primary_output_id'] = (detail['mms_asset_id'] if primary_output_choice == 'MMS'
+                                           else selected_ids)
+        frames.append(detail)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
 st.sidebar.divider()
 
 # Advanced mode toggle
@@ -478,9 +644,13 @@ def load_nl_catalog():
     df_nl_clean, nl_stats = load_nl_reference()
     nl_lookup = build_nl_lookup(df_nl_clean)
     nl_names = list(nl_lookup.keys())
+    warm_text_caches(nl_names, df_nl_clean['uae_assetname'].tolist())
     nl_brand_index = build_brand_index(df_nl_clean)
-    nl_attribute_index = build_attribute_index(df_nl_clean)
+    nl_attribute_index = load_or_build_attribute_index(df_nl_clean)
     nl_signature_index = build_signature_index(df_nl_clean)
+    # Asset ID -> product name (first catalog row wins, as with the old per-ID scans)
+    nl_name_by_id = (df_nl_clean.drop_duplicates('uae_assetid')
+                     .set_index('uae_assetid')['uae_assetname'].to_dict())
 
     return {
         'df': df_nl_clean,
@@ -490,6 +660,7 @@ def load_nl_catalog():
         'brand_index': nl_brand_index,
         'attribute_index': nl_attribute_index,
         'signature_index': nl_signature_index,
+        'name_by_id': nl_name_by_id,
     }
 
 # Load catalog (will be cached after first load)
@@ -510,6 +681,7 @@ nl_names = catalog['names']
 nl_brand_index = catalog['brand_index']
 nl_attribute_index = catalog['attribute_index']
 nl_signature_index = catalog['signature_index']
+nl_name_by_id = catalog['name_by_id']
 
 st.success(
     f"NL Reference: **{nl_stats.get('final', len(df_nl_clean)):,}** asset records loaded "
@@ -1030,6 +1202,8 @@ with tab2:
                     signature_index=nl_signature_index,
                     engine=run_engine,
                     widen_mode=_widen,
+                    # run_matching() keeps small sheets in-process
+                    n_jobs=matching_jobs,
                 )
                 progress.progress(1.0, text=f"✅ {engine_label}{sheet_name} complete!")
 
@@ -1042,16 +1216,24 @@ with tab2:
                     if col in df_result.columns:
                         df_result[col] = df_result[col].astype(str)
 
+                df_result['match_status'] = pd.Categorical(
+                    df_result['match_status'], categories=_MATCH_STATUS_CATEGORIES)
+                # Narrow dtypes: a real bool column and categoricals for low-cardinality labels
+                df_result['auto_selected'] = df_result['auto_selected'].eq(True)
+                for col in ('confidence', 'method'):
+                    df_result[col] = df_result[col].astype('category')
+
                 if run_engine == "v2" and selected_engine == "compare":
                     all_results_v2[sheet_name] = df_result
                     continue  # Don't overwrite v1 results
 
                 all_results[sheet_name] = df_result
 
-                matched = (df_result['match_status'] == MATCH_STATUS_MATCHED).sum()
-                multiple = (df_result['match_status'] == MATCH_STATUS_MULTIPLE).sum()
-                suggested = (df_result['match_status'] == MATCH_STATUS_SUGGESTED).sum()
-                no_match = (df_result['match_status'] == MATCH_STATUS_NO_MATCH).sum()
+                status_counts = df_result['match_status'].value_counts()
+                matched = int(status_counts.get(MATCH_STATUS_MATCHED, 0))
+                multiple = int(status_counts.get(MATCH_STATUS_MULTIPLE, 0))
+                suggested = int(status_counts.get(MATCH_STATUS_SUGGESTED, 0))
+                no_match = int(status_counts.get(MATCH_STATUS_NO_MATCH, 0))
                 total = len(df_result)
 
                 ca, cb, cc, cd = st.columns(4)
@@ -1083,8 +1265,9 @@ with tab2:
                         df_result.head(100).style.map(color_status, subset=['match_status']),
                         use_container_width=True, hide_index=True,
                     )
+                    status_counts = df_result['match_status'].value_counts()
                     # Show items needing review (SUGGESTED)
-                    n_suggested = (df_result['match_status'] == MATCH_STATUS_SUGGESTED).sum()
+                    n_suggested = int(status_counts.get(MATCH_STATUS_SUGGESTED, 0))
                     if n_suggested > 0:
                         with st.expander(f"Review {n_suggested} Items Requiring Review (85-94%)"):
                             st.dataframe(
@@ -1092,7 +1275,7 @@ with tab2:
                                 use_container_width=True, hide_index=True,
                             )
                     # Show unmatched items
-                    n_unmatched = (df_result['match_status'] == MATCH_STATUS_NO_MATCH).sum()
+                    n_unmatched = int(status_counts.get(MATCH_STATUS_NO_MATCH, 0))
                     if n_unmatched > 0:
                         with st.expander(f"View {n_unmatched} Unmatched Items"):
                             st.dataframe(
@@ -1115,9 +1298,10 @@ with tab2:
                         with col:
                             st.markdown(f"**{label} — {sheet_name}**")
                             _t = len(df)
-                            _m = int((df['match_status'] == MATCH_STATUS_MATCHED).sum())
-                            _r = int((df['match_status'] == MATCH_STATUS_SUGGESTED).sum())
-                            _n = int((df['match_status'] == MATCH_STATUS_NO_MATCH).sum())
+                            _vc = df['match_status'].value_counts()
+                            _m = int(_vc.get(MATCH_STATUS_MATCHED, 0))
+                            _r = int(_vc.get(MATCH_STATUS_SUGGESTED, 0))
+                            _n = int(_vc.get(MATCH_STATUS_NO_MATCH, 0))
                             st.metric("Matched", _m, f"{_m/_t*100:.1f}%")
                             st.metric("Review", _r, f"{_r/_t*100:.1f}%")
                             st.metric("No Match", _n, f"{_n/_t*100:.1f}%")
@@ -1159,55 +1343,41 @@ with tab2:
             # Output Excel with new structure
             # ------------------------------------------------------------------
             output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs=_EXPORT_ENGINE_KWARGS) as writer:
+                # Partition every sheet by status in a single groupby pass
+                matched_writes, unmatched_writes, all_review_required = _partition_by_status(all_results)
+
                 # 1. MATCHED sheets (one per uploaded sheet) - Only MATCHED items
-                for sheet_name, df_result in all_results.items():
-                    matched = df_result[df_result['match_status'] == MATCH_STATUS_MATCHED].copy()
-                    if len(matched) > 0:
-                        # Add real NL product name column for better UX
-                        nl_product_names = []
-                        for idx, row in matched.iterrows():
-                            asset_id = row['mapped_uae_assetid']
-                            nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == asset_id]
-                            nl_name = nl_entry.iloc[0]['uae_assetname'] if len(nl_entry) > 0 else 'N/A'
-                            nl_product_names.append(nl_name)
-
-                        # Insert nl_product_name after mapped_uae_assetid for logical ordering
-                        insert_pos = list(matched.columns).index('mapped_uae_assetid') + 1
-                        matched.insert(insert_pos, 'nl_product_name', nl_product_names)
-
-                        suffix = ' - Matched'
-                        safe_name = sheet_name[:31 - len(suffix)] + suffix
-                        out_matched = _apply_analyst_cols(matched, _ANALYST_MATCHED_COLS) if _analyst_view else matched
-                        out_matched.to_excel(writer, sheet_name=safe_name, index=False)
+                for sheet_name, matched in matched_writes:
+                    # Add real NL product name column for better UX
+                    nl_product_names = [nl_name_by_id.get(asset_id, 'N/A')
+                                        for asset_id in matched['mapped_uae_assetid']]
+
+                    # Insert nl_product_name after mapped_uae_assetid for logical ordering
+                    insert_pos = list(matched.columns).index('mapped_uae_assetid') + 1
+                    matched.insert(insert_pos, 'nl_product_name', nl_product_names)
+
+                    suffix = ' - Matched'
+                    safe_name = sheet_name[:31 - len(suffix)] + suffix
+                    out_matched = _apply_analyst_cols(matched, _ANALYST_MATCHED_COLS) if _analyst_view else matched
+                    out_matched.to_excel(writer, sheet_name=safe_name, index=False)
 
                 # 2. UNMATCHED sheets (one per uploaded sheet) - Only NO_MATCH items
-                for sheet_name, df_result in all_results.items():
-                    unmatched = df_result[df_result['match_status'] == MATCH_STATUS_NO_MATCH]
-                    if len(unmatched) > 0:
-                        suffix = ' - Unmatched'
-                        safe_name = sheet_name[:31 - len(suffix)] + suffix
-                        out_unmatched = _prepare_analyst_unmatched(unmatched, df_nl_clean) if _analyst_view else unmatched
-                        out_unmatched.to_excel(writer, sheet_name=safe_name, index=False)
+                for sheet_name, unmatched in unmatched_writes:
+                    suffix = ' - Unmatched'
+                    safe_name = sheet_name[:31 - len(suffix)] + suffix
+                    out_unmatched = _prepare_analyst_unmatched(unmatched, nl_name_by_id) if _analyst_view else unmatched
+                    out_unmatched.to_excel(writer, sheet_name=safe_name, index=False)
 
                 # 3. REVIEW REQUIRED sheet - All REVIEW_REQUIRED items (combined)
                 # Uses curated columns to avoid NaN when sheets have different input column names
                 # (e.g., List 1 has "manufacturer"/"name"/"type", List 2 has "Brand"/"Foxway Product Name"/"Category")
-                all_review_required = []
-                for sheet_name, df_result in all_results.items():
-                    review = df_result[df_result['match_status'] == MATCH_STATUS_SUGGESTED].copy()
-                    if len(review) > 0:
-                        # Add real NL product name column for review items
-                        nl_product_names = []
-                        for idx, row in review.iterrows():
-                            asset_id = row['mapped_uae_assetid']
-                            nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == asset_id]
-                            nl_name = nl_entry.iloc[0]['uae_assetname'] if len(nl_entry) > 0 else 'N/A'
-                            nl_product_names.append(nl_name)
-
-                        review['nl_product_name'] = nl_product_names
-                        review.insert(0, 'Source Sheet', sheet_name)
-                        all_review_required.append(review)
+                for review in all_review_required:
+                    # Add real NL product name column for review items
+                    nl_product_names = [nl_name_by_id.get(asset_id, 'N/A')
+                                        for asset_id in review['mapped_uae_assetid']]
+
+                    review['nl_product_name'] = nl_product_names
 
                 if all_review_required:
                     df_review_combined = pd.concat(all_review_required, ignore_index=True)
@@ -1218,8 +1388,8 @@ with tab2:
                         df_review_combined[f'alt_{i}_name'] = ''
                         df_review_combined[f'alt_{i}_score'] = ''
                         df_review_combined[f'alt_{i}_reason'] = ''
-                    for idx, row in df_review_combined.iterrows():
-                        alts = _parse_alternatives(row.get('alternatives', ''))
+                    for idx, raw in df_review_combined.get('alternatives', pd.Series(dtype=object)).items():
+                        alts = _parse_alternatives(raw)
                         for j, alt in enumerate(alts[:3], 1):
                             if isinstance(alt, dict):
                                 df_review_combined.at[idx, f'alt_{j}_id'] = alt.get('uae_assetid', '')
@@ -1233,8 +1403,8 @@ with tab2:
                         df_review_combined[f'blk_{i}_name'] = ''
                         df_review_combined[f'blk_{i}_score'] = ''
                         df_review_combined[f'blk_{i}_reason'] = ''
-                    for idx, row in df_review_combined.iterrows():
-                        blk = _parse_alternatives(row.get('blocked_candidates', ''))
+                    for idx, raw in df_review_combined.get('blocked_candidates', pd.Series(dtype=object)).items():
+                        blk = _parse_alternatives(raw)
                         for j, b in enumerate(blk[:3], 1):
                             if isinstance(b, dict):
                                 df_review_combined.at[idx, f'blk_{j}_id'] = b.get('uae_assetid', '')
@@ -1291,110 +1461,12 @@ with tab2:
                             writer, sheet_name='Review Required', index=False)
 
                 # 4. AUTO-SELECTED PRODUCTS sheet - All auto-selected items with details
-                auto_selected_details = []
-                for sheet_name, df_result in all_results.items():
-                    auto_selected = df_result[df_result['auto_selected'] == True].copy()
-                    for idx, row in auto_selected.iterrows():
-                        # Get original product name from the canonical field
-                        original_name = str(row.get('original_input', ''))
-
-                        # Parse alternatives (JSON-safe)
-                        alternatives = _parse_alternatives(row.get('alternatives', ''))
-                        # Extract IDs from dicts (v2) or use raw strings (v1)
-                        alt_ids = []
-                        for a in alternatives:
-                            if isinstance(a, dict):
-                                aid = a.get('uae_assetid', '')
-                                if aid:
-                                    alt_ids.append(aid)
-                            elif isinstance(a, str):
-                                alt_ids.append(a)
-
-                        # Get selected product details from NL catalog
-                        selected_id = row['mapped_uae_assetid']
-                        nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == selected_id]
-                        selected_name = nl_entry.iloc[0]['uae_assetname'] if len(nl_entry) > 0 else 'N/A'
-
-                        # MMS enrichment for auto-selected
-                        _mid, _mlbl, _mst = _mms_lookup_single(selected_id, mms_map)
-
-                        # Collect original input metadata (url, grade, price, etc.)
-                        _orig_meta = {}
-                        for c in row.index:
-                            if c not in _MATCHER_ADDED_COLS and c != 'Source Sheet':
-                                val = row[c]
-                                if pd.notna(val) and str(val).strip():
-                                    _orig_meta[c] = val
-
-                        detail = {
-                            'Source Sheet': sheet_name,
-                            'Your Product': original_name,
-                        }
-                        detail.update(_orig_meta)
-                        detail.update({
-                            'Matched To': row['matched_on'],
-                            'Match Score': f"{row['match_score']:.1f}%",
-                            'Selected ID': selected_id,
-                            'Selected Product': selected_name,
-                            'Selection Reason': row.get('selection_reason', 'N/A'),
-                            'Alternative IDs': ', '.join(alt_ids) if alt_ids else 'None',
-                            'Total Variants': len(alt_ids) + 1,
-                        })
-                        if mms_map:
-                            detail['mms_asset_id'] = _mid
-                            detail['mms_asset_label'] = _mlbl
-                            detail['mms_lookup_status'] = _mst
-                            detail['primary_output_id'] = _mid if primary_output_choice == 'MMS' else selected_id
-                        auto_selected_details.append(detail)
-
-                if auto_selected_details:
-                    df_auto_selected = pd.DataFrame(auto_selected_details)
+                df_auto_selected = _build_auto_selected_details(all_results, df_nl_clean)
+                if len(df_auto_selected) > 0:
                     df_auto_selected.to_excel(writer, sheet_name='Auto-Selected Products', index=False)
 
                 # 5. SUMMARY sheet - Overall statistics
-                summary_rows = []
-                for sheet_name, df_result in all_results.items():
-                    total = len(df_result)
-                    matched = int((df_result['match_status'] == MATCH_STATUS_MATCHED).sum())
-                    review = int((df_result['match_status'] == MATCH_STATUS_SUGGESTED).sum())
-                    no_match = int((df_result['match_status'] == MATCH_STATUS_NO_MATCH).sum())
-                    auto_selected = int(df_result['auto_selected'].sum())
-
-                    summary_rows.append({
-                        'Sheet': sheet_name,
-                        'Total Items': total,
-                        'Matched': matched,
-                        'Review Required': review,
-                        'No Match': no_match,
-                        'Auto-Selected': auto_selected,
-                        'Match Rate': f"{matched/total*100:.1f}%",
-                    })
-
-                # Add totals row
-                total_items = sum(len(df) for df in all_results.values())
-                total_matched = sum((df['match_status'] == MATCH_STATUS_MATCHED).sum() for df in all_results.values())
-                total_review = sum((df['match_status'] == MATCH_STATUS_SUGGESTED).sum() for df in all_results.values())
-                total_no_match = sum((df['match_status'] == MATCH_STATUS_NO_MATCH).sum() for df in all_results.values())
-                total_auto_selected = sum(df['auto_selected'].sum() for df in all_results.values())
-
-                summary_rows.append({
-                    'Sheet': '',
-                    'Total Items': '',
-                    'Matched': '',
-                    'Review Required': '',
-                    'No Match': '',
-                    'Auto-Selected': '',
-                    'Match Rate': '',
-                })
-                summary_rows.append({
-                    'Sheet': 'TOTAL',
-                    'Total Items': int(total_items),
-                    'Matched': int(total_matched),
-                    'Review Required': int(total_review),
-                    'No Match': int(total_no_match),
-                    'Auto-Selected': int(total_auto_selected),
-                    'Match Rate': f"{total_matched/total_items*100:.1f}%",
-                })
+                summary_rows = _build_summary_rows(all_results)
 
                 df_summary = pd.DataFrame(summary_rows)
                 # Add MMS note row
@@ -1456,13 +1528,16 @@ with tab2:
                             _v2_review['_alt1_name'] = ''
                             _v2_review['_blk1_id'] = ''
                             _v2_review['_blk1_name'] = ''
-                            for idx, row in _v2_review.iterrows():
-                                alts = _parse_alternatives(row.get('alternatives', ''))
+                            _no_cands = pd.Series('', index=_v2_review.index)
+                            for idx, raw_alts, raw_blk in zip(_v2_review.index,
+                                                              _v2_review.get('alternatives', _no_cands),
+                                                              _v2_review.get('blocked_candidates', _no_cands)):
+                                alts = _parse_alternatives(raw_alts)
                                 if alts and isinstance(alts[0], dict):
                                     _v2_review.at[idx, '_alt1_score'] = float(alts[0].get('score', 0) or 0)
                                     _v2_review.at[idx, '_alt1_id'] = alts[0].get('uae_assetid', '')
                                     _v2_review.at[idx, '_alt1_name'] = alts[0].get('uae_assetname', '')
-                                blk = _parse_alternatives(row.get('blocked_candidates', ''))
+                                blk = _parse_alternatives(raw_blk)
                                 if blk and isinstance(blk[0], dict):
                                     _v2_review.at[idx, '_blk1_score'] = float(blk[0].get('score', 0) or 0)
                                     _v2_review.at[idx, '_blk1_id'] = blk[0].get('uae_assetid', '')
@@ -1473,13 +1548,16 @@ with tab2:
                             # Best candidate id/name for quick display
                             _v2_review['suggested_id'] = ''
                             _v2_review['suggested_name'] = ''
-                            for idx, row in _v2_review.iterrows():
-                                if row['_alt1_score'] >= row['_blk1_score'] and row['_alt1_id']:
-                                    _v2_review.at[idx, 'suggested_id'] = row['_alt1_id']
-                                    _v2_review.at[idx, 'suggested_name'] = row['_alt1_name']
-                                elif row['_blk1_id']:
-                                    _v2_review.at[idx, 'suggested_id'] = row['_blk1_id']
-                                    _v2_review.at[idx, 'suggested_name'] = row['_blk1_name']
+                            for idx, alt_score, blk_score, alt_id, alt_name, blk_id, blk_name in zip(
+                                    _v2_review.index, _v2_review['_alt1_score'], _v2_review['_blk1_score'],
+                                    _v2_review['_alt1_id'], _v2_review['_alt1_name'],
+                                    _v2_review['_blk1_id'], _v2_review['_blk1_name']):
+                                if alt_score >= blk_score and alt_id:
+                                    _v2_review.at[idx, 'suggested_id'] = alt_id
+                                    _v2_review.at[idx, 'suggested_name'] = alt_name
+                                elif blk_id:
+                                    _v2_review.at[idx, 'suggested_id'] = blk_id
+                                    _v2_review.at[idx, 'suggested_name'] = blk_name
 
                             # A) Quick Review: high-score candidates (>=90)
                             quick_mask = _v2_review['_best_score'] >= 90
@@ -1501,11 +1579,14 @@ with tab2:
                                 for i in range(1, 4):
                                     df_deep[f'cand_{i}_name'] = ''
                                     df_deep[f'cand_{i}_score'] = ''
-                                for idx, row in df_deep.iterrows():
+                                _no_cands = pd.Series('', index=df_deep.index)
+                                for idx, *raw_cands in zip(df_deep.index,
+                                                           df_deep.get('alternatives', _no_cands),
+                                                           df_deep.get('blocked_candidates', _no_cands)):
                                     # Merge alt + blk, sort by score, take top 3
                                     all_cands = []
-                                    for src in ('alternatives', 'blocked_candidates'):
-                                        parsed = _parse_alternatives(row.get(src, ''))
+                                    for raw in raw_cands:
+                                        parsed = _parse_alternatives(raw)
                                         for c in parsed:
                                             if isinstance(c, dict) and c.get('uae_assetname'):
                                                 all_cands.append(c)
@@ -1526,11 +1607,11 @@ with tab2:
                             if len(_v2_nomatch) > 0:
                                 _v2_nomatch['_brand'] = ''
                                 _v2_nomatch['_group_key'] = ''
-                                for idx, row in _v2_nomatch.iterrows():
+                                for idx, row in zip(_v2_nomatch.index, _v2_nomatch.to_dict('records')):
                                     name = str(row.get('original_input', ''))
                                     brand = ''
                                     for bcol in ('Brand', 'brand', 'manufacturer'):
-                                        if bcol in row.index and pd.notna(row.get(bcol)):
+                                        if bcol in row and pd.notna(row.get(bcol)):
                                             brand = str(row[bcol]).strip()
                                             break
                                     _v2_nomatch.at[idx, '_brand'] = brand
@@ -1571,13 +1652,15 @@ with tab2:
                     v2_summary = []
                     for sn, df_r in all_results_v2.items():
                         _t = len(df_r)
+                        _vc = df_r['match_status'].value_counts()
+                        _m = int(_vc.get(MATCH_STATUS_MATCHED, 0))
                         v2_summary.append({
                             'Sheet': sn,
                             'Total Items': _t,
-                            'Matched': int((df_r['match_status'] == MATCH_STATUS_MATCHED).sum()),
-                            'Review Required': int((df_r['match_status'] == MATCH_STATUS_SUGGESTED).sum()),
-                            'No Match': int((df_r['match_status'] == MATCH_STATUS_NO_MATCH).sum()),
-                            'Match Rate': f"{(df_r['match_status'] == MATCH_STATUS_MATCHED).sum()/_t*100:.1f}%",
+                            'Matched': _m,
+                            'Review Required': int(_vc.get(MATCH_STATUS_SUGGESTED, 0)),
+                            'No Match': int(_vc.get(MATCH_STATUS_NO_MATCH, 0)),
+                            'Match Rate': f"{_m/_t*100:.1f}%",
                         })
                     df_v2_summ = pd.DataFrame(v2_summary)
                     df_v2_summ = pd.concat([
@@ -1588,44 +1671,31 @@ with tab2:
                     df_v2_summ.to_excel(writer, sheet_name='Summary (V2)', index=False)
 
                     # ---- FIX 3: Compare mode — full V2 Matched/Unmatched/Review/Auto-Selected ----
+                    matched_v2_writes, unmatched_v2_writes, all_review_v2 = _partition_by_status(all_results_v2)
+
                     # Matched (V2) — per sheet
-                    for sheet_name, df_v2 in all_results_v2.items():
-                        matched_v2 = df_v2[df_v2['match_status'] == MATCH_STATUS_MATCHED].copy()
-                        if len(matched_v2) > 0:
-                            nl_names_v2 = []
-                            for _, r in matched_v2.iterrows():
-                                aid = r['mapped_uae_assetid']
-                                nle = df_nl_clean[df_nl_clean['uae_assetid'] == aid]
-                                nl_names_v2.append(nle.iloc[0]['uae_assetname'] if len(nle) > 0 else 'N/A')
-                            insert_pos = list(matched_v2.columns).index('mapped_uae_assetid') + 1
-                            matched_v2.insert(insert_pos, 'nl_product_name', nl_names_v2)
-                            suffix = ' - Matched (V2)'
-                            safe_name = sheet_name[:31 - len(suffix)] + suffix
-                            out_mv2 = _apply_analyst_cols(matched_v2, _ANALYST_MATCHED_COLS) if _analyst_view else matched_v2
-                            out_mv2.to_excel(writer, sheet_name=safe_name, index=False)
+                    for sheet_name, matched_v2 in matched_v2_writes:
+                        nl_names_v2 = [nl_name_by_id.get(aid, 'N/A')
+                                       for aid in matched_v2['mapped_uae_assetid']]
+                        insert_pos = list(matched_v2.columns).index('mapped_uae_assetid') + 1
+                        matched_v2.insert(insert_pos, 'nl_product_name', nl_names_v2)
+                        suffix = ' - Matched (V2)'
+                        safe_name = sheet_name[:31 - len(suffix)] + suffix
+                        out_mv2 = _apply_analyst_cols(matched_v2, _ANALYST_MATCHED_COLS) if _analyst_view else matched_v2
+                        out_mv2.to_excel(writer, sheet_name=safe_name, index=False)
 
                     # Unmatched (V2) — per sheet
-                    for sheet_name, df_v2 in all_results_v2.items():
-                        unmatched_v2 = df_v2[df_v2['match_status'] == MATCH_STATUS_NO_MATCH]
-                        if len(unmatched_v2) > 0:
-                            suffix = ' - Unmatched (V2)'
-                            safe_name = sheet_name[:31 - len(suffix)] + suffix
-                            out_uv2 = _prepare_analyst_unmatched(unmatched_v2, df_nl_clean) if _analyst_view else unmatched_v2
-                            out_uv2.to_excel(writer, sheet_name=safe_name, index=False)
+                    for sheet_name, unmatched_v2 in unmatched_v2_writes:
+                        suffix = ' - Unmatched (V2)'
+                        safe_name = sheet_name[:31 - len(suffix)] + suffix
+                        out_uv2 = _prepare_analyst_unmatched(unmatched_v2, nl_name_by_id) if _analyst_view else unmatched_v2
+                        out_uv2.to_excel(writer, sheet_name=safe_name, index=False)
 
                     # Review Required (V2) — combined, with alt columns
-                    all_review_v2 = []
-                    for sheet_name, df_v2 in all_results_v2.items():
-                        rev = df_v2[df_v2['match_status'] == MATCH_STATUS_SUGGESTED].copy()
-                        if len(rev) > 0:
-                            nl_names_v2 = []
-                            for _, r in rev.iterrows():
-                                aid = r['mapped_uae_assetid']
-                                nle = df_nl_clean[df_nl_clean['uae_assetid'] == aid]
-                                nl_names_v2.append(nle.iloc[0]['uae_assetname'] if len(nle) > 0 else 'N/A')
-                            rev['nl_product_name'] = nl_names_v2
-                            rev.insert(0, 'Source Sheet', sheet_name)
-                            all_review_v2.append(rev)
+                    for rev in all_review_v2:
+                        nl_names_v2 = [nl_name_by_id.get(aid, 'N/A')
+                                       for aid in rev['mapped_uae_assetid']]
+                        rev['nl_product_name'] = nl_names_v2
                     if all_review_v2:
                         df_rev_v2 = pd.concat(all_review_v2, ignore_index=True)
                         for i in range(1, 4):
@@ -1633,8 +1703,8 @@ with tab2:
                             df_rev_v2[f'alt_{i}_name'] = ''
                             df_rev_v2[f'alt_{i}_score'] = ''
                             df_rev_v2[f'alt_{i}_reason'] = ''
-                        for idx, row in df_rev_v2.iterrows():
-                            alts = _parse_alternatives(row.get('alternatives', ''))
+                        for idx, raw in df_rev_v2.get('alternatives', pd.Series(dtype=object)).items():
+                            alts = _parse_alternatives(raw)
                             for j, alt in enumerate(alts[:3], 1):
                                 if isinstance(alt, dict):
                                     df_rev_v2.at[idx, f'alt_{j}_id'] = alt.get('uae_assetid', '')
@@ -1647,8 +1717,8 @@ with tab2:
                             df_rev_v2[f'blk_{i}_name'] = ''
                             df_rev_v2[f'blk_{i}_score'] = ''
                             df_rev_v2[f'blk_{i}_reason'] = ''
-                        for idx, row in df_rev_v2.iterrows():
-                            blk = _parse_alternatives(row.get('blocked_candidates', ''))
+                        for idx, raw in df_rev_v2.get('blocked_candidates', pd.Series(dtype=object)).items():
+                            blk = _parse_alternatives(raw)
                             for j, b in enumerate(blk[:3], 1):
                                 if isinstance(b, dict):
                                     df_rev_v2.at[idx, f'blk_{j}_id'] = b.get('uae_assetid', '')
@@ -1699,21 +1769,20 @@ with tab2:
                     auto_v2_details = []
                     for sheet_name, df_v2 in all_results_v2.items():
                         auto_v2 = df_v2[df_v2['auto_selected'] == True].copy()
-                        for _, r in auto_v2.iterrows():
-                            alternatives = _parse_alternatives(r.get('alternatives', ''))
+                        for r in auto_v2.itertuples(index=False):
+                            alternatives = _parse_alternatives(r.alternatives)
                             a_ids = [a.get('uae_assetid', '') for a in alternatives if isinstance(a, dict) and a.get('uae_assetid')]
-                            sel_id = r['mapped_uae_assetid']
-                            nle = df_nl_clean[df_nl_clean['uae_assetid'] == sel_id]
-                            sel_name = nle.iloc[0]['uae_assetname'] if len(nle) > 0 else 'N/A'
+                            sel_id = r.mapped_uae_assetid
+                            sel_name = nl_name_by_id.get(sel_id, 'N/A')
                             _mid, _mlbl, _mst = _mms_lookup_single(sel_id, mms_map)
                             detail_v2 = {
                                 'Source Sheet': sheet_name,
-                                'Your Product': str(r.get('original_input', '')),
-                                'Matched To': r['matched_on'],
-                                'Match Score': f"{r['match_score']:.1f}%",
+                                'Your Product': str(r.original_input),
+                                'Matched To': r.matched_on,
+                                'Match Score': f"{r.match_score:.1f}%",
                                 'Selected ID': sel_id,
                                 'Selected Product': sel_name,
-                                'Selection Reason': r.get('selection_reason', 'N/A'),
+                                'Selection Reason': r.selection_reason,
                                 'Alternative IDs': ', '.join(a_ids) if a_ids else 'None',
                                 'Total Variants': len(a_ids) + 1,
                             }
@@ -1759,10 +1828,9 @@ if tab3 is not None:
         all_results = st.session_state['mapping_results']['all_results']
         detected_sheets = st.session_state['mapping_results']['detected_sheets']
 
-        # Convert results dict to separate dataframes
-        all_dataframes = {}
-        for sheet_name, df_result in all_results.items():
-            all_dataframes[sheet_name] = df_result.copy()
+        # Shallow view of the results — sheets are copied only when an override
+        # is applied to them (see the Apply Overrides handler below)
+        all_dataframes = dict(all_results)
 
         # Find auto-selected items
         all_auto_selected = []
@@ -1782,78 +1850,82 @@ if tab3 is not None:
         # ------------------------------------------------------------------
         st.subheader("🎯 Auto-Selection Accuracy")
 
-        with st.spinner("Verifying accuracy of auto-selected items..."):
-            errors = []
-            warnings = []
-            success_count = 0
-
-            for sheet_name, auto_selected in all_auto_selected:
-                for idx, row in auto_selected.iterrows():
-                    # Get product name from canonical field
-                    user_input = str(row.get('original_input', ''))
-
-                    selected_id = row['mapped_uae_assetid']
-                    selection_reason = row.get('selection_reason', '')
-
-                    # CHECK 1: Selected ID exists in NL catalog
-                    nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == selected_id]
-                    if len(nl_entry) == 0:
-                        errors.append({
-                            'sheet': sheet_name,
-                            'product': user_input,
-                            'error': f'Selected ID {selected_id} not found in NL catalog',
-                        })
-                        continue
-
-                    nl_product = nl_entry.iloc[0]['uae_assetname']
+        # Verification only depends on the results, so widget-driven reruns reuse it;
+        # applying overrides stores a new results dict, which invalidates the cache
+        if st.session_state.get('verify_cache_src') is all_results:
+            errors, success_count = st.session_state['verify_cache']
+        else:
+            with st.spinner("Verifying accuracy of auto-selected items..."):
+                errors = []
+                warnings = []
+                success_count = 0
 
-                    # CHECK 2: Verify selection reason is logical
-                    reason = str(selection_reason).lower()
-                    user_input_lower = user_input.lower()
-                    nl_product_lower = nl_product.lower()
+                for sheet_name, auto_selected in all_auto_selected:
+                    for row in auto_selected.itertuples(index=False):
+                        # Get product name from canonical field
+                        user_input = str(row.original_input)
 
-                    # Check year matching
-                    if 'matched year' in reason:
-                        import re
-                        year_match = re.search(r'matched year (\d{4})', reason)
-                        if year_match:
-                            year = year_match.group(1)
-                            if year not in nl_product_lower:
-                                errors.append({
-                                    'sheet': sheet_name,
-                                    'product': user_input,
-                                    'error': f"Reason says 'matched year {year}' but year not in selected product",
-                                })
-                                continue
+                        selected_id = row.mapped_uae_assetid
+                        selection_reason = row.selection_reason
 
-                    # Check 5G matching
-                    elif 'matched 5g' in reason:
-                        if '5g' not in user_input_lower:
+                        # CHECK 1: Selected ID exists in NL catalog
+                        nl_product = nl_name_by_id.get(selected_id)
+                        if nl_product is None:
                             errors.append({
                                 'sheet': sheet_name,
                                 'product': user_input,
-                                'error': "Reason says 'matched 5G' but user input has no 5G",
-                            })
-                            continue
-                        if '5g' not in nl_product_lower:
-                            errors.append({
-                                'sheet': sheet_name,
-                                'product': user_input,
-                                'error': "Reason says 'matched 5G' but selected product has no 5G",
+                                'error': f'Selected ID {selected_id} not found in NL catalog',
                             })
                             continue
 
-                    # Check 4G/LTE matching
-                    elif 'matched 4g/lte' in reason or 'defaulted to 4g' in reason:
-                        if '5g' in nl_product_lower:
-                            errors.append({
-                                'sheet': sheet_name,
-                                'product': user_input,
-                                'error': "Reason says '4G/LTE' but selected product has 5G",
-                            })
-                            continue
+                        # CHECK 2: Verify selection reason is logical
+                        reason = str(selection_reason).lower()
+                        user_input_lower = user_input.lower()
+                        nl_product_lower = nl_product.lower()
+
+                        # Check year matching
+                        if 'matched year' in reason:
+                            year_match = re.search(r'matched year (\d{4})', reason)
+                            if year_match:
+                                year = year_match.group(1)
+                                if year not in nl_product_lower:
+                                    errors.append({
+                                        'sheet': sheet_name,
+                                        'product': user_input,
+                                        'error': f"Reason says 'matched year {year}' but year not in selected product",
+                                    })
+                                    continue
+
+                        # Check 5G matching
+                        elif 'matched 5g' in reason:
+                            if '5g' not in user_input_lower:
+                                errors.append({
+                                    'sheet': sheet_name,
+                                    'product': user_input,
+                                    'error': "Reason says 'matched 5G' but user input has no 5G",
+                                })
+                                continue
+                            if '5g' not in nl_product_lower:
+                                errors.append({
+                                    'sheet': sheet_name,
+                                    'product': user_input,
+                                    'error': "Reason says 'matched 5G' but selected product has no 5G",
+                                })
+                                continue
+
+                        # Check 4G/LTE matching
+                        elif 'matched 4g/lte' in reason or 'defaulted to 4g' in reason:
+                            if '5g' in nl_product_lower:
+                                errors.append({
+                                    'sheet': sheet_name,
+                                    'product': user_input,
+                                    'error': "Reason says '4G/LTE' but selected product has 5G",
+                                })
+                                continue
 
-                    success_count += 1
+                        success_count += 1
+            st.session_state['verify_cache_src'] = all_results
+            st.session_state['verify_cache'] = (errors, success_count)
 
         # Display accuracy metrics
         accuracy = (success_count / total_autoselect * 100) if total_autoselect > 0 else 100
@@ -1897,17 +1969,20 @@ if tab3 is not None:
                 if 'variant_selections' not in st.session_state:
                     st.session_state.variant_selections = {}
 
-                # Flatten all auto-selected items for display
-                all_items_flat = []
-                for sheet_name, auto_selected in all_auto_selected:
-                    for idx, row in auto_selected.iterrows():
-                        all_items_flat.append((sheet_name, idx, row))
+                # Only the first 20 auto-selected items are displayed — walk the
+                # sheets lazily instead of materializing every row
+                def _iter_auto_selected():
+                    for sheet_name, auto_selected in all_auto_selected:
+                        for row in auto_selected.itertuples():
+                            yield sheet_name, row.Index, row
+
+                shown_items = list(islice(_iter_auto_selected(), 20))
 
                 # Show items with variant selection
-                st.markdown(f"**Showing first {min(20, len(all_items_flat))} of {len(all_items_flat)} items**")
+                st.markdown(f"**Showing first {len(shown_items)} of {total_autoselect} items**")
 
-                for i, (sheet_name, idx, row) in enumerate(all_items_flat[:20]):
-                    product_name = str(row.get('original_input', ''))
+                for i, (sheet_name, idx, row) in enumerate(shown_items):
+                    product_name = str(row.original_input)
 
                     with st.expander(f"Item {i+1}: {product_name}"):
                         # Show match info
@@ -1915,22 +1990,13 @@ if tab3 is not None:
 
                         with col_info:
                             st.markdown(f"**Your Product:** {product_name}")
-                            st.markdown(f"**Matched To:** `{row['matched_on']}`")
-                            st.markdown(f"**Match Score:** {row['match_score']:.1f}%")
-                            st.markdown(f"**Selection Reason:** {row.get('selection_reason', 'N/A')}")
+                            st.markdown(f"**Matched To:** `{row.matched_on}`")
+                            st.markdown(f"**Match Score:** {row.match_score:.1f}%")
+                            st.markdown(f"**Selection Reason:** {row.selection_reason}")
 
                         # Parse alternatives (JSON-safe)
-                        current_id = str(row['mapped_uae_assetid']).strip()
-                        alternatives = _parse_alternatives(row.get('alternatives', ''))
-                        # Extract IDs from dicts (v2) or use raw strings (v1)
-                        alt_ids = []
-                        for a in alternatives:
-                            if isinstance(a, dict):
-                                aid = a.get('uae_assetid', '')
-                                if aid:
-                                    alt_ids.append(aid)
-                            elif isinstance(a, str):
-                                alt_ids.append(a)
+                        current_id = str(row.mapped_uae_assetid).strip()
+                        alt_ids = _parse_alt_ids(row.alternatives)
 
                         # Build full list: current ID + alternatives
                         all_ids = [current_id] + alt_ids
@@ -1939,9 +2005,8 @@ if tab3 is not None:
                         st.markdown(f"**{len(all_ids)} Variant Options:**")
 
                         for id_val in all_ids:
-                            nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == id_val]
-                            if len(nl_entry) > 0:
-                                product_name_nl = nl_entry.iloc[0]['uae_assetname']
+                            product_name_nl = nl_name_by_id.get(id_val)
+                            if product_name_nl is not None:
                                 prefix = "✓ **SELECTED:** " if id_val == current_id else "   "
                                 st.markdown(f"{prefix}`{id_val}`: {product_name_nl}")
 
@@ -1967,217 +2032,136 @@ if tab3 is not None:
                 if st.button("✅ Apply Overrides & Download Updated Results", type="primary", use_container_width=True):
                     override_count = 0
 
-                    # Apply overrides to session state data
+                    # Group selections by sheet so each sheet gets one vectorized update
+                    overrides_by_sheet = defaultdict(dict)
                     for key, selected_id in st.session_state.variant_selections.items():
                         parts = key.rsplit('_', 1)
-                        if len(parts) == 2:
-                            sheet_name, idx_str = parts
-                            idx = int(idx_str)
-
-                            if sheet_name in all_dataframes:
-                                original_id = all_dataframes[sheet_name].at[idx, 'mapped_uae_assetid']
-                                if str(selected_id) != str(original_id):
-                                    all_dataframes[sheet_name].at[idx, 'mapped_uae_assetid'] = selected_id
-                                    all_dataframes[sheet_name].at[idx, 'selection_reason'] = 'Manually overridden'
-                                    override_count += 1
+                        if len(parts) == 2 and parts[0] in all_dataframes:
+                            overrides_by_sheet[parts[0]][int(parts[1])] = selected_id
+
+                    # Apply overrides to session state data (copy-on-write: only
+                    # sheets with selections are copied before being written to)
+                    for sn, updates in overrides_by_sheet.items():
+                        df_sheet = all_dataframes[sn] = all_dataframes[sn].copy()
+                        selected = pd.Series(updates)
+                        current = df_sheet.loc[selected.index, 'mapped_uae_assetid']
+                        changed = selected.index[
+                            selected.astype(str).to_numpy() != current.astype(str).to_numpy()]
+                        if len(changed) > 0:
+                            df_sheet.loc[changed, 'mapped_uae_assetid'] = selected[changed]
+                            df_sheet.loc[changed, 'selection_reason'] = 'Manually overridden'
+                            override_count += len(changed)
 
                     # Re-enrich MMS columns for overridden rows
                     if mms_map and override_count > 0:
-                        for key, sel_id in st.session_state.variant_selections.items():
-                            parts = key.rsplit('_', 1)
-                            if len(parts) != 2:
-                                continue
-                            sn, idx_s = parts
-                            ridx = int(idx_s)
-                            if sn not in all_dataframes:
-                                continue
-                            uid = str(sel_id).strip()
-                            mid, mlbl, mst = _mms_lookup_single(uid, mms_map)
-                            all_dataframes[sn].at[ridx, 'mms_asset_id'] = mid
-                            all_dataframes[sn].at[ridx, 'mms_asset_label'] = mlbl
-                            all_dataframes[sn].at[ridx, 'mms_lookup_status'] = mst
+                        for sn, updates in overrides_by_sheet.items():
+                            df_sheet = all_dataframes[sn]
+                            rows = list(updates)
+                            uids = [str(sel_id).strip() for sel_id in updates.values()]
+                            mms = [_mms_lookup_single(uid, mms_map) for uid in uids]
+                            mids = [m[0] for m in mms]
+                            mlbls = [m[1] for m in mms]
+                            df_sheet.loc[rows, 'mms_asset_id'] = mids
+                            df_sheet.loc[rows, 'mms_asset_label'] = mlbls
+                            df_sheet.loc[rows, 'mms_lookup_status'] = [m[2] for m in mms]
                             if primary_output_choice == 'MMS':
-                                all_dataframes[sn].at[ridx, 'primary_output_id'] = mid
-                                all_dataframes[sn].at[ridx, 'primary_output_catalog'] = mlbl
+                                df_sheet.loc[rows, 'primary_output_id'] = mids
+                                df_sheet.loc[rows, 'primary_output_catalog'] = mlbls
                             else:
-                                all_dataframes[sn].at[ridx, 'primary_output_id'] = uid
-                                nl_e = df_nl_clean[df_nl_clean['uae_assetid'] == uid]
-                                all_dataframes[sn].at[ridx, 'primary_output_catalog'] = nl_e.iloc[0]['uae_assetname'] if len(nl_e) > 0 else ''
+                                df_sheet.loc[rows, 'primary_output_id'] = uids
+                                df_sheet.loc[rows, 'primary_output_catalog'] = [
+                                    nl_name_by_id.get(uid, '') for uid in uids]
 
                     # Update session state with modified data
                     st.session_state['mapping_results']['all_results'] = all_dataframes
 
-                    # Generate updated Excel with new structure
-                    output = io.BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        # 1. MATCHED sheets (updated with overrides)
-                        for sheet_name, df_result in all_dataframes.items():
-                            matched = df_result[df_result['match_status'] == MATCH_STATUS_MATCHED]
-                            if len(matched) > 0:
+                    # Generate updated Excel with new structure — reuse the cached bytes when
+                    # the overrides, export view and mapping run are unchanged since the last build.
+                    # The run is matched by identity against the results object stored with the
+                    # bytes (an id() could be reused by the next run's dict once this one is freed).
+                    export_key = hash((
+                        tuple(sorted(st.session_state.variant_selections.items())),
+                        _analyst_view, primary_output_choice,
+                    ))
+                    if (st.session_state.get('export_cache_src') is st.session_state['mapping_results']
+                            and st.session_state.get('export_cache_key') == export_key):
+                        export_bytes = st.session_state['export_cache_bytes']
+                    else:
+                        output = io.BytesIO()
+                        with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs=_EXPORT_ENGINE_KWARGS) as writer:
+                            # Partition every sheet by status in a single groupby pass
+                            matched_writes, unmatched_writes, all_review_required = \
+                                _partition_by_status(all_dataframes)
+
+                            # 1. MATCHED sheets (updated with overrides)
+                            for sheet_name, matched in matched_writes:
                                 suffix = ' - Matched'
                                 safe_name = sheet_name[:31 - len(suffix)] + suffix
                                 out_m = _apply_analyst_cols(matched, _ANALYST_MATCHED_COLS) if _analyst_view else matched
                                 out_m.to_excel(writer, sheet_name=safe_name, index=False)
 
-                        # 2. UNMATCHED sheets
-                        for sheet_name, df_result in all_dataframes.items():
-                            unmatched = df_result[df_result['match_status'] == MATCH_STATUS_NO_MATCH]
-                            if len(unmatched) > 0:
+                            # 2. UNMATCHED sheets
+                            for sheet_name, unmatched in unmatched_writes:
                                 suffix = ' - Unmatched'
                                 safe_name = sheet_name[:31 - len(suffix)] + suffix
-                                out_u = _prepare_analyst_unmatched(unmatched, df_nl_clean) if _analyst_view else unmatched
+                                out_u = _prepare_analyst_unmatched(unmatched, nl_name_by_id) if _analyst_view else unmatched
                                 out_u.to_excel(writer, sheet_name=safe_name, index=False)
 
-                        # 3. REVIEW REQUIRED sheet (curated columns to avoid NaN across sheets)
-                        all_review_required = []
-                        for sheet_name, df_result in all_dataframes.items():
-                            review = df_result[df_result['match_status'] == MATCH_STATUS_SUGGESTED].copy()
-                            if len(review) > 0:
-                                review.insert(0, 'Source Sheet', sheet_name)
-                                all_review_required.append(review)
-
-                        if all_review_required:
-                            df_review_combined = pd.concat(all_review_required, ignore_index=True)
-                            if _analyst_view:
-                                _apply_analyst_review(df_review_combined).to_excel(
-                                    writer, sheet_name='Review Required', index=False)
-                            else:
-                                # Debug View: prepend original input cols (url, grade, price…)
-                                _orig_cols_ovr = [c for c in df_review_combined.columns
-                                                  if c not in _MATCHER_ADDED_COLS and c != 'Source Sheet']
-                                review_cols = ['Source Sheet'] + _orig_cols_ovr + [
-                                    'original_input', 'category',
-                                    'mapped_uae_assetid',
-                                    'match_score', 'match_status',
-                                    'confidence', 'matched_on', 'method',
-                                    'auto_selected', 'selection_reason', 'alternatives',
-                                    'verification_pass', 'verification_reasons',
-                                ]
-                                if primary_output_choice == 'MMS':
-                                    _ins = review_cols.index('mapped_uae_assetid') + 1
-                                    for _mc in reversed(['mms_asset_id', 'mms_asset_label', 'mms_lookup_status',
-                                                         'primary_output_id', 'primary_output_catalog']):
-                                        review_cols.insert(_ins, _mc)
-                                # Deduplicate while preserving order
-                                _seen_ovr = set()
-                                review_cols = [c for c in review_cols
-                                               if c not in _seen_ovr and not _seen_ovr.add(c)]
-                                review_cols = [c for c in review_cols if c in df_review_combined.columns]
-                                df_review_combined[review_cols].to_excel(
-                                    writer, sheet_name='Review Required', index=False)
-
-                        # 4. AUTO-SELECTED PRODUCTS sheet (with overrides marked)
-                        auto_selected_details = []
-                        for sheet_name, df_result in all_dataframes.items():
-                            auto_selected = df_result[df_result['auto_selected'] == True].copy()
-                            for idx, row in auto_selected.iterrows():
-                                original_name = str(row.get('original_input', ''))
-
-                                alternatives = _parse_alternatives(row.get('alternatives', ''))
-                                alt_ids = []
-                                for a in alternatives:
-                                    if isinstance(a, dict):
-                                        aid = a.get('uae_assetid', '')
-                                        if aid:
-                                            alt_ids.append(aid)
-                                    elif isinstance(a, str):
-                                        alt_ids.append(a)
-
-                                selected_id = row['mapped_uae_assetid']
-                                nl_entry = df_nl_clean[df_nl_clean['uae_assetid'] == selected_id]
-                                selected_name = nl_entry.iloc[0]['uae_assetname'] if len(nl_entry) > 0 else 'N/A'
-
-                                _mid, _mlbl, _mst = _mms_lookup_single(selected_id, mms_map)
-                                # Collect original input metadata (url, grade, price…)
-                                _orig_meta_ovr = {}
-                                for c in row.index:
-                                    if c not in _MATCHER_ADDED_COLS and c != 'Source Sheet':
-                                        val = row[c]
-                                        if pd.notna(val) and str(val).strip():
-                                            _orig_meta_ovr[c] = val
-                                detail_ovr = {
-                                    'Source Sheet': sheet_name,
-                                    'Your Product': original_name,
-                                }
-                                detail_ovr.update(_orig_meta_ovr)
-                                detail_ovr.update({
-                                    'Matched To': row['matched_on'],
-                                    'Match Score': f"{row['match_score']:.1f}%",
-                                    'Selected ID': selected_id,
-                                    'Selected Product': selected_name,
-                                    'Selection Reason': row.get('selection_reason', 'N/A'),
-                                    'Alternative IDs': ', '.join(alt_ids) if alt_ids else 'None',
-                                    'Total Variants': len(alt_ids) + 1,
-                                })
-                                if mms_map:
-                                    detail_ovr['mms_asset_id'] = _mid
-                                    detail_ovr['mms_asset_label'] = _mlbl
-                                    detail_ovr['mms_lookup_status'] = _mst
-                                    detail_ovr['primary_output_id'] = _mid if primary_output_choice == 'MMS' else selected_id
-                                auto_selected_details.append(detail_ovr)
-
-                        if auto_selected_details:
-                            df_auto_selected = pd.DataFrame(auto_selected_details)
-                            df_auto_selected.to_excel(writer, sheet_name='Auto-Selected Products', index=False)
-
-                        # 5. SUMMARY sheet
-                        summary_rows = []
-                        for sheet_name, df_result in all_dataframes.items():
-                            total = len(df_result)
-                            matched = int((df_result['match_status'] == MATCH_STATUS_MATCHED).sum())
-                            review = int((df_result['match_status'] == MATCH_STATUS_SUGGESTED).sum())
-                            no_match = int((df_result['match_status'] == MATCH_STATUS_NO_MATCH).sum())
-                            auto_selected_count = int(df_result['auto_selected'].sum())
-
-                            summary_rows.append({
-                                'Sheet': sheet_name,
-                                'Total Items': total,
-                                'Matched': matched,
-                                'Review Required': review,
-                                'No Match': no_match,
-                                'Auto-Selected': auto_selected_count,
-                                'Match Rate': f"{matched/total*100:.1f}%",
-                            })
-
-                        # Add totals
-                        total_items = sum(len(df) for df in all_dataframes.values())
-                        total_matched = sum((df['match_status'] == MATCH_STATUS_MATCHED).sum() for df in all_dataframes.values())
-                        total_review = sum((df['match_status'] == MATCH_STATUS_SUGGESTED).sum() for df in all_dataframes.values())
-                        total_no_match = sum((df['match_status'] == MATCH_STATUS_NO_MATCH).sum() for df in all_dataframes.values())
-                        total_auto_selected = sum(df['auto_selected'].sum() for df in all_dataframes.values())
-
-                        summary_rows.append({
-                            'Sheet': '',
-                            'Total Items': '',
-                            'Matched': '',
-                            'Review Required': '',
-                            'No Match': '',
-                            'Auto-Selected': '',
-                            'Match Rate': '',
-                        })
-                        summary_rows.append({
-                            'Sheet': 'TOTAL',
-                            'Total Items': int(total_items),
-                            'Matched': int(total_matched),
-                            'Review Required': int(total_review),
-                            'No Match': int(total_no_match),
-                            'Auto-Selected': int(total_auto_selected),
-                            'Match Rate': f"{total_matched/total_items*100:.1f}%",
-                        })
-
-                        df_ovr_summ = pd.DataFrame(summary_rows)
-                        df_ovr_summ = pd.concat([
-                            df_ovr_summ,
-                            pd.DataFrame([{'Sheet': '', **{c: '' for c in df_ovr_summ.columns if c != 'Sheet'}}]),
-                            pd.DataFrame([{'Sheet': _mms_note, **{c: '' for c in df_ovr_summ.columns if c != 'Sheet'}}]),
-                        ], ignore_index=True)
-                        df_ovr_summ.to_excel(writer, sheet_name='Summary', index=False)
-
-                    output.seek(0)
+                            # 3. REVIEW REQUIRED sheet (curated columns to avoid NaN across sheets)
+                            if all_review_required:
+                                df_review_combined = pd.concat(all_review_required, ignore_index=True)
+                                if _analyst_view:
+                                    _apply_analyst_review(df_review_combined).to_excel(
+                                        writer, sheet_name='Review Required', index=False)
+                                else:
+                                    # Debug View: prepend original input cols (url, grade, price…)
+                                    _orig_cols_ovr = [c for c in df_review_combined.columns
+                                                      if c not in _MATCHER_ADDED_COLS and c != 'Source Sheet']
+                                    review_cols = ['Source Sheet'] + _orig_cols_ovr + [
+                                        'original_input', 'category',
+                                        'mapped_uae_assetid',
+                                        'match_score', 'match_status',
+                                        'confidence', 'matched_on', 'method',
+                                        'auto_selected', 'selection_reason', 'alternatives',
+                                        'verification_pass', 'verification_reasons',
+                                    ]
+                                    if primary_output_choice == 'MMS':
+                                        _ins = review_cols.index('mapped_uae_assetid') + 1
+                                        for _mc in reversed(['mms_asset_id', 'mms_asset_label', 'mms_lookup_status',
+                                                             'primary_output_id', 'primary_output_catalog']):
+                                            review_cols.insert(_ins, _mc)
+                                    # Deduplicate while preserving order
+                                    _seen_ovr = set()
+                                    review_cols = [c for c in review_cols
+                                                   if c not in _seen_ovr and not _seen_ovr.add(c)]
+                                    review_cols = [c for c in review_cols if c in df_review_combined.columns]
+                                    df_review_combined[review_cols].to_excel(
+                                        writer, sheet_name='Review Required', index=False)
+
+                            # 4. AUTO-SELECTED PRODUCTS sheet (with overrides marked)
+                            df_auto_selected = _build_auto_selected_details(all_dataframes, df_nl_clean)
+                            if len(df_auto_selected) > 0:
+                                df_auto_selected.to_excel(writer, sheet_name='Auto-Selected Products', index=False)
+
+                            # 5. SUMMARY sheet
+                            summary_rows = _build_summary_rows(all_dataframes)
+
+                            df_ovr_summ = pd.DataFrame(summary_rows)
+                            df_ovr_summ = pd.concat([
+                                df_ovr_summ,
+                                pd.DataFrame([{'Sheet': '', **{c: '' for c in df_ovr_summ.columns if c != 'Sheet'}}]),
+                                pd.DataFrame([{'Sheet': _mms_note, **{c: '' for c in df_ovr_summ.columns if c != 'Sheet'}}]),
+                            ], ignore_index=True)
+                            df_ovr_summ.to_excel(writer, sheet_name='Summary', index=False)
+
+                        export_bytes = output.getvalue()
+                        st.session_state['export_cache_src'] = st.session_state['mapping_results']
+                        st.session_state['export_cache_key'] = export_key
+                        st.session_state['export_cache_bytes'] = export_bytes
 
                     st.download_button(
                         label="📥 Download Updated Results",
-                        data=output,
+                        data=export_bytes,
                         file_name="asset_mapping_results_updated.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         type="primary",
@@ -2216,24 +2200,31 @@ with tab4:
     unmatched_items = []
     review_items = []
 
+    sheet_categories = list(all_results)
     for sheet_name, df_result in all_results.items():
         no_match = df_result[df_result['match_status'] == MATCH_STATUS_NO_MATCH].copy()
         if len(no_match) > 0:
-            no_match.insert(0, 'Source Sheet', sheet_name)
+            no_match.insert(0, 'Source Sheet', pd.Categorical(
+                [sheet_name] * len(no_match), categories=sheet_categories))
             unmatched_items.append(no_match)
 
         review = df_result[df_result['match_status'] == MATCH_STATUS_SUGGESTED].copy()
         if len(review) > 0:
-            review.insert(0, 'Source Sheet', sheet_name)
+            review.insert(0, 'Source Sheet', pd.Categorical(
+                [sheet_name] * len(review), categories=sheet_categories))
             review_items.append(review)
 
     if not unmatched_items and not review_items:
         st.success("🎉 Perfect! All items matched successfully. Nothing to analyze.")
         st.stop()
 
+    # Concatenate once up front; the metrics and both analyses reuse these frames
+    df_unmatched = pd.concat(unmatched_items, ignore_index=True) if unmatched_items else None
+    df_review = pd.concat(review_items, ignore_index=True) if review_items else None
+
     # Show overview metrics
-    total_unmatched = sum(len(df) for df in unmatched_items)
-    total_review = sum(len(df) for df in review_items)
+    total_unmatched = len(df_unmatched) if df_unmatched is not None else 0
+    total_review = len(df_review) if df_review is not None else 0
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -2249,8 +2240,6 @@ with tab4:
     if unmatched_items:
         st.subheader("🔴 No Match Analysis (Score < 85%)")
 
-        df_unmatched = pd.concat(unmatched_items, ignore_index=True)
-
         # Identify name column — prefer canonical 'original_input', fall back to legacy names
         name_col = 'original_input' if 'original_input' in df_unmatched.columns else (
             'name' if 'name' in df_unmatched.columns else 'Foxway Product Name')
@@ -2267,12 +2256,12 @@ with tab4:
             # Score distribution
             if 'match_score' in df_unmatched.columns:
                 st.markdown("**Score Distribution:**")
-                score_ranges = {
-                    '80-84%': ((df_unmatched['match_score'] >= 80) & (df_unmatched['match_score'] < 85)).sum(),
-                    '70-79%': ((df_unmatched['match_score'] >= 70) & (df_unmatched['match_score'] < 80)).sum(),
-                    '60-69%': ((df_unmatched['match_score'] >= 60) & (df_unmatched['match_score'] < 70)).sum(),
-                    'Below 60%': (df_unmatched['match_score'] < 60).sum(),
-                }
+                # One binning pass over the scores; reindex keeps the closest-to-threshold band first
+                score_labels = ['Below 60%', '60-69%', '70-79%', '80-84%']
+                score_ranges = pd.cut(
+                    df_unmatched['match_score'], bins=[float('-inf'), 60, 70, 80, 85],
+                    labels=score_labels, right=False,
+                ).value_counts().reindex(score_labels[::-1], fill_value=0)
 
                 for range_label, count in score_ranges.items():
                     if count > 0:
@@ -2287,21 +2276,16 @@ with tab4:
 
             # Check which brands exist in NL catalog
             if brand_col and brand_col in df_unmatched.columns:
-                unique_brands = df_unmatched[brand_col].unique()
-                brand_analysis = []
-
-                for brand in unique_brands:
-                    brand_items = df_unmatched[df_unmatched[brand_col] == brand]
-                    in_catalog = brand in df_nl_clean['brand'].values
-
-                    brand_analysis.append({
-                        'Brand': brand,
-                        'Unmatched Items': len(brand_items),
-                        'In NL Catalog': '✅ Yes' if in_catalog else '❌ No',
-                        'Status': 'Products may be missing' if in_catalog else 'Brand not in catalog',
-                    })
-
-                df_brand_analysis = pd.DataFrame(brand_analysis).sort_values('Unmatched Items', ascending=False)
+                nl_brand_set = frozenset(df_nl_clean['brand'].dropna().unique())
+                brand_counts = df_unmatched.groupby(brand_col, sort=False, observed=True).size()
+                in_catalog = brand_counts.index.isin(nl_brand_set)
+
+                df_brand_analysis = pd.DataFrame({
+                    'Brand': brand_counts.index,
+                    'Unmatched Items': brand_counts.to_numpy(),
+                    'In NL Catalog': ['✅ Yes' if found else '❌ No' for found in in_catalog],
+                    'Status': ['Products may be missing' if found else 'Brand not in catalog' for found in in_catalog],
+                }).sort_values('Unmatched Items', ascending=False)
                 st.dataframe(df_brand_analysis, use_container_width=True, hide_index=True)
 
                 # Highlight brands not in catalog
@@ -2326,8 +2310,6 @@ with tab4:
         st.divider()
         st.subheader("🟡 Review Required Analysis (Score 85-89%)")
 
-        df_review = pd.concat(review_items, ignore_index=True)
-
         # Identify name column — prefer canonical 'original_input', fall back to legacy names
         name_col = 'original_input' if 'original_input' in df_review.columns else (
             'name' if 'name' in df_review.columns else 'Foxway Product Name')
@@ -7,12 +7,23 @@ that existing callers (app.py, tests, scripts) keep working with zero changes.
 Only `run_matching` gains an optional `engine` parameter.
 """
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
 # Re-export the ENTIRE v1 namespace so every existing import still resolves.
 from matcher_v1 import *  # noqa: F401,F403
 
 # Explicitly import the v2 run_matching under an alias
 from matcher_v1 import run_matching as _run_matching_v1
 from matcher_v2 import run_matching as _run_matching_v2
+from matcher_v1 import warm_text_caches as _warm_text_caches_v1
+from matcher_v2 import warm_text_caches as _warm_text_caches_v2
+from matcher_v1 import clear_text_caches as _clear_text_caches_v1
+from matcher_v2 import clear_text_caches as _clear_text_caches_v2
 
 # Also expose v2 helpers that only exist in v2 (added in Phase 1)
 try:
@@ -42,6 +53,37 @@ except ImportError:
     pass  # Falls back to v1's version if available
 
 
+_MIN_ROWS_PER_JOB = 500
+
+
+def _usable_cpu_count():
+    """CPUs this process may run on (honours affinity / container cpusets)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def warm_text_caches(nl_names, asset_names=None):
+    """Warm the text caches of both engines (each module keeps its own)."""
+    _warm_text_caches_v1(nl_names, asset_names)
+    _warm_text_caches_v2(nl_names, asset_names)
+
+
+def clear_text_caches():
+    """Empty the text caches of both engines."""
+    _clear_text_caches_v1()
+    _clear_text_caches_v2()
+
+
+def _run_matching_chunk(df_chunk, brand_col, name_col, nl_lookup, nl_names, kwargs):
+    """Worker entry for run_matching(n_jobs>1); module-level so it pickles."""
+    # Spawned workers start with empty text caches
+    nl_catalog = kwargs.get('nl_catalog')
+    warm_text_caches(nl_names, nl_catalog['uae_assetname'].tolist()
+                     if nl_catalog is not None else None)
+    return run_matching(df_chunk, brand_col, name_col, nl_lookup, nl_names, **kwargs)
+
+
 def run_matching(
     df_input,
     brand_col,
@@ -57,8 +99,49 @@ def run_matching(
     signature_index=None,
     engine="v2",
     widen_mode="aggressive",
+    n_jobs=1,
 ):
-    """Route to v1 (Stable) or v2 (Default) matching engine."""
+    """
+    Route to v1 (Stable) or v2 (Default) matching engine.
+
+    n_jobs > 1 (or -1 for every usable CPU) splits df_input into contiguous
+    row chunks matched in separate processes; rows are matched independently,
+    so the concatenated result is identical to a single-process run.
+    progress_callback then fires once per finished chunk.
+
+    Workers are spawned, never forked: forking a multi-threaded parent (the
+    Streamlit server) can deadlock the child. Each worker receives its own
+    copy of the catalog and indexes, so memory grows with n_jobs.
+    """
+    if n_jobs == -1:
+        n_jobs = _usable_cpu_count()
+    # Below this many rows per worker, process start-up and pickling the
+    # catalog/indexes outweigh the parallel matching.
+    n_jobs = max(1, min(n_jobs, len(df_input) // _MIN_ROWS_PER_JOB))
+    if n_jobs > 1:
+        kwargs = dict(
+            threshold=threshold, brand_index=brand_index,
+            attribute_index=attribute_index, nl_catalog=nl_catalog,
+            diagnostic=diagnostic, signature_index=signature_index,
+            engine=engine, widen_mode=widen_mode,
+        )
+        bounds = np.linspace(0, len(df_input), n_jobs + 1).astype(int)
+        chunks = [df_input.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [
+                pool.submit(_run_matching_chunk, chunk, brand_col, name_col,
+                            nl_lookup, nl_names, kwargs)
+                for chunk in chunks
+            ]
+            done = 0
+            for fut, chunk in zip(futures, chunks):
+                fut.result()
+                done += len(chunk)
+                if progress_callback:
+                    progress_callback(done, len(df_input))
+        return pd.concat([fut.result() for fut in futures])
+
     if engine == "v2":
         return _run_matching_v2(
             df_input, brand_col, name_col, nl_lookup, nl_names,
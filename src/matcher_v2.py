@@ -7,6 +7,9 @@ Matching Approach:
     - Uses rapidfuzz token_sort_ratio for fuzzy matching (order-independent token comparison)
     - Token-sort is chosen because List 1 names ("iPhone 6 16GB") and NL names
       ("Apple iPhone 6 (2014), 16GB") contain the same tokens in different orders/formats
+    - token_set_ratio / WRatio are deliberately NOT used: a subset scores 100 / 95
+      ("iphone 12 64gb" vs "iphone 12 pro max 64gb"), which would auto-match the
+      variant-level false positives the thresholds and gates exist to prevent
 
 Threshold / Confidence Tiers:
     - >= 95%: HIGH confidence (auto-accept) — safe to apply UAE Asset ID directly
@@ -24,11 +27,12 @@ Duplicate Handling:
 import os
 import json
 import re
-from functools import lru_cache
+import sys
 from urllib.parse import urlparse, unquote
+import numpy as np
 import pandas as pd
 from rapidfuzz import fuzz, process
-from typing import Dict, List, Callable, Optional, Tuple
+from typing import Dict, List, Callable, NamedTuple, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -46,8 +50,8 @@ CONFIDENCE_MEDIUM = "MEDIUM"  # 85-94%
 CONFIDENCE_LOW = "LOW"        # < 85%
 
 # Variant tokens that must match exactly between query and candidate
-VARIANT_TOKENS = {"pro", "max", "ultra", "plus", "fold", "flip", "fe", "mini", "lite", "note", "edge",
-                  "gt", "turbo", "neo", "speed", "kit"}
+VARIANT_TOKENS = frozenset({"pro", "max", "ultra", "plus", "fold", "flip", "fe", "mini", "lite",
+                            "note", "edge", "gt", "turbo", "neo", "speed", "kit"})
 
 # Hardware model code pattern (e.g., ZE552KL, SM-G960F, A2172)
 # Requires 3+ digits to avoid matching normal model numbers like "s23", "a52"
@@ -125,6 +129,11 @@ _BRAND_SUFFIXES = re.compile(
 )
 
 
+# Raw brand string -> normalize_brand() result. Brand cardinality is tiny, so
+# after the first few rows of an upload every call is a hit.
+_BRAND_CACHE: Dict[str, str] = {}
+
+
 def normalize_brand(brand: str) -> str:
     """
     Normalize a brand name: lowercase, strip legal suffixes, apply alias lookup.
@@ -136,12 +145,25 @@ def normalize_brand(brand: str) -> str:
         'Hewlett Packard' -> 'hp'
         'XIAOMI' -> 'xiaomi'
     """
-    if not isinstance(brand, str) or not brand.strip():
+    if not isinstance(brand, str):
+        return ''
+    cached = _BRAND_CACHE.get(brand)
+    if cached is not None:
+        return cached
+    return _cache_store(_BRAND_CACHE, brand, sys.intern(_normalize_brand(brand)))
+
+
+def _normalize_brand(brand: str) -> str:
+    if not brand.strip():
         return ''
     b = brand.strip().lower()
     # Check alias table first (handles multi-word aliases like "hewlett packard")
     if b in BRAND_ALIASES:
         return BRAND_ALIASES[b]
+    # Already canonical - the suffix regex needs a space before the suffix,
+    # so it can never change a known single-word brand
+    if b in _KNOWN_BRANDS:
+        return b
     # Strip legal suffixes and check again
     b_stripped = _BRAND_SUFFIXES.sub('', b).strip()
     if b_stripped in BRAND_ALIASES:
@@ -426,7 +448,97 @@ def _clean_url_extracted_name(text: str) -> str:
 # String normalization
 # ---------------------------------------------------------------------------
 
-@lru_cache(maxsize=50000)
+# normalize_text() patterns, compiled once at import instead of being looked up
+# in re's pattern cache on every call (same patterns, flags and order as before).
+_NORM_MARK_RE = re.compile(r'\b(?:mark|mk)\s*(i{1,3}v?|vi{0,3}|ix|x|\d+)\b', re.IGNORECASE)
+_NORM_ORDINAL_SUFFIX_RE = re.compile(r'(st|nd|rd|th)$')
+_NORM_GEN_REVERSE_RE = re.compile(r'\b(\d+)(?:st|nd|rd|th)\s*gen(?:eration)?\b', re.IGNORECASE)
+_NORM_GEN_FORWARD_RE = re.compile(r'\bgen(?:eration)?\s*(i{1,3}v?|vi{0,3}|ix|x|\d+)\b', re.IGNORECASE)
+_NORM_ONE_PLUS_RE = re.compile(r'\bone\s+plus\b')
+_NORM_SA_PLUS_RE = re.compile(r'\b([sa]\d{1,2})\+')
+# promax / tab+model / brand+digit splits all insert a single space at a point
+# the lookaheads leave unconsumed, so one alternation covers all three passes
+_NORM_MODEL_SPLIT_RE = re.compile(
+    r'pro(?=max)'
+    r'|\btab(?=[a-z]\d)'
+    r'|\b(?:iphone|ipad|galaxy|pixel|redmi|mate|nova|honor|poco|note|reno|find)(?=\d)'
+)
+_NORM_DIGIT_VARIANT_RE = re.compile(r'(\d)(pro|max|plus|ultra|lite|mini|se)\b')
+_NORM_FOLD_FLIP_RE = re.compile(r'\b(fold|flip)\s+(\d+)\b')
+_NORM_GALAXY_SERIES_RE = re.compile(r'(galaxy)\s+([saz])\s+(\d{2})\b')
+_NORM_TBT_RE = re.compile(r'\b(\d+)\s*tbt\d?\b', re.IGNORECASE)
+_NORM_FRACTIONAL_TB_RE = re.compile(r'\b0\.(?:(?P<quarter>25)|(?P<half>5))\s*tb\b', re.IGNORECASE)
+_NORM_FRACTIONAL_TB_GB = {'quarter': '256gb', 'half': '512gb'}
+_NORM_PUNCT_RE = re.compile(r'[,\-\(\)"\'\/\.]')
+_NORM_FR_UNIT_RE = re.compile(r'(\d+)\s*([gt])o\b', re.IGNORECASE)
+_NORM_BARE_G_RE = re.compile(r'\b(6[4-9]|[7-9]\d|\d{3,})g\b', re.IGNORECASE)
+_NORM_UNIT_RE = re.compile(r'(\d+)\s*(gb|tb|mb|mm\b)', re.IGNORECASE)
+_NORM_INCHES_RE = re.compile(r'\d+\.?\d*\s*"')
+_NORM_CONNECTIVITY_RE = re.compile(r'\b(?:[345]g|lte)\b', re.IGNORECASE)
+_NORM_REGION_SIM_RE = re.compile(r'\b(dual\s*sim|ds|international|global)\b', re.IGNORECASE)
+_NORM_WHITESPACE_RE = re.compile(r'\s+')
+
+_NORM_ROMAN_MAP = {'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5',
+                   'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'x': '10'}
+
+
+def _norm_replace_mark(m):
+    """"mark ii" / "mark 2" -> "mk2" (roman -> digit, or keep digit)."""
+    val = m.group(1).strip().lower()
+    return f'mk{_NORM_ROMAN_MAP.get(val, val)}'
+
+
+def _norm_replace_gen_forward(m):
+    """"gen 2" / "gen ii" -> "gen2"."""
+    val = m.group(1).strip().lower()
+    return f'gen{_NORM_ROMAN_MAP.get(val, val)}'
+
+
+def _norm_replace_gen_reverse(m):
+    """"2nd gen" / "2nd generation" -> "gen2"."""
+    val = m.group(1).strip().lower()
+    return f'gen{_NORM_ORDINAL_SUFFIX_RE.sub("", val)}'
+
+
+def _norm_replace_fractional_tb(m):
+    return _NORM_FRACTIONAL_TB_GB[m.lastgroup]
+
+
+# Memo caches for the hot text helpers (normalize_text, extract_product_attributes,
+# extract_laptop_attributes, extract_category). Plain dicts instead of lru_cache: the NL side is a finite,
+# known set that warm_text_caches() fills at catalog load, and query strings are
+# added as they are seen. A full cache is cleared wholesale so a long-running
+# app session cannot grow it without bound.
+_TEXT_CACHE_MAXSIZE = 50000
+_NORM_CACHE: Dict[str, str] = {}
+_ATTRS_CACHE: Dict[Tuple[str, str], Dict[str, str]] = {}
+_LAPTOP_ATTRS_CACHE: Dict[Tuple[str, str], Dict[str, str]] = {}
+_LAPTOP_ROW_CACHE: Dict[Tuple[str, str], 'LaptopAttrRow'] = {}
+# Laptop candidate pools are keyed on a whole search list, so keep far fewer.
+_LAPTOP_POOL_CACHE_MAXSIZE = 256
+_LAPTOP_POOL_CACHE: Dict[Tuple[Tuple[str, ...], str], dict] = {}
+_CATEGORY_CACHE: Dict[str, str] = {}
+_SORT_KEY_CACHE: Dict[str, str] = {}
+_MODEL_VARIANT_CACHE: Dict[str, Tuple[str, str]] = {}
+# The verification gates re-extract storage and watch size from the same
+# query/candidate pair on every call.
+_STORAGE_CACHE: Dict[str, str] = {}
+_WATCH_MM_CACHE: Dict[str, str] = {}
+# Variant signatures for (text, brand): index build and signature matching.
+_SIGNATURE_CACHE: Dict[Tuple[str, str], str] = {}
+# Model-variant keywords per name for auto_select_matching_variant(). Catalog
+# rows are filled by warm_text_caches(), so variant selection runs no regex
+# on NL names at query time.
+_VARIANT_KEYWORDS_CACHE: Dict[str, Dict[str, any]] = {}
+
+
+def _cache_store(cache: Dict, key, value, maxsize: int = _TEXT_CACHE_MAXSIZE):
+    if len(cache) >= maxsize:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize an asset name for comparison with enhanced variant preservation.
@@ -453,76 +565,76 @@ def normalize_text(text: str) -> str:
     - Letter model variants (X, C, S after numbers)
     - Product type keywords
     """
+    cached = _NORM_CACHE.get(text)
+    if cached is not None:
+        return cached
     if not isinstance(text, str):
         return ""
 
     s = text.lower().strip()
 
+    # Passes guarded by `if '<literal>' in s` only run when the literal every
+    # match needs is present - a substring test is far cheaper than a regex
+    # scan, and most names trigger only a handful of passes. Guards are exact:
+    # s is already lowercased and none of the literals have case-fold variants.
+
     # --- Generation / edition normalization ---
     # Normalize "mark ii", "mk2", "mk 2", "gen 2", "2nd gen", "2nd generation"
     # to canonical "mk2" / "gen2" forms BEFORE punctuation removal
     # Roman numerals: I->1, II->2, III->3, IV->4, V->5, VI->6, VII->7, VIII->8, IX->9, X->10
-    _roman_map = {'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5',
-                  'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'x': '10'}
     # "mark ii" / "mark 2" -> "mk2"
-    def _replace_mark(m):
-        val = m.group(1).strip().lower()
-        num = _roman_map.get(val, val)  # roman -> digit, or keep digit
-        return f'mk{num}'
-    s = re.sub(r'\b(?:mark|mk)\s*(i{1,3}v?|vi{0,3}|ix|x|\d+)\b', _replace_mark, s, flags=re.IGNORECASE)
+    if 'mk' in s or 'mark' in s:
+        s = _NORM_MARK_RE.sub(_norm_replace_mark, s)
     # "gen 2" / "gen ii" / "2nd gen" / "2nd generation" -> "gen2"
-    def _replace_gen_forward(m):
-        val = m.group(1).strip().lower()
-        num = _roman_map.get(val, val)
-        return f'gen{num}'
-    def _replace_gen_reverse(m):
-        val = m.group(1).strip().lower()
-        num = re.sub(r'(st|nd|rd|th)$', '', val)
-        return f'gen{num}'
     # Reverse pattern MUST run first: "7th gen 10.4" -> "gen7 10.4" before forward
     # pattern can greedily match "gen 10" from the screen size that follows
-    s = re.sub(r'\b(\d+)(?:st|nd|rd|th)\s*gen(?:eration)?\b', _replace_gen_reverse, s, flags=re.IGNORECASE)
-    s = re.sub(r'\bgen(?:eration)?\s*(i{1,3}v?|vi{0,3}|ix|x|\d+)\b', _replace_gen_forward, s, flags=re.IGNORECASE)
+    if 'gen' in s:
+        s = _NORM_GEN_REVERSE_RE.sub(_norm_replace_gen_reverse, s)
+        s = _NORM_GEN_FORWARD_RE.sub(_norm_replace_gen_forward, s)
 
     # Brand canonicalization in text: collapse split brand names BEFORE model parsing
-    s = re.sub(r'\bone\s+plus\b', 'oneplus', s)
+    if 'plus' in s:
+        s = _NORM_ONE_PLUS_RE.sub('oneplus', s)
 
     # Samsung "+" variant normalization: "s24+" -> "s24 plus", "a55+" -> "a55 plus"
     # Galaxy S/A series use "+" as shorthand for Plus (S24+, S25+, A55+, Tab S8+).
     # Must run BEFORE punctuation removal since '+' is not a word token.
     # Pattern: letter s/a followed by 1-2 digits, then '+'.
     # Safe: won't match non-Samsung (OnePlus 12+ starts with digit, not s/a).
-    s = re.sub(r'\b([sa]\d{1,2})\+', r'\1 plus', s)
+    if '+' in s:
+        s = _NORM_SA_PLUS_RE.sub(r'\1 plus', s)
 
     # Model de-concatenation: split joined brand+model and variant patterns
     # Must happen early (before punctuation removal) but after lowercasing
     # Order matters: split compound variants first, then digit-based splits
-    # Pattern: variant combos joined together -> split (must be before digit splits)
-    s = re.sub(r'promax', 'pro max', s)
-    # Pattern: tab + model letter -> add space (tabs8 -> tab s8, taba7 -> tab a7)
-    s = re.sub(r'\b(tab)([a-z]\d)', r'\1 \2', s)
-    # Pattern: known brand names directly followed by digits -> add space
-    s = re.sub(r'\b(iphone|ipad|galaxy|pixel|redmi|mate|nova|honor|poco|note|reno|find)(\d)', r'\1 \2', s)
+    # Single pass, must be before digit splits:
+    #   variant combos joined together -> split (promax -> pro max)
+    #   tab + model letter -> add space (tabs8 -> tab s8, taba7 -> tab a7)
+    #   known brand names directly followed by digits -> add space
+    s = _NORM_MODEL_SPLIT_RE.sub(r'\g<0> ', s)
     # Pattern: digits directly followed by known variant keywords -> add space
-    s = re.sub(r'(\d)(pro|max|plus|ultra|lite|mini|se)\b', r'\1 \2', s)
+    s = _NORM_DIGIT_VARIANT_RE.sub(r'\1 \2', s)
 
     # --- Model concatenation: join separated model identifiers ---
     # "fold 3" -> "fold3", "flip 4" -> "flip4"
     # These are single model identifiers that should stay together for token matching
-    s = re.sub(r'\b(fold|flip)\s+(\d+)\b', r'\1\2', s)
+    if 'fold' in s or 'flip' in s:
+        s = _NORM_FOLD_FLIP_RE.sub(r'\1\2', s)
     # Galaxy S/A/Z series: "galaxy s 23" -> "galaxy s23", "galaxy a 54" -> "galaxy a54"
     # Only in galaxy context to avoid false positives (e.g., "Moto Z 32 GB" or "Mate S 32 GB")
-    s = re.sub(r'(galaxy)\s+([saz])\s+(\d{2})\b', r'\1 \2\3', s)
+    if 'galaxy' in s:
+        s = _NORM_GALAXY_SERIES_RE.sub(r'\1 \2\3', s)
 
     # Strip Thunderbolt port designators BEFORE storage parsing
     # "2 TBT3" means "2 Thunderbolt 3 ports", NOT "2 TB" storage
     # "4 TBT3" means "4 Thunderbolt 3 ports", NOT "4 TB" storage
-    s = re.sub(r'\b(\d+)\s*tbt\d?\b', r'\1tbt', s, flags=re.IGNORECASE)
+    if 'tbt' in s:
+        s = _NORM_TBT_RE.sub(r'\1tbt', s)
 
     # Pre-normalize fractional TB to GB BEFORE punctuation removal (dot matters here)
     # "0.25tb" -> "256gb", "0.5tb" -> "512gb"
-    s = re.sub(r'\b0\.25\s*tb\b', '256gb', s, flags=re.IGNORECASE)
-    s = re.sub(r'\b0\.5\s*tb\b', '512gb', s, flags=re.IGNORECASE)
+    if '0.' in s:
+        s = _NORM_FRACTIONAL_TB_RE.sub(_norm_replace_fractional_tb, s)
 
     # KEEP years - they're critical for distinguishing products
     # iPhone SE (2016) vs (2020) vs (2022) are DIFFERENT products
@@ -530,42 +642,40 @@ def normalize_text(text: str) -> str:
 
     # Remove common punctuation — replace with space to preserve token boundaries
     # This converts "(2016)" to " 2016 " which keeps the year
-    s = re.sub(r'[,\-\(\)"\'\/\.]', ' ', s)
+    s = _NORM_PUNCT_RE.sub(' ', s)
 
     # French storage units: "Go" (Giga-octets) -> GB, "To" (Téra-octets) -> TB
     # "256 Go" -> "256gb", "1 To" -> "1tb" (common in French recommerce data)
-    s = re.sub(r'(\d+)\s*go\b', r'\1gb', s, flags=re.IGNORECASE)
-    s = re.sub(r'(\d+)\s*to\b', r'\1tb', s, flags=re.IGNORECASE)
+    if 'go' in s or 'to' in s:
+        s = _NORM_FR_UNIT_RE.sub(r'\1\2b', s)
 
     # Fix missing unit: "256g" -> "256gb" (common typo in some datasets)
     # Only convert true storage sizes (64g, 128g, 256g, 512g, 1024g, 2048g)
     # Do NOT convert small numbers like 16g/20g (MacBook GPU cores like 14c/20g)
     # Safe rule: only convert when number is >=64 OR has 3+ digits
-    s = re.sub(r'\b(6[4-9]|[7-9]\d|\d{3,})g\b', r'\1gb', s, flags=re.IGNORECASE)
+    s = _NORM_BARE_G_RE.sub(r'\1gb', s)
 
     # Standardize storage/RAM: "16 gb" -> "16gb", handles TB/MB too
     # This keeps RAM values distinct: "2gb" vs "3gb" vs "4gb"
-    s = re.sub(r'(\d+)\s*(gb|tb|mb)', r'\1\2', s, flags=re.IGNORECASE)
-
-    # Standardize watch case size: "40 mm" -> "40mm"
+    # Same pass standardizes watch case size: "40 mm" -> "40mm"
     # Critical for watch matching: 42mm vs 46mm are DIFFERENT products
-    s = re.sub(r'(\d+)\s*mm\b', r'\1mm', s, flags=re.IGNORECASE)
+    s = _NORM_UNIT_RE.sub(r'\1\2', s)
 
     # Remove screen size patterns like 15.6" or 10.1" (inches)
     # These are mostly in List 2 laptop names and rarely in NL
-    s = re.sub(r'\d+\.?\d*\s*"', '', s)
+    if '"' in s:
+        s = _NORM_INCHES_RE.sub('', s)
 
     # Strip connectivity markers (5G, 4G, 3G, LTE) - these are NOT product differentiators
     # Z Fold2 5G vs Z Fold2 LTE are SAME base product (just different connectivity)
     # Example: "ROG Phone 3 5G" should match "ROG Phone 3" at 100%
-    s = re.sub(r'\b[345]g\b', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\blte\b', '', s, flags=re.IGNORECASE)
+    s = _NORM_CONNECTIVITY_RE.sub('', s)
 
     # Remove regional/SIM variants - these are NOT product differentiators
     # "Galaxy S10 Dual SIM" vs "Galaxy S10" are SAME base product
     # "iPhone 12 International" vs "iPhone 12" are SAME base product
     # Example: "Galaxy S10 DS" should match "Galaxy S10" at 100%
-    s = re.sub(r'\b(dual\s*sim|ds|international|global)\b', '', s, flags=re.IGNORECASE)
+    s = _NORM_REGION_SIM_RE.sub('', s)
 
     # KEEP variant suffixes - these indicate different physical products!
     # "Max", "Plus", "XL", "Pro" are already preserved (not removed)
@@ -573,21 +683,36 @@ def normalize_text(text: str) -> str:
     # Product type keywords (Tab, Watch, Fold, Note) are already preserved
 
     # Collapse whitespace
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = _NORM_WHITESPACE_RE.sub(' ', s).strip()
 
-    return s
+    # Interned: duplicate NL entries and repeated queries then share one
+    # string object, and dict/set hits compare by identity.
+    return _cache_store(_NORM_CACHE, text, sys.intern(s))
 
 
-def build_match_string(brand: str, name: str) -> str:
+def normalize_series(texts: pd.Series) -> pd.Series:
     """
-    Build a full product string from brand + name for matching.
+    normalize_text() over a whole Series, computing each distinct value once.
 
-    If the name already starts with the brand (like in List 2 / NL List),
-    we don't duplicate it. Otherwise, we prepend the brand.
+    Catalog and input columns repeat names heavily, so factorizing first and
+    mapping the uniques beats a per-row apply. Missing values normalize to ''.
     """
-    brand_str = str(brand).strip() if pd.notna(brand) else ""
-    name_str = str(name).strip() if pd.notna(name) else ""
+    codes, uniques = pd.factorize(texts)
+    # codes == -1 for missing values picks the trailing '' slot
+    normalized = np.array([normalize_text(u) for u in uniques] + [''], dtype=object)
+    return pd.Series(normalized[codes], index=texts.index, dtype=str)
 
+
+def _match_input(brand: str, name: str) -> str:
+    """Lowercased, pre-normalization brand + name string used by build_match_string()."""
+    return _match_input_str(
+        str(brand).strip() if pd.notna(brand) else "",
+        str(name).strip() if pd.notna(name) else "",
+    )
+
+
+def _match_input_str(brand_str: str, name_str: str) -> str:
+    """_match_input() for values already known to be stripped str (no NA/str() guards)."""
     # Normalize brand to canonical form: "HP OLD" -> "hp", "Dell Inc" -> "dell"
     # Removes catalog noise ("OLD"/"New") and legal suffixes before combining.
     if brand_str:
@@ -595,21 +720,102 @@ def build_match_string(brand: str, name: str) -> str:
         if brand_canonical:
             brand_str = brand_canonical
 
-    if not name_str:
-        return normalize_text(brand_str)
+    # Lowercase once here: the prefix test needs it anyway, normalize_text()
+    # lowercases first too (lower() is idempotent), and case variants of the
+    # same name then share one normalize_text cache entry.
+    brand_lc = brand_str.lower()
+    name_lc = name_str.lower()
+
+    if not name_lc:
+        return brand_lc
 
     # Check if name already starts with brand (case-insensitive)
-    if brand_str and name_str.lower().startswith(brand_str.lower()):
-        return normalize_text(name_str)
+    if brand_lc and name_lc.startswith(brand_lc):
+        return name_lc
 
-    combined = f"{brand_str} {name_str}".strip()
-    return normalize_text(combined)
+    return f"{brand_lc} {name_lc}".strip()
+
+
+def build_match_string(brand: str, name: str) -> str:
+    """
+    Build a full product string from brand + name for matching.
+
+    If the name already starts with the brand (like in List 2 / NL List),
+    we don't duplicate it. Otherwise, we prepend the brand.
+    """
+    return normalize_text(_match_input(brand, name))
+
+
+def _build_match_string_fast(brand_str: str, name_str: str) -> str:
+    """
+    build_match_string() for callers that already hold str values (the
+    run_matching row loop): skips the per-call pd.notna()/str() guards.
+    """
+    return normalize_text(_match_input_str(brand_str.strip(), name_str.strip()))
+
+
+def _str_column(values: pd.Series) -> List[str]:
+    """Stripped str() of every value, '' where missing - _match_input()'s guards, column-wise."""
+    present = values.notna().tolist()
+    return [str(v).strip() if ok else '' for v, ok in zip(values.tolist(), present)]
+
+
+def build_match_series(brands: pd.Series, names: pd.Series) -> pd.Series:
+    """build_match_string() over aligned brand/name Series (bulk catalog path)."""
+    return normalize_series(pd.Series(
+        [_match_input_str(b, n) for b, n in zip(_str_column(brands), _str_column(names))],
+        index=names.index,
+    ))
 
 
 # ---------------------------------------------------------------------------
 # Attribute-based matching (Level 0 - fast path)
 # ---------------------------------------------------------------------------
 
+# Laptop / CPU extractor patterns (extract_cpu_generation, extract_ram,
+# extract_processor_tier, extract_laptop_attributes), compiled once at import.
+# Patterns built from per-call values (product line, platform code) stay inline.
+_CPU_APPLE_RE = re.compile(r'\bm([123])\b')
+_CPU_INTEL_MODEL_RE = re.compile(r'(?:core\s+)?i[3579][\s\-]?(\d{4,5})[a-z]{0,2}')
+_CPU_RYZEN_MODEL_RE = re.compile(r'ryzen\s+[357]\s+(\d)(\d{3})')
+_CPU_ORDINAL_GEN_RE = re.compile(r'(\d{1,2})(?:st|nd|rd|th)\s*gen')
+_CPU_GEN_NORM_RE = re.compile(r'\bgen(\d{1,2})\b')
+_CPU_LOW_END_RE = re.compile(r'\b[n]\d{3}\b|celeron|pentium')
+_GB_VALUE_RE = re.compile(r'(\d+)\s*gb')
+_TB_VALUE_RE = re.compile(r'(\d+)\s*tb\b')
+_LAPTOP_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_LAPTOP_SCREEN_RE = re.compile(r'\b(\d{2}(?:\.\d)?)\s*(?:inch|")\b')
+_LAPTOP_SCREEN_NORM_RE = re.compile(r'\b(\d{2}(?:\.\d)?)\s+inch\b')
+_LAPTOP_APPLE_CHIP_RE = re.compile(r'\bm([1234])\s*(pro|max|ultra)?\b')
+_LAPTOP_RECENT_YEAR_RE = re.compile(r'\b(20[12]\d)\b')
+_ASUS_TUF_MODEL_RE = re.compile(r'\btuf\s+(?:gaming\s+)?([af]\d{2})\b')
+_HUAWEI_MATEBOOK_RE = re.compile(r'\bmatebook\s+([a-z])\b')
+_ACER_MODEL_CODE_RE = re.compile(r'\b([a-z]{2}\d{3})[-\s](\d{1,3}[a-z]*)\b')
+_ACER_BASE_CODE_RE = re.compile(r'\b([a-z]{2}\d{3})\b')
+_ASUS_MODEL_CODE_RE = re.compile(r'\b([a-z]{2}\d{3,4})[a-z]*\b')
+_ASUS_SHORT_CODE_RE = re.compile(r'\b([a-z]\d{3})[a-z]*\b')
+_DELL_PLATFORM_RE = re.compile(r'(?:\d{1,2}\s+)?([a-z]?\d{4}[a-z]?)\b')
+_DELL_PLATFORM_FALLBACK_RE = re.compile(r'\b([a-z]?\d{4})\b')
+_HP_PLATFORM_RE = re.compile(r'(\d{2,4})\s*(g\d+)?')
+_LENOVO_X1_PLATFORM_RE = re.compile(r'(x\d+\s+(?:carbon|yoga|nano|titanium))\b')
+_LENOVO_PLATFORM_RE = re.compile(r'([a-z]\d{1,2}[a-z]?)\b')
+# Checked in order - first hit wins (Apple Silicon, Intel Core, AMD Ryzen)
+_PROCESSOR_TIER_PATTERNS = (
+    ('m1', re.compile(r'\bm1\b')),
+    ('m2', re.compile(r'\bm2\b')),
+    ('m3', re.compile(r'\bm3\b')),
+    ('m4', re.compile(r'\bm4\b')),
+    ('i3', re.compile(r'\bcore\s*i3\b|i3[-\s]')),
+    ('i5', re.compile(r'\bcore\s*i5\b|i5[-\s]')),
+    ('i7', re.compile(r'\bcore\s*i7\b|i7[-\s]')),
+    ('i9', re.compile(r'\bcore\s*i9\b|i9[-\s]')),
+    ('ryzen3', re.compile(r'ryzen\s*3\b')),
+    ('ryzen5', re.compile(r'ryzen\s*5\b')),
+    ('ryzen7', re.compile(r'ryzen\s*7\b')),
+    ('ryzen9', re.compile(r'ryzen\s*9\b')),
+)
+
+
 def extract_cpu_generation(text: str) -> str:
     """
     Extract CPU generation from laptop specs.
@@ -618,14 +824,14 @@ def extract_cpu_generation(text: str) -> str:
     text_lower = text.lower()
 
     # Apple Silicon: M1, M2, M3
-    apple_match = re.search(r'\bm([123])\b', text_lower)
+    apple_match = _CPU_APPLE_RE.search(text_lower)
     if apple_match:
         return f"m{apple_match.group(1)}"
 
     # 5Intel Core patterns: i3-1200H, i5-1165G7, i7-10750H
     # Also handles normalized text where dash is stripped: "i5 1245u"
     # Extract full model number, then determine gen from digit count + value
-    intel_match = re.search(r'(?:core\s+)?i[3579][\s\-]?(\d{4,5})[a-z]{0,2}', text_lower)
+    intel_match = _CPU_INTEL_MODEL_RE.search(text_lower)
     if intel_match:
         model_digits = intel_match.group(1)
         if len(model_digits) == 5:
@@ -640,23 +846,23 @@ def extract_cpu_generation(text: str) -> str:
         return f"{gen}th gen"
 
     # AMD Ryzen patterns: Ryzen 5 5500U, Ryzen 7 6800H
-    ryzen_match = re.search(r'ryzen\s+[357]\s+(\d)(\d{3})', text_lower)
+    ryzen_match = _CPU_RYZEN_MODEL_RE.search(text_lower)
     if ryzen_match:
         gen = ryzen_match.group(1)
         return f"ryzen {gen}"
 
     # Fallback: look for "10th gen", "11th gen", etc.
-    gen_match = re.search(r'(\d{1,2})(?:st|nd|rd|th)\s*gen', text_lower)
+    gen_match = _CPU_ORDINAL_GEN_RE.search(text_lower)
     if gen_match:
         return f"{gen_match.group(1)}th gen"
 
     # Normalized text fallback: "gen8", "gen11" (from normalize_text converting "8th gen" -> "gen8")
-    gen_norm_match = re.search(r'\bgen(\d{1,2})\b', text_lower)
+    gen_norm_match = _CPU_GEN_NORM_RE.search(text_lower)
     if gen_norm_match:
         return f"{gen_norm_match.group(1)}th gen"
 
     # Low-end CPUs: N200, N100, Celeron, Pentium (treat as generic "core")
-    if re.search(r'\b[n]\d{3}\b|celeron|pentium', text_lower):
+    if _CPU_LOW_END_RE.search(text_lower):
         return 'core'
 
     return ''
@@ -669,7 +875,7 @@ def extract_ram(text: str) -> str:
     Storage starts at 128GB typically.
     """
     # Look for patterns like "8GB RAM", "16 GB", but filter out storage sizes
-    ram_matches = re.findall(r'(\d+)\s*gb', text.lower())
+    ram_matches = _GB_VALUE_RE.findall(text.lower())
 
     for size in ram_matches:
         size_int = int(size)
@@ -687,59 +893,65 @@ def extract_processor_tier(text: str) -> str:
     Returns: 'i3', 'i5', 'i7', 'i9', 'm1', 'm2', 'm3', 'ryzen3', 'ryzen5', 'ryzen7', ''
     """
     text_lower = text.lower()
+    for tier, pattern in _PROCESSOR_TIER_PATTERNS:
+        if pattern.search(text_lower):
+            return tier
+    return ''
 
-    # Apple Silicon
-    if re.search(r'\bm1\b', text_lower):
-        return 'm1'
-    if re.search(r'\bm2\b', text_lower):
-        return 'm2'
-    if re.search(r'\bm3\b', text_lower):
-        return 'm3'
-    if re.search(r'\bm4\b', text_lower):
-        return 'm4'
-
-    # Intel Core
-    if re.search(r'\bcore\s*i3\b|i3[-\s]', text_lower):
-        return 'i3'
-    if re.search(r'\bcore\s*i5\b|i5[-\s]', text_lower):
-        return 'i5'
-    if re.search(r'\bcore\s*i7\b|i7[-\s]', text_lower):
-        return 'i7'
-    if re.search(r'\bcore\s*i9\b|i9[-\s]', text_lower):
-        return 'i9'
-
-    # AMD Ryzen
-    if re.search(r'ryzen\s*3\b', text_lower):
-        return 'ryzen3'
-    if re.search(r'ryzen\s*5\b', text_lower):
-        return 'ryzen5'
-    if re.search(r'ryzen\s*7\b', text_lower):
-        return 'ryzen7'
-    if re.search(r'ryzen\s*9\b', text_lower):
-        return 'ryzen9'
 
-    return ''
+_LAPTOP_KEYWORDS = (
+    'laptop', 'notebook', 'chromebook',
+    'macbook', 'thinkpad', 'ideapad', 'yoga',
+    'pavilion', 'elitebook', 'probook', 'envy', 'spectre', 'omen',
+    'precision', 'latitude', 'inspiron', 'vostro', 'xps',
+    'vivobook', 'zenbook', 'rog', 'tuf',
+    'surface pro', 'surface laptop', 'surface book',
+    'matebook', 'magicbook',
+    'aspire', 'swift', 'predator', 'nitro', 'spin',
+    'legion', 'flex', 'travelmate', 'extensa',
+    'alienware', 'zbook',
+)
+
+
+def _keyword_trie_regex(words) -> 're.Pattern':
+    """
+    Compile plain substrings into one regex shaped like a prefix trie:
+    ('spectre', 'spin', 'swift') -> s(?:p(?:ectre|in)|wift).
+
+    search() then walks the text once and branches on shared prefixes,
+    instead of running one `in` scan per keyword or trying a flat
+    alternation word by word at every position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # end-of-word marker
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')' if len(branches) > 1 else branches[0]
+        if '' in node:
+            # A keyword ends here and longer ones continue: the rest is optional
+            body = (body if len(branches) > 1 else '(?:' + body + ')') + '?'
+        return body
+
+    return re.compile(build(trie))
+
+
+_LAPTOP_KEYWORD_RE = _keyword_trie_regex(_LAPTOP_KEYWORDS)
 
 
 def is_laptop_product(text: str) -> bool:
     """Check if text describes a laptop product."""
-    laptop_keywords = [
-        'laptop', 'notebook', 'chromebook',
-        'macbook', 'thinkpad', 'ideapad', 'yoga',
-        'pavilion', 'elitebook', 'probook', 'envy', 'spectre', 'omen',
-        'precision', 'latitude', 'inspiron', 'vostro', 'xps',
-        'vivobook', 'zenbook', 'rog', 'tuf',
-        'surface pro', 'surface laptop', 'surface book',
-        'matebook', 'magicbook',
-        'aspire', 'swift', 'predator', 'nitro', 'spin',
-        'legion', 'flex', 'travelmate', 'extensa',
-        'alienware', 'zbook'
-    ]
     text_lower = text.lower()
     # Exclude ROG Phone — it's a gaming phone, not a laptop
     if 'rog' in text_lower and 'phone' in text_lower:
         return False
-    return any(kw in text_lower for kw in laptop_keywords)
+    return _LAPTOP_KEYWORD_RE.search(text_lower) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -812,7 +1024,7 @@ def normalize_laptop_query_text_v2(text: str) -> str:
     return s
 
 
-def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
+def _extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
     """
     Extract laptop-specific attributes for matching.
 
@@ -833,20 +1045,18 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
     # Find all GB/TB values and pick the largest one that's not RAM
     storage = ''
     text_lower = text.lower()
+    ram_int = int(ram.replace('gb', '')) if ram else 0
 
-    # Find all storage values with explicit TB marker
+    # Find all storage values with explicit TB marker, and all GB values -
+    # scanned once, the dual-storage check below reuses both.
     # Use \b boundary to avoid matching "tbt3" (Thunderbolt 3 ports)
-    tb_matches = re.findall(r'(\d+)\s*tb\b', text_lower)
+    tb_matches = _TB_VALUE_RE.findall(text_lower)
+    gb_values = [int(m) for m in _GB_VALUE_RE.findall(text_lower)]
     if tb_matches:
         # Convert TB to GB for comparison (1TB = 1000GB roughly)
         storage = f"{tb_matches[0]}tb"
     else:
-        # Find all GB values
-        gb_matches = re.findall(r'(\d+)\s*gb', text_lower)
-        gb_values = [int(m) for m in gb_matches]
-
         # Filter: storage should be > RAM (storage is typically >= 128GB)
-        ram_int = int(ram.replace('gb', '')) if ram else 0
         storage_candidates = [v for v in gb_values if v > ram_int and v >= 128]
 
         if storage_candidates:
@@ -866,24 +1076,23 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
     if not cpu_gen:
         # Fallback for laptops without clear CPU gen (e.g., older Apple MacBooks):
         # Use year as model if present (e.g., "2015", "2016", "2017")
-        year_match = re.search(r'\b(20\d{2})\b', text)
+        year_match = _LAPTOP_YEAR_RE.search(text)
         if year_match:
             cpu_gen = year_match.group(1)
 
     # --- Screen size extraction (Task 1A) ---
     screen_inches = ''
-    _si = re.search(r'\b(\d{2}(?:\.\d)?)\s*(?:inch|")\b', text_lower)
+    _si = _LAPTOP_SCREEN_RE.search(text_lower)
     if not _si:
         # Fallback: already-normalized "NN inch" from v2 normalization
-        _si = re.search(r'\b(\d{2}(?:\.\d)?)\s+inch\b', text_norm)
+        _si = _LAPTOP_SCREEN_NORM_RE.search(text_norm)
     if _si:
         screen_inches = _si.group(1)
 
     # --- Apple chip extraction (Task 1B) ---
     apple_chip = ''
     if brand_norm == 'apple' or 'macbook' in text_lower:
-        _ac = re.search(
-            r'\bm([1234])\s*(pro|max|ultra)?\b', text_lower)
+        _ac = _LAPTOP_APPLE_CHIP_RE.search(text_lower)
         if _ac:
             apple_chip = f'm{_ac.group(1)}'
             if _ac.group(2):
@@ -891,20 +1100,16 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
 
     # --- Year extraction ---
     year = ''
-    _yr = re.search(r'\b(20[12]\d)\b', text)
+    _yr = _LAPTOP_RECENT_YEAR_RE.search(text)
     if _yr:
         year = _yr.group(1)
 
     # --- Dual-storage detection (Task 1C) ---
     storage_ambiguous = False
     storage_list = []
-    _all_gb = re.findall(r'(\d+)\s*gb', text_lower)
-    _all_tb = re.findall(r'(\d+)\s*tb\b', text_lower)
-    _gb_vals = [int(v) for v in _all_gb]
-    _tb_vals = [int(v) * 1024 for v in _all_tb]
-    ram_int = int(ram.replace('gb', '')) if ram else 0
+    _tb_vals = [int(v) * 1024 for v in tb_matches]
     _storage_vals = sorted(set(
-        [v for v in _gb_vals if v >= 128 and v != ram_int] + _tb_vals
+        [v for v in gb_values if v >= 128 and v != ram_int] + _tb_vals
     ))
     if len(_storage_vals) >= 2:
         storage_ambiguous = True
@@ -929,8 +1134,6 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
     }
 
     # Extract laptop product lines by brand
-    text_lower = text.lower()
-
     # Dell product lines
     if 'dell' in brand_norm:
         for line in ['precision', 'latitude', 'inspiron', 'vostro', 'xps', 'alienware']:
@@ -1022,8 +1225,7 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
                     break
             # TUF sub-models: tuf a15, tuf f15, tuf fx
             if not laptop_family and 'tuf' in text_norm:
-                _tuf_m = re.search(
-                    r'\btuf\s+(?:gaming\s+)?([af]\d{2})\b', text_norm)
+                _tuf_m = _ASUS_TUF_MODEL_RE.search(text_norm)
                 if _tuf_m:
                     laptop_family = f'tuf {_tuf_m.group(1)}'
                 elif 'fx' in text_norm:
@@ -1054,8 +1256,7 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
                     laptop_family = fam
                     break
             if not laptop_family:
-                _hw_m = re.search(
-                    r'\bmatebook\s+([a-z])\b', text_norm)
+                _hw_m = _HUAWEI_MATEBOOK_RE.search(text_norm)
                 if _hw_m:
                     laptop_family = f'matebook {_hw_m.group(1)}'
 
@@ -1068,22 +1269,22 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
         # Full Acer model code WITH suffix: sf314-57 or sf314 57 (hyphen or space)
         # The suffix distinguishes hardware revisions (SF314-57 != SF314-58)
         # normalize_text strips hyphens -> "sf314 57", raw text keeps "sf314-57"
-        _mc_m = re.search(r'\b([a-z]{2}\d{3})[-\s](\d{1,3}[a-z]*)\b', text_lower)
+        _mc_m = _ACER_MODEL_CODE_RE.search(text_lower)
         if _mc_m:
             # Normalize to hyphen form: "sf314-57" regardless of separator
             model_code = f'{_mc_m.group(1)}-{_mc_m.group(2)}'
         else:
             # Fallback: base code only (no suffix in text): sf314, an515
-            _mc_m = re.search(r'\b([a-z]{2}\d{3})\b', text_lower)
+            _mc_m = _ACER_BASE_CODE_RE.search(text_lower)
             if _mc_m:
                 model_code = _mc_m.group(1)
     elif brand_norm == 'asus':
         # 2-letter + 3-4 digit (primary): ux325, ga401, gm501
         # Allow trailing letters (ux325ea, ga401iv) — capture only base code
-        _mc_m = re.search(r'\b([a-z]{2}\d{3,4})[a-z]*\b', text_lower)
+        _mc_m = _ASUS_MODEL_CODE_RE.search(text_lower)
         if not _mc_m:
             # 1-letter + 3-digit fallback: g551, g752, s510
-            _mc_m = re.search(r'\b([a-z]\d{3})[a-z]*\b', text_lower)
+            _mc_m = _ASUS_SHORT_CODE_RE.search(text_lower)
         if _mc_m:
             model_code = _mc_m.group(1)
     attrs['model_code'] = model_code
@@ -1101,14 +1302,14 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
             if brand_norm == 'dell':
                 # Dell: 4-digit code, optionally with letter prefix (E5470)
                 # Allow optional 2-digit screen/series prefix: "Inspiron 15 7570"
-                _pc_m = re.match(r'(?:\d{1,2}\s+)?([a-z]?\d{4}[a-z]?)\b', remaining)
+                _pc_m = _DELL_PLATFORM_RE.match(remaining)
                 if _pc_m:
                     attrs['platform_code'] = _pc_m.group(1)
                 else:
                     # Fallback: NL catalog format has model code mid-text
                     # e.g. "dell inspiron core i5 gen8 4gb 3576 15 inch 1tb"
                     # Find standalone 4-digit number NOT part of CPU spec
-                    for _fb in re.finditer(r'\b([a-z]?\d{4})\b', text_norm):
+                    for _fb in _DELL_PLATFORM_FALLBACK_RE.finditer(text_norm):
                         _fb_code = _fb.group(1)
                         _fb_pos = _fb.start()
                         # Skip if preceded by i3/i5/i7/i9 (CPU model like 8250)
@@ -1123,7 +1324,7 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
 
             elif brand_norm == 'hp':
                 # HP: 3-4 digit code + optional G# (840 G8, 640 G9, 15 G6)
-                _pc_m = re.match(r'(\d{2,4})\s*(g\d+)?', remaining)
+                _pc_m = _HP_PLATFORM_RE.match(remaining)
                 if _pc_m:
                     pc_parts = [_pc_m.group(1)]
                     if _pc_m.group(2):
@@ -1132,11 +1333,10 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
 
             elif brand_norm == 'lenovo':
                 # Lenovo: X1 Carbon/Yoga/Nano first (more specific)
-                _pc_m = re.match(
-                    r'(x\d+\s+(?:carbon|yoga|nano|titanium))\b', remaining)
+                _pc_m = _LENOVO_X1_PLATFORM_RE.match(remaining)
                 if not _pc_m:
                     # Simple: letter + 1-2 digits + optional suffix (t14, e14, l14, p14s)
-                    _pc_m = re.match(r'([a-z]\d{1,2}[a-z]?)\b', remaining)
+                    _pc_m = _LENOVO_PLATFORM_RE.match(remaining)
                 if _pc_m:
                     attrs['platform_code'] = _pc_m.group(1)
 
@@ -1152,8 +1352,7 @@ def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
             _rev_gen = f"{_pc_gen.group(1)}th gen"
             if cpu_gen == _rev_gen:
                 # cpu_gen came from product revision — try CPU model number only
-                _intel_re = re.search(
-                    r'(?:core\s+)?i[3579][\s\-]?(\d{4,5})[a-z]{0,2}', text_lower)
+                _intel_re = _CPU_INTEL_MODEL_RE.search(text_lower)
                 if _intel_re:
                     _d = _intel_re.group(1)
                     _g = _d[:2] if (len(_d) == 5 or _d[0] == '1') else _d[0]
@@ -1183,6 +1382,103 @@ _BUSINESS_LINES = {
 }
 
 
+def extract_laptop_attributes(text: str, brand: str) -> Dict[str, str]:
+    """
+    Cached front for _extract_laptop_attributes().
+
+    match_laptop_by_attributes() re-extracts every laptop candidate for every
+    laptop query, so the same (name, brand) pairs recur constantly. The
+    returned dict is shared between callers - do not mutate it.
+    """
+    key = (text, brand)
+    cached = _LAPTOP_ATTRS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _cache_store(_LAPTOP_ATTRS_CACHE, key, _extract_laptop_attributes(text, brand))
+
+
+class LaptopAttrRow(NamedTuple):
+    """
+    Fixed-field view of the laptop attributes match_laptop_by_attributes() compares.
+
+    The extractor itself keeps returning a dict (its key set varies and callers
+    rely on .get() defaults); this row is only for the candidate loop, where
+    tuple unpacking replaces a dozen dict lookups per candidate. Missing
+    attributes are ''.
+    """
+    processor: str
+    generation: str
+    ram: str
+    storage: str
+    product_line: str
+    platform_code: str
+    laptop_family: str
+    model_code: str
+    screen_inches: str
+    apple_chip: str
+    year: str
+
+
+def laptop_attr_row(text: str, brand: str) -> LaptopAttrRow:
+    """Cached LaptopAttrRow for extract_laptop_attributes(text, brand)."""
+    key = (text, brand)
+    row = _LAPTOP_ROW_CACHE.get(key)
+    if row is not None:
+        return row
+    attrs = extract_laptop_attributes(text, brand)
+    row = LaptopAttrRow._make(attrs.get(f, '') for f in LaptopAttrRow._fields)
+    return _cache_store(_LAPTOP_ROW_CACHE, key, row)
+
+
+def laptop_candidate_pool(search_names: List[str], brand: str) -> dict:
+    """
+    Laptop subset of search_names with its attributes laid out column-wise.
+
+    Returns {'names', 'rows', 'codes', 'vocab'}: the laptop names in search
+    order, their LaptopAttrRow, and per field an int32 array of value codes
+    plus the value -> code map. Code 0 is always ''. Equality filters then
+    become one numpy comparison per field instead of a Python loop over every
+    candidate. Cached per (search list, brand) since brand-partitioned search
+    lists repeat across queries.
+    """
+    key = (tuple(search_names), brand)
+    pool = _LAPTOP_POOL_CACHE.get(key)
+    if pool is not None:
+        return pool
+    names = [n for n in search_names if is_laptop_product(n)]
+    rows = [laptop_attr_row(n, brand) for n in names]
+    codes = {}
+    vocab = {}
+    for i, field in enumerate(LaptopAttrRow._fields):
+        field_vocab = {'': 0}
+        codes[field] = np.fromiter(
+            (field_vocab.setdefault(r[i], len(field_vocab)) for r in rows),
+            dtype=np.int32, count=len(rows),
+        )
+        vocab[field] = field_vocab
+    pool = {'names': names, 'rows': rows, 'codes': codes, 'vocab': vocab}
+    return _cache_store(_LAPTOP_POOL_CACHE, key, pool, _LAPTOP_POOL_CACHE_MAXSIZE)
+
+
+def _pool_equals(pool: dict, field: str, value: str) -> np.ndarray:
+    """Mask of pool candidates whose `field` equals value."""
+    return pool['codes'][field] == pool['vocab'][field].get(value, -1)
+
+
+def _pool_compatible(pool: dict, field: str, value: str) -> np.ndarray:
+    """Mask of pool candidates whose `field` is empty or equals value."""
+    codes = pool['codes'][field]
+    return (codes == 0) | (codes == pool['vocab'][field].get(value, -1))
+
+
+def _pool_line_codes(pool: dict, q_line: str) -> List[int]:
+    """Codes of non-empty product lines that equal or contain / are contained in q_line."""
+    return [
+        code for line, code in pool['vocab']['product_line'].items()
+        if line and (line == q_line or line in q_line or q_line in line)
+    ]
+
+
 def laptop_policy_class(query_text: str, brand: str, attrs: Dict) -> str:
     """Classify a laptop into a policy class for completeness thresholds.
 
@@ -1212,6 +1508,23 @@ def laptop_policy_class(query_text: str, brand: str, attrs: Dict) -> str:
     return 'WINDOWS_OTHER'
 
 
+# Watch / tablet / screen extractor patterns, compiled once at import
+_WATCH_ALUMINUM_RE = re.compile(r'\b(alumin(?:um|ium)?|alu|alum)\b')
+_WATCH_STAINLESS_RE = re.compile(r'\b(stainless(?:\s*steel)?|st\s*steel|steel|ss)\b')
+_WATCH_TITANIUM_RE = re.compile(r'\b(titanium|titan|ti)\b')
+_WATCH_CERAMIC_RE = re.compile(r'\bceramic\b')
+_WATCH_BLACK_UNITY_RE = re.compile(r'\b(black\s*unity|unity)\b')
+_WATCH_HERMES_RE = re.compile(r'\b(herm[eè]s)\b')
+_WATCH_NIKE_RE = re.compile(r'\bnike\b')
+_WATCH_SPECIAL_EDITION_RE = re.compile(r'\b(special\s+edition|edition)\b')
+_TABLET_ORDINAL_GEN_RE = re.compile(r'(\d+)(?:st|nd|rd|th)\s*gen')
+_TABLET_GEN_NORM_RE = re.compile(r'\bgen(\d+)\b')
+_SCREEN_SPACED_INCH_RE = re.compile(r'(?<!gen)(?<!\d)\b(\d{1,2})\s(\d)\s*(?:"|inch)')
+_SCREEN_INCH_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:"|inch)')
+_SCREEN_DECIMAL_RE = re.compile(r'\b(\d{1,2}\.\d{1,2})\b')
+_SCREEN_SPACED_RE = re.compile(r'(?<!gen)(?<!\d)\b(\d{1,2})\s(\d)\b')
+
+
 def extract_watch_material(text_norm: str) -> str:
     """
     Canonical watch material extractor.
@@ -1229,20 +1542,20 @@ def extract_watch_material(text_norm: str) -> str:
     t = text_norm.lower()
 
     # Aluminum variants: aluminum, aluminium, alumin, alum, alu
-    if re.search(r'\b(alumin(?:um|ium)?|alu|alum)\b', t):
+    if _WATCH_ALUMINUM_RE.search(t):
         return 'aluminum'
 
     # Stainless variants: stainless, stainlesssteel, stainless steel, st steel, ss, steel
     # Note: "steel" alone is safe here because this function is ONLY called for watches
-    if re.search(r'\b(stainless(?:\s*steel)?|st\s*steel|steel|ss)\b', t):
+    if _WATCH_STAINLESS_RE.search(t):
         return 'stainless'
 
     # Titanium variants: titanium, titan, ti
-    if re.search(r'\b(titanium|titan|ti)\b', t):
+    if _WATCH_TITANIUM_RE.search(t):
         return 'titanium'
 
     # Ceramic
-    if re.search(r'\bceramic\b', t):
+    if _WATCH_CERAMIC_RE.search(t):
         return 'ceramic'
 
     return ''
@@ -1256,13 +1569,13 @@ def extract_watch_edition(text_norm: str) -> str:
     Only called for watches — cannot affect phones/tablets/laptops.
     """
     t = text_norm.lower()
-    if re.search(r'\b(black\s*unity|unity)\b', t):
+    if _WATCH_BLACK_UNITY_RE.search(t):
         return 'black_unity'
-    if re.search(r'\b(herm[eè]s)\b', t):
+    if _WATCH_HERMES_RE.search(t):
         return 'hermes'
-    if re.search(r'\bnike\b', t):
+    if _WATCH_NIKE_RE.search(t):
         return 'nike'
-    if re.search(r'\b(special\s+edition|edition)\b', t):
+    if _WATCH_SPECIAL_EDITION_RE.search(t):
         return 'edition'
     return ''
 
@@ -1276,11 +1589,11 @@ def extract_tablet_generation(text_norm: str) -> str:
         return ''
     t = text_norm.lower()
     # "7th gen", "5th generation"
-    m = re.search(r'(\d+)(?:st|nd|rd|th)\s*gen', t)
+    m = _TABLET_ORDINAL_GEN_RE.search(t)
     if m:
         return m.group(1)
     # normalize_text already converts "7th generation" -> "gen7", "gen 5" -> "gen5"
-    m2 = re.search(r'\bgen(\d+)\b', t)
+    m2 = _TABLET_GEN_NORM_RE.search(t)
     if m2:
         return m2.group(1)
     return ''
@@ -1295,29 +1608,37 @@ def extract_screen_inches(text_norm: str) -> str:
     if not isinstance(text_norm, str):
         return ''
     t = text_norm.lower()
-    # Space-separated decimal + inch suffix: "7 9 inch" -> "7.9" (must run BEFORE simple inch match)
-    # This handles normalize_text converting "7.9 inch" -> "7 9 inch"
-    m_sp_inch = re.search(r'(?<!gen)(?<!\d)\b(\d{1,2})\s(\d)\s*(?:"|inch)', t)
-    if m_sp_inch:
-        reconstructed = f'{m_sp_inch.group(1)}.{m_sp_inch.group(2)}'
-        val = float(reconstructed)
-        if 7.0 <= val <= 15.0:
-            return reconstructed
-    # "8.3"", "10.4 inch", "11 inch"
-    m = re.search(r'(\d+(?:\.\d+)?)\s*(?:"|inch)', t)
-    if m:
-        val = float(m.group(1))
-        if 7.0 <= val <= 15.0:
-            return m.group(1)
+    # Each pattern below only ever looks at its own first match, in this
+    # priority order, so they cannot be folded into one alternation without
+    # changing results. Instead, the unit / decimal-point patterns are skipped
+    # outright when the text has no '"', 'inch' or '.' - normalize_text output
+    # usually has none of them.
+    has_unit = '"' in t or 'inch' in t
+    if has_unit:
+        # Space-separated decimal + inch suffix: "7 9 inch" -> "7.9" (must run BEFORE simple inch match)
+        # This handles normalize_text converting "7.9 inch" -> "7 9 inch"
+        m_sp_inch = _SCREEN_SPACED_INCH_RE.search(t)
+        if m_sp_inch:
+            reconstructed = f'{m_sp_inch.group(1)}.{m_sp_inch.group(2)}'
+            val = float(reconstructed)
+            if 7.0 <= val <= 15.0:
+                return reconstructed
+        # "8.3"", "10.4 inch", "11 inch"
+        m = _SCREEN_INCH_RE.search(t)
+        if m:
+            val = float(m.group(1))
+            if 7.0 <= val <= 15.0:
+                return m.group(1)
     # Bare decimal in tablet range: "10.4", "8.3" (no unit suffix)
-    m2 = re.search(r'\b(\d{1,2}\.\d{1,2})\b', t)
-    if m2:
-        val = float(m2.group(1))
-        if 7.0 <= val <= 15.0:
-            return m2.group(1)
+    if '.' in t:
+        m2 = _SCREEN_DECIMAL_RE.search(t)
+        if m2:
+            val = float(m2.group(1))
+            if 7.0 <= val <= 15.0:
+                return m2.group(1)
     # Space-separated decimal without suffix: "10 4" -> "10.4", "8 3" -> "8.3"
     # Negative lookbehind prevents matching "gen7 8" as "7.8" (gen prefix = generation, not screen)
-    m3 = re.search(r'(?<!gen)(?<!\d)\b(\d{1,2})\s(\d)\b', t)
+    m3 = _SCREEN_SPACED_RE.search(t)
     if m3:
         reconstructed = f'{m3.group(1)}.{m3.group(2)}'
         val = float(reconstructed)
@@ -1326,8 +1647,89 @@ def extract_screen_inches(text_norm: str) -> str:
     return ''
 
 
-@lru_cache(maxsize=50000)
-def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
+# extract_product_attributes() patterns (watch series, tablet screen / chip /
+# connectivity / model codes, per-brand phone model captures, generic
+# fallbacks), compiled once at import. None has nested ambiguous quantifiers
+# (repeated groups start with \s+ and a literal word), so `re` runs them in
+# linear time.
+_WATCH_SERIES_RE = re.compile(r'\b(series\s*\d+(?:\s*(?:pro|ultra|se))?|ultra\s*\d+|se)\b')
+_ATTR_YEAR_RE = re.compile(r'\b(20[12]\d)\b')
+_ATTR_SCREEN_RE = re.compile(r'\b(\d{1,2}(?:\.\d{1,2})?)\s*(?:inch|in|"|\'\')')
+_TABLET_VARIANT_RE = re.compile(r'\b(pro|se|lite|air|mini|kids|paper|plus|ultra|fe)\b')
+_TABLET_LINE_WORDS = frozenset({'pro', 'se', 'lite', 'air'})
+_TABLET_CELLULAR_RE = re.compile(r'\b(?:cellular|lte|5g|4g)\b')
+_TABLET_WIFI_RE = re.compile(r'\bwifi\b')
+_TABLET_CHIP_RE = re.compile(r'\bm([1-9])\b')
+_TABLET_HW_CODE_RE = re.compile(r'\b([a-z]{1,3}\d{3,5}[a-z]{0,2})\b')
+_STORAGE_TOKEN_RE = re.compile(r'^\d+[gt]b?$')
+_IPAD_VARIANT_RE = re.compile(r'ipad\s+(?:ipad\s+)?(pro|air|mini)')
+_IPAD_VARIANT_GEN_RE = re.compile(r'ipad\s+(?:ipad\s+)?(?:pro|air|mini)\s+(?:ipad\s+(?:pro|air|mini)\s+)?(gen\d+)')
+_IPAD_GEN_RE = re.compile(r'ipad\s+(?:ipad\s+)?(gen\d+)')
+_IPAD_SPACED_SCREEN_RE = re.compile(r'\b(\d{1,2})\s+(\d)\b')
+_IPAD_DECIMAL_SCREEN_RE = re.compile(r'\b(\d{1,2}\.\d)\b')
+_GALAXY_TAB_MODEL_RE = re.compile(r'tab\s+([a-z]\d+[a-z]*(?:\s+(?:plus|ultra|lite|fe))*)')
+_GALAXY_TAB_FAMILY_RE = re.compile(r'tab\s+([a-z]\d+)')
+_MEDIAPAD_MODEL_RE = re.compile(r'mediapad\s+((?:t\d+|m\d+|lite)\s*(?:lite)?)')
+_MATEPAD_MODEL_RE = re.compile(r'matepad\s+(pro|air|t\d+|se)?')
+_DIGITS_RE = re.compile(r'(\d+)')
+_SAMSUNG_MODEL_CODE_RE = re.compile(r'\b(?:sm-)?[a-z]\d{3,5}[a-z]?\b', re.IGNORECASE)
+_IPHONE_MODEL_RE = re.compile(r'iphone\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|mini|ultra|lite))*)')
+_GALAXY_Z_MODEL_RE = re.compile(r'galaxy\s+(z\s+(?:fold|flip)\s*\d*(?:\s+(?:pro|plus|max|ultra|lite|5g))*)')
+_GALAXY_MODEL_RE = re.compile(r'galaxy\s+([a-z]+\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite|fe|note|fold|flip|edge|active))*)')
+_PIXEL_MODEL_RE = re.compile(r'pixel\s+(\d+[a-z]*(?:\s+(?:pro\s+fold|pro\s+xl|fold|pro|xl|max|ultra|lite|a))*)')
+_REDMI_MODEL_RE = re.compile(r'redmi\s+(note\s+\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*|\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)', re.IGNORECASE)
+_MI_WORD_RE = re.compile(r'\bmi\b')
+_MI_MODEL_RE = re.compile(r'\bmi\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)')
+_XIAOMI_MODEL_RE = re.compile(r'xiaomi\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite|t))*)')
+_MATE_MODEL_RE = re.compile(r'mate\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)')
+_HUAWEI_P_WORD_RE = re.compile(r'\bp\d+')
+_HUAWEI_P_MODEL_RE = re.compile(r'p(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)')
+_RENO_SERIES_RE = re.compile(r'reno\s+\d+\s+series\s+')
+_RENO_MODEL_RE = re.compile(r'reno\s+(\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|neo|z|f))*)')
+_FIND_SERIES_RE = re.compile(r'find\s+[a-z]?\d+\s+series\s+')
+_FIND_MODEL_RE = re.compile(r'find\s+([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|neo))*)')
+_GENERIC_LINE_MODEL_RE = re.compile(r'\b([a-z]+)\s+([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|mini|note|xl|edge|active))*)', re.IGNORECASE)
+_GENERIC_MODEL_RE = re.compile(r'\b([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|mini|xl))*)', re.IGNORECASE)
+_ANY_DIGIT_RE = re.compile(r'\d')
+# Noise words Pattern 1 rejects as a product line / Pattern 2 skips when picking one
+_GENERIC_LINE_NOISE_WORDS = frozenset({'the', 'and', 'or', 'with', 'dual', 'sim', 'unlocked',
+                                       'new', 'used', 'refurbished'})
+_GENERIC_LINE_SKIP_WORDS = frozenset({'the', 'and', 'with', 'sim', 'new', 'used'})
+
+# Result for empty input; copied per call rather than rebuilt as a literal on
+# every extraction.
+_EMPTY_PRODUCT_ATTRS = {
+    'brand': '', 'product_line': '', 'model': '', 'storage': '', 'ram': '',
+    'watch_mm': '', 'connectivity': '',
+}
+
+
+def _model_variant_generation(model: str) -> Tuple[str, str]:
+    """(variant, generation) derived from a phone model string - cached, models repeat."""
+    cached = _MODEL_VARIANT_CACHE.get(model)
+    if cached is not None:
+        return cached
+    _vt = VARIANT_TOKENS.intersection(model.lower().split())
+    _gm = _DIGITS_RE.search(model)
+    return _cache_store(_MODEL_VARIANT_CACHE, model, (
+        ' '.join(sorted(_vt)) if _vt else '',
+        _gm.group(1) if _gm else '',
+    ))
+
+
+def _finalize_mobile_attrs(a: Dict[str, str]) -> Dict[str, str]:
+    """Enrich mobile attrs with variant and generation from model string."""
+    _m = a.get('model', '')
+    if _m:
+        variant, generation = _model_variant_generation(_m)
+        if variant and not a.get('variant'):
+            a['variant'] = variant
+        if generation and not a.get('generation'):
+            a['generation'] = generation
+    return a
+
+
+def _extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     """
     HYBRID extraction: watch + laptop + phone hand-tuned + generic fallback.
 
@@ -1345,12 +1747,9 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         'watch_mm': case size for watches (40mm, 42mm, 44mm, 46mm, etc.)
         'connectivity': GPS vs Cellular for watches
     """
-    _default_attrs = {'brand': '', 'product_line': '', 'model': '', 'storage': '', 'ram': '', 'watch_mm': '', 'connectivity': ''}
     if not isinstance(text, str) or not text.strip():
-        return _default_attrs
+        return dict(_EMPTY_PRODUCT_ATTRS)
 
-    # Save original text before normalization (for connectivity detection: "lte" gets stripped)
-    text_orig = text.lower()
     text_norm = normalize_text(text)
     # Use normalize_brand so attrs['brand'] matches attribute_index keys
     brand_norm = normalize_brand(brand) if isinstance(brand, str) and brand.strip() else ''
@@ -1358,18 +1757,19 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         brand_norm = normalize_text(brand) if isinstance(brand, str) else ''
 
     # === WATCH DETECTION (priority - critical attributes: mm, series, connectivity) ===
-    if extract_category(text_norm) == 'watch':
+    category = extract_category(text_norm)
+    if category == 'watch':
         watch_mm = extract_watch_mm(text_norm)
 
         # Extract series/generation: "series 10", "ultra 2", "se"
         series = ''
-        series_match = re.search(r'\b(series\s*\d+(?:\s*(?:pro|ultra|se))?|ultra\s*\d+|se)\b', text_norm)
+        series_match = _WATCH_SERIES_RE.search(text_norm)
         if series_match:
             series = series_match.group(1).replace('  ', ' ').strip()
 
         # Extract connectivity: GPS vs Cellular
         connectivity = ''
-        if 'cellular' in text_norm or 'lte' in text_norm.lower() or '4g' in text_norm.lower():
+        if 'cellular' in text_norm or 'lte' in text_norm or '4g' in text_norm:
             connectivity = 'cellular'
         elif 'gps' in text_norm:
             connectivity = 'gps'
@@ -1394,16 +1794,15 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
 
     # === LAPTOP DETECTION (priority - different naming convention) ===
     if is_laptop_product(text):
-        laptop_attrs = extract_laptop_attributes(text, brand)
+        laptop_attrs = dict(extract_laptop_attributes(text, brand))  # copy: cached dict is shared
         # Add year if not already captured as generation
         if not laptop_attrs.get('generation'):
-            year_m = re.search(r'\b(20[12]\d)\b', text_norm)
+            year_m = _ATTR_YEAR_RE.search(text_norm)
             if year_m:
                 laptop_attrs['year'] = year_m.group(1)
         return laptop_attrs
 
     # === TABLET DETECTION (iPad, Galaxy Tab, MatePad, etc.) ===
-    category = extract_category(text_norm)
     if category == 'tablet':
         tablet_attrs = {
             'brand': brand_norm,
@@ -1423,10 +1822,10 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         }
 
         # Extract screen size: "10.4"", "10.4''", "10.4 inch", "11"", bare "10.4"
-        screen_m = re.search(r'\b(\d{1,2}(?:\.\d{1,2})?)\s*(?:inch|in|"|\'\')', text_norm)
+        screen_m = _ATTR_SCREEN_RE.search(text_norm)
         if not screen_m:
             # Bare decimal in tablet-range: "10.4", "11.0", "8.3" (no unit suffix)
-            screen_m = re.search(r'\b(\d{1,2}\.\d{1,2})\b', text_norm)
+            screen_m = _SCREEN_DECIMAL_RE.search(text_norm)
             if screen_m:
                 val = float(screen_m.group(1))
                 if not (7.0 <= val <= 13.0):
@@ -1441,51 +1840,51 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         tablet_attrs['generation'] = extract_tablet_generation(text_norm)
 
         # Extract year
-        year_m = re.search(r'\b(20[12]\d)\b', text_norm)
+        year_m = _ATTR_YEAR_RE.search(text_norm)
         if year_m:
             tablet_attrs['year'] = year_m.group(1)
 
         # Extract tablet_line (pro/se/lite/air — shared across brands)
-        _TABLET_VARIANT_KW = {'pro', 'se', 'lite', 'air', 'mini', 'kids', 'paper', 'plus', 'ultra', 'fe'}
-        for kw in _TABLET_VARIANT_KW:
-            if re.search(r'\b' + kw + r'\b', text_norm):
-                tablet_attrs['variant_tokens'].add(kw)
-        tl_m = re.search(r'\b(pro|se|lite|air)\b', text_norm)
-        if tl_m:
-            tablet_attrs['tablet_line'] = tl_m.group(1)
+        # One scan collects every variant word; tablet_line is the first of
+        # them (leftmost) that is a line word.
+        for vm in _TABLET_VARIANT_RE.finditer(text_norm):
+            kw = vm.group(1)
+            tablet_attrs['variant_tokens'].add(kw)
+            if not tablet_attrs['tablet_line'] and kw in _TABLET_LINE_WORDS:
+                tablet_attrs['tablet_line'] = kw
 
         # Connectivity: wifi vs cellular (lte/5g/cellular -> "cellular", wifi-only -> "wifi")
-        # Check both text_norm and text_orig (normalize_text strips "lte")
-        _conn_text = f'{text_norm} {text_orig}'
-        if re.search(r'\b(?:cellular|lte|5g|4g)\b', _conn_text):
+        # Check both text_norm and the raw text (normalize_text strips "lte")
+        _conn_text = f'{text_norm} {text.lower()}'
+        if _TABLET_CELLULAR_RE.search(_conn_text):
             tablet_attrs['connectivity'] = 'cellular'
-        elif re.search(r'\bwifi\b', _conn_text):
+        elif _TABLET_WIFI_RE.search(_conn_text):
             tablet_attrs['connectivity'] = 'wifi'
 
         # Apple M-series chip: m1, m2, m4, m5
-        chip_m = re.search(r'\bm([1-9])\b', text_norm)
+        chip_m = _TABLET_CHIP_RE.search(text_norm)
         if chip_m:
             tablet_attrs['chip'] = f'm{chip_m.group(1)}'
 
         # Hardware model code (e.g., A2588, SM-X700)
-        hw_m = re.search(r'\b([a-z]{1,3}\d{3,5}[a-z]{0,2})\b', text_norm)
+        hw_m = _TABLET_HW_CODE_RE.search(text_norm)
         if hw_m:
             code = hw_m.group(1)
             # Exclude storage-like tokens (128gb, 256gb) and generation tokens (gen5)
-            if not re.match(r'^\d+[gt]b?$', code) and not code.startswith('gen'):
+            if not _STORAGE_TOKEN_RE.match(code) and not code.startswith('gen'):
                 tablet_attrs['model_number'] = code
 
         # iPad: "ipad pro 12.9 2022 256gb" or NL: "apple ipad pro ipad pro gen1 2015 12 9 wifi 256gb"
         if 'ipad' in text_norm:
             tablet_attrs['product_line'] = 'ipad'
             # Determine tablet_family: "ipad pro", "ipad air", "ipad mini", or "ipad"
-            variant_m = re.search(r'ipad\s+(?:ipad\s+)?(pro|air|mini)', text_norm)
+            variant_m = _IPAD_VARIANT_RE.search(text_norm)
             if variant_m:
                 tablet_attrs['tablet_family'] = f"ipad {variant_m.group(1)}"
             else:
                 tablet_attrs['tablet_family'] = 'ipad'
             # Extract variant and optional generation (gen1, gen5, etc.)
-            ipad_m = re.search(r'ipad\s+(?:ipad\s+)?(?:pro|air|mini)\s+(?:ipad\s+(?:pro|air|mini)\s+)?(gen\d+)', text_norm)
+            ipad_m = _IPAD_VARIANT_GEN_RE.search(text_norm)
             if ipad_m:
                 variant = variant_m.group(1) if variant_m else ''
                 gen = ipad_m.group(1)
@@ -1494,18 +1893,19 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
                 if variant_m:
                     tablet_attrs['model'] = variant_m.group(1)
                 else:
-                    gen_m = re.search(r'ipad\s+(?:ipad\s+)?(gen\d+)', text_norm)
+                    gen_m = _IPAD_GEN_RE.search(text_norm)
                     if gen_m:
                         tablet_attrs['model'] = gen_m.group(1)
             # Screen size: NL uses space-separated "12 9" for 12.9", "9 7" for 9.7"
             if not tablet_attrs['screen_size']:
-                screen_m2 = re.search(r'\b(\d{1,2})\s+(\d)\b', text_norm)
+                screen_m2 = _IPAD_SPACED_SCREEN_RE.search(text_norm)
                 if screen_m2:
                     size = f"{screen_m2.group(1)}.{screen_m2.group(2)}"
                     if 7.0 <= float(size) <= 13.0:
                         tablet_attrs['screen_size'] = size
-                else:
-                    screen_m3 = re.search(r'\b(\d{1,2}\.\d)\b', text_norm)
+                elif '.' in text_norm:
+                    # normalize_text turns most dots into spaces; only scan when one survived
+                    screen_m3 = _IPAD_DECIMAL_SCREEN_RE.search(text_norm)
                     if screen_m3 and 7.0 <= float(screen_m3.group(1)) <= 13.0:
                         tablet_attrs['screen_size'] = screen_m3.group(1)
             return tablet_attrs
@@ -1513,11 +1913,11 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         # Samsung Galaxy Tab: "galaxy tab s8 ultra 256gb"
         if 'tab' in text_norm:
             tablet_attrs['product_line'] = 'tab'
-            tab_m = re.search(r'tab\s+([a-z]\d+[a-z]*(?:\s+(?:plus|ultra|lite|fe))*)', text_norm)
+            tab_m = _GALAXY_TAB_MODEL_RE.search(text_norm)
             if tab_m:
                 tablet_attrs['model'] = tab_m.group(1).strip()
             # tablet_family: "tab s8", "tab a8" (series letter + number)
-            tab_fam = re.search(r'tab\s+([a-z]\d+)', text_norm)
+            tab_fam = _GALAXY_TAB_FAMILY_RE.search(text_norm)
             if tab_fam:
                 tablet_attrs['tablet_family'] = f"tab {tab_fam.group(1)}"
             else:
@@ -1527,7 +1927,7 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         # Huawei MatePad / MediaPad
         if 'mediapad' in text_norm:
             tablet_attrs['product_line'] = 'mediapad'
-            mp_m = re.search(r'mediapad\s+((?:t\d+|m\d+|lite)\s*(?:lite)?)', text_norm)
+            mp_m = _MEDIAPAD_MODEL_RE.search(text_norm)
             if mp_m:
                 tablet_attrs['model'] = mp_m.group(1).strip()
             tablet_attrs['tablet_family'] = 'mediapad'
@@ -1537,7 +1937,7 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
 
         if 'matepad' in text_norm:
             tablet_attrs['product_line'] = 'matepad'
-            mp_m = re.search(r'matepad\s+(pro|air|t\d+|se)?', text_norm)
+            mp_m = _MATEPAD_MODEL_RE.search(text_norm)
             if mp_m and mp_m.group(1):
                 tablet_attrs['model'] = mp_m.group(1).strip()
             # tablet_family: "matepad pro", "matepad se", "matepad"
@@ -1549,19 +1949,6 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         # Generic tablet — fall through to phone path below
         # (will be handled by generic extraction)
 
-    def _finalize_mobile_attrs(a):
-        """Enrich mobile attrs with variant and generation from model string."""
-        _m = a.get('model', '')
-        if _m and not a.get('variant'):
-            _vt = VARIANT_TOKENS & set(_m.lower().split())
-            if _vt:
-                a['variant'] = ' '.join(sorted(_vt))
-        if _m and not a.get('generation'):
-            _gm = re.search(r'(\d+)', _m)
-            if _gm:
-                a['generation'] = _gm.group(1)
-        return a
-
     attrs = {
         'brand': brand_norm,
         'product_line': '',
@@ -1573,32 +1960,41 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
         'screen_size': '',    # Screen size if present
     }
 
-    # Extract hardware model number from ORIGINAL text (before Samsung strips it)
-    _hw_code = MODEL_CODE_PATTERN.search(text_norm)
-    if _hw_code:
-        attrs['model_number'] = _hw_code.group(0).lower()
-
-    # Extract screen size if present (for phablets, large phones)
-    _screen_m = re.search(r'\b(\d{1,2}(?:\.\d{1,2})?)\s*(?:inch|in|"|\'\')', text_norm)
-    if _screen_m:
-        attrs['screen_size'] = _screen_m.group(1)
-
-    # Extract year for phones
-    year_m = re.search(r'\b(20[12]\d)\b', text_norm)
-    if year_m:
-        attrs['year'] = year_m.group(1)
+    # Model code, screen size and year all need a digit, and the screen and
+    # year patterns a literal unit / "20" - test those first, each is one
+    # C-level scan that usually lets the regex be skipped.
+    if _ANY_DIGIT_RE.search(text_norm):
+        # Extract hardware model number from ORIGINAL text (before Samsung strips it)
+        _hw_code = MODEL_CODE_PATTERN.search(text_norm)
+        if _hw_code:
+            attrs['model_number'] = _hw_code.group(0).lower()
+
+        # Extract screen size if present (for phablets, large phones)
+        if 'in' in text_norm or '"' in text_norm or "''" in text_norm:
+            _screen_m = _ATTR_SCREEN_RE.search(text_norm)
+            if _screen_m:
+                attrs['screen_size'] = _screen_m.group(1)
+
+        # Extract year for phones
+        if '20' in text_norm:
+            year_m = _ATTR_YEAR_RE.search(text_norm)
+            if year_m:
+                attrs['year'] = year_m.group(1)
 
     # === HAND-TUNED PATTERNS (mobile phones - major brands) ===
 
     # Samsung: Remove model codes (G960F, N9005, SM-G960F, etc.)
     if 'samsung' in brand_norm or 'samsung' in text_norm:
-        text_clean = re.sub(r'\b(?:sm-)?[a-z]\d{3,5}[a-z]?\b', '', text_norm, flags=re.IGNORECASE)
-        text_norm = re.sub(r'\s+', ' ', text_clean).strip()
+        # text_norm is already whitespace-collapsed, so only re-collapse
+        # when a code was actually cut out.
+        text_clean, n_codes = _SAMSUNG_MODEL_CODE_RE.subn('', text_norm)
+        if n_codes:
+            text_norm = _NORM_WHITESPACE_RE.sub(' ', text_clean).strip()
 
     # Apple iPhone: "iphone 14 pro 256gb" -> line=iphone, model=14 pro
     # CRITICAL: Capture ALL variant words (pro max, pro, plus, mini, etc.)
     if 'iphone' in text_norm:
-        match = re.search(r'iphone\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|mini|ultra|lite))*)', text_norm)
+        match = _IPHONE_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'iphone'
             attrs['model'] = match.group(1).strip()
@@ -1609,13 +2005,13 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # Also handle "galaxy z fold5", "galaxy z flip5" where model is "z fold5" / "z flip5"
     if 'galaxy' in text_norm:
         # Try Z Fold/Flip pattern first (e.g., "galaxy z fold5 256gb", "galaxy z flip 5")
-        z_match = re.search(r'galaxy\s+(z\s+(?:fold|flip)\s*\d*(?:\s+(?:pro|plus|max|ultra|lite|5g))*)', text_norm)
+        z_match = _GALAXY_Z_MODEL_RE.search(text_norm)
         if z_match:
             attrs['product_line'] = 'galaxy'
-            attrs['model'] = re.sub(r'\s+', ' ', z_match.group(1)).strip()
+            attrs['model'] = _NORM_WHITESPACE_RE.sub(' ', z_match.group(1)).strip()
             return _finalize_mobile_attrs(attrs)
         # Standard pattern (e.g., "galaxy s23 ultra", "galaxy a54")
-        match = re.search(r'galaxy\s+([a-z]+\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite|fe|note|fold|flip|edge|active))*)', text_norm)
+        match = _GALAXY_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'galaxy'
             attrs['model'] = match.group(1).strip()
@@ -1624,7 +2020,7 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # Google Pixel: "pixel 9 pro 256gb", "pixel 9 pro fold" -> line=pixel, model=9 pro / 9 pro fold
     # CRITICAL: Capture ALL variant words including fold (pro xl, pro fold, fold, pro, a, etc.)
     if 'pixel' in text_norm:
-        match = re.search(r'pixel\s+(\d+[a-z]*(?:\s+(?:pro\s+fold|pro\s+xl|fold|pro|xl|max|ultra|lite|a))*)', text_norm)
+        match = _PIXEL_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'pixel'
             attrs['model'] = match.group(1).strip()
@@ -1633,7 +2029,7 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # Xiaomi Redmi/Mi/Xiaomi-numbered: "redmi note 12 pro 128gb" -> line=redmi, model=note 12 pro
     # CRITICAL: Capture ALL variant words (pro max, pro, plus, etc.)
     if 'redmi' in text_norm:
-        match = re.search(r'redmi\s+(note\s+\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*|\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)', text_norm, re.IGNORECASE)
+        match = _REDMI_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'redmi'
             attrs['model'] = match.group(1).strip()
@@ -1641,14 +2037,14 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     elif 'xiaomi' in brand_norm or 'xiaomi' in text_norm:
         # Xiaomi Mi series: "xiaomi mi 11 ultra" -> line=mi, model=11 ultra
         # Use word-boundary \bmi\b to avoid matching substring of "xiaomi"
-        if re.search(r'\bmi\b', text_norm):
-            match = re.search(r'\bmi\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)', text_norm)
+        if _MI_WORD_RE.search(text_norm):
+            match = _MI_MODEL_RE.search(text_norm)
             if match:
                 attrs['product_line'] = 'mi'
                 attrs['model'] = match.group(1).strip()
                 return _finalize_mobile_attrs(attrs)
         # Xiaomi numbered series: "xiaomi 15 ultra" -> line=xiaomi, model=15 ultra
-        match = re.search(r'xiaomi\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite|t))*)', text_norm)
+        match = _XIAOMI_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'xiaomi'
             attrs['model'] = match.group(1).strip()
@@ -1656,15 +2052,16 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
 
     # Huawei Mate/P-series: "mate 30 pro 256gb" -> line=mate, model=30 pro
     # CRITICAL: Capture ALL variant words
-    if 'mate' in text_norm and ('huawei' in brand_norm or 'huawei' in text_norm):
-        match = re.search(r'mate\s+(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)', text_norm)
+    is_huawei = 'huawei' in brand_norm or 'huawei' in text_norm
+    if 'mate' in text_norm and is_huawei:
+        match = _MATE_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'mate'
             attrs['model'] = match.group(1).strip()
             return _finalize_mobile_attrs(attrs)
-    elif ('huawei' in brand_norm or 'huawei' in text_norm) and re.search(r'\bp\d+', text_norm):
+    elif is_huawei and _HUAWEI_P_WORD_RE.search(text_norm):
         # "huawei p30 pro" -> line=p, model=30 pro
-        match = re.search(r'p(\d+[a-z]*(?:\s+(?:pro|plus|max|ultra|lite))*)', text_norm)
+        match = _HUAWEI_P_MODEL_RE.search(text_norm)
         if match:
             attrs['product_line'] = 'p'
             attrs['model'] = match.group(1).strip()
@@ -1673,8 +2070,8 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # OPPO Reno: "reno 4 128gb", "reno 3 pro 256gb"
     # NL catalog format: "oppo reno 3 series reno 3 pro 256gb" — strip redundant series label
     if 'reno' in text_norm:
-        _reno_text = re.sub(r'reno\s+\d+\s+series\s+', '', text_norm)
-        match = re.search(r'reno\s+(\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|neo|z|f))*)', _reno_text)
+        _reno_text = _RENO_SERIES_RE.sub('', text_norm)
+        match = _RENO_MODEL_RE.search(_reno_text)
         if match:
             attrs['product_line'] = 'reno'
             attrs['model'] = match.group(1).strip()
@@ -1683,8 +2080,8 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # OPPO Find: "find x5 pro 256gb"
     # NL catalog format: "oppo find x5 series find x5 pro 256gb"
     if 'find' in text_norm and ('oppo' in text_norm or 'oppo' in brand_norm):
-        _find_text = re.sub(r'find\s+[a-z]?\d+\s+series\s+', '', text_norm)
-        match = re.search(r'find\s+([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|neo))*)', _find_text)
+        _find_text = _FIND_SERIES_RE.sub('', text_norm)
+        match = _FIND_MODEL_RE.search(_find_text)
         if match:
             attrs['product_line'] = 'find'
             attrs['model'] = match.group(1).strip()
@@ -1694,27 +2091,31 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     # Detect common product line patterns: "moto g50", etc.
     # CRITICAL: Capture ALL variant words (pro max, plus, etc.)
 
+    # Both generic patterns need a digit. Without one, skip them: a failing
+    # Pattern 1 backtracks through every word, a single \d scan does not.
+    if not _ANY_DIGIT_RE.search(text_norm):
+        return _finalize_mobile_attrs(attrs)
+
     # Pattern 1: "ProductLine ModelNumber" (e.g., "moto g50")
-    match = re.search(r'\b([a-z]+)\s+([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|mini|note|xl|edge|active))*)', text_norm, re.IGNORECASE)
+    match = _GENERIC_LINE_MODEL_RE.search(text_norm)
     if match:
         line_candidate = match.group(1)
         model_candidate = match.group(2)
 
         # Filter out noise words (the, and, with, etc.)
-        noise_words = {'the', 'and', 'or', 'with', 'dual', 'sim', 'unlocked', 'new', 'used', 'refurbished'}
-        if line_candidate not in noise_words:
+        if line_candidate not in _GENERIC_LINE_NOISE_WORDS:
             attrs['product_line'] = line_candidate
             attrs['model'] = model_candidate.strip()
             return _finalize_mobile_attrs(attrs)
 
     # Pattern 2: Just model number (e.g., "a52 5g 128gb")
-    match = re.search(r'\b([a-z]?\d+[a-z]*(?:\s+(?:pro|plus|ultra|lite|max|mini|xl))*)', text_norm, re.IGNORECASE)
+    match = _GENERIC_MODEL_RE.search(text_norm)
     if match:
         model_candidate = match.group(1).strip()
         # Use first meaningful word as product line
         words = text_norm.split()
         for word in words:
-            if len(word) > 2 and word not in {'the', 'and', 'with', 'sim', 'new', 'used'}:
+            if len(word) > 2 and word not in _GENERIC_LINE_SKIP_WORDS:
                 attrs['product_line'] = word
                 attrs['model'] = model_candidate
                 break
@@ -1722,11 +2123,83 @@ def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
     return _finalize_mobile_attrs(attrs)
 
 
+def extract_product_attributes(text: str, brand: str = '') -> Dict[str, str]:
+    """
+    Cached front for _extract_product_attributes().
+
+    The returned dict is shared between callers - do not mutate it. Tablet
+    variant_tokens are frozen so a stray .add() fails instead of corrupting
+    the cached entry.
+    """
+    key = (text, brand)
+    cached = _ATTRS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    attrs = _extract_product_attributes(text, brand)
+    variant_tokens = attrs.get('variant_tokens')
+    if variant_tokens is not None:
+        attrs['variant_tokens'] = frozenset(variant_tokens)
+    # brand and product_line are the attribute index's first two levels; interned,
+    # a query's values are the same objects as the catalog's keys, so each index
+    # probe compares by identity instead of by content.
+    for field in ('brand', 'product_line'):
+        value = attrs.get(field)
+        if value:
+            attrs[field] = sys.intern(value)
+    return _cache_store(_ATTRS_CACHE, key, attrs)
+
+
+class IndexEntry(NamedTuple):
+    """
+    Leaf entry of the attribute and signature indexes.
+
+    The builders accumulate plain dicts and freeze each one into an IndexEntry
+    once its asset IDs are complete.
+    """
+    asset_ids: List[str]
+    nl_name: str
+    nl_category: str  # extract_category(nl_name), so matching never re-classifies it
+    is_fallback: bool = False  # watch entry indexed under a less-specific key
+
+
+def _attribute_storage_key(attrs: Dict[str, str], is_tablet: bool) -> str:
+    """
+    Leaf key of the attribute index for one product's attributes.
+
+    Shared by build_attribute_index() and try_attribute_match() so the
+    index and its lookups can never disagree:
+        Watches: mm + connectivity + material (42mm vs 46mm are different products!)
+        Laptops: RAM + storage
+        Tablets: screen_inches + generation + storage (prevents size/gen collisions)
+        Phones:  storage only
+    """
+    # Keys are built with one f-string and trimmed, not '_'.join() over a
+    # filtered list - that is about twice as slow for three short fields.
+    # The watch key keeps its '__' gap for a missing connectivity (index format).
+    storage = attrs['storage']
+    if attrs['product_line'] == 'watch':
+        watch_mm = attrs.get('watch_mm', '')
+        connectivity = attrs.get('connectivity', '')
+        return f"{watch_mm}_{connectivity}_{attrs.get('material', '')}".strip('_')
+    ram = attrs.get('ram', '')
+    if ram:
+        return f"{ram}_{storage}"
+    if is_tablet:
+        screen = attrs.get('screen_inches', '') or attrs.get('screen_size', '')
+        gen = attrs.get('generation', '')
+        # No field contains '_', so trimming the ends and closing a middle gap
+        # is the same as joining only the non-empty parts.
+        return f"{screen}_{'gen' + gen if gen else ''}_{storage}".strip('_').replace('__', '_')
+    return storage
+
+
 def build_attribute_index(df_nl_clean: pd.DataFrame) -> Dict:
     """
     Build an attribute-based index for fast exact matching.
 
-    Returns nested dict: brand -> product_line -> model -> ram_storage_key -> [asset_ids]
+    Returns nested dict: brand -> product_line -> model -> ram_storage_key -> IndexEntry
+    (asset_ids, nl_name, nl_category; nl_category precomputed so
+    try_attribute_match() does not re-classify the catalog name per query).
 
     For phones: brand -> product_line -> model -> storage
     For laptops: brand -> product_line -> model (CPU gen) -> "ram_storage" (combined key)
@@ -1736,107 +2209,139 @@ def build_attribute_index(df_nl_clean: pd.DataFrame) -> Dict:
     """
     index = {}
 
-    for _, row in df_nl_clean.iterrows():
-        brand = normalize_brand(str(row.get('brand', '')).strip())
-        if not brand:
-            brand = normalize_text(str(row.get('brand', '')).strip())
+    # Zip over plain column lists: iterrows() builds a Series per row.
+    raw_brands = (df_nl_clean['brand'].tolist() if 'brand' in df_nl_clean.columns
+                  else [''] * len(df_nl_clean))
+    # Tablet is the first category _extract_category() tests, so one column-wise
+    # regex pass gives every row's "is tablet" flag without classifying it fully.
+    # object dtype keeps Python re semantics for the word boundaries.
+    tablet_flags = (df_nl_clean['normalized_name'].astype(object).str.lower()
+                    .str.contains(_TABLET_CATEGORY_RE, na=False).tolist())
+    # A catalog has a few dozen distinct brand spellings: resolve each to its
+    # index key once rather than str/strip/normalize on every row.
+    brand_keys: Dict[str, str] = {}
+    for raw_brand, nl_name, raw_asset_id, _is_tablet_entry in zip(
+        raw_brands,
+        df_nl_clean['normalized_name'].tolist(),
+        df_nl_clean['uae_assetid'].tolist(),
+        tablet_flags,
+    ):
+        brand = brand_keys.get(raw_brand)
+        if brand is None:
+            brand_str = str(raw_brand).strip()
+            brand = brand_keys[raw_brand] = sys.intern(normalize_brand(brand_str) or normalize_text(brand_str))
         if not brand:
             continue
 
-        attrs = extract_product_attributes(row['normalized_name'], brand)
+        attrs = extract_product_attributes(nl_name, brand)
 
         # Only index if we successfully extracted model
         if not attrs['model']:
             continue
 
-        # Build nested structure
-        if brand not in index:
-            index[brand] = {}
-        if attrs['product_line'] not in index[brand]:
-            index[brand][attrs['product_line']] = {}
-        if attrs['model'] not in index[brand][attrs['product_line']]:
-            index[brand][attrs['product_line']][attrs['model']] = {}
-
-        # Build storage key based on category
-        # Watches: use mm + connectivity (CRITICAL: 42mm vs 46mm are different products!)
-        # Laptops: use RAM + storage
-        # Phones/Tablets: use storage only
-        ram = attrs.get('ram', '')
+        # Build nested structure: one probe per level
+        model_bucket = (index.setdefault(brand, {})
+                        .setdefault(attrs['product_line'], {})
+                        .setdefault(attrs['model'], {}))
+
+        # Build storage key based on category (see _attribute_storage_key)
         watch_mm = attrs.get('watch_mm', '')
         connectivity = attrs.get('connectivity', '')
-
         material = attrs.get('material', '')
 
-        # Detect tablet for tablet-specific key
-        _is_tablet_entry = extract_category(row['normalized_name']) == 'tablet'
-
-        if attrs['product_line'] == 'watch':
-            # Watch key: mm + connectivity + material (all critical for unique identification)
-            storage_key = f"{watch_mm}_{connectivity}_{material}".strip('_')
-        elif ram:
-            # Laptop key: RAM + storage
-            storage_key = f"{ram}_{attrs['storage']}"
-        elif _is_tablet_entry:
-            # Tablet key: screen_inches + generation + storage (prevents size/gen collisions)
-            _t_screen = attrs.get('screen_inches', '') or attrs.get('screen_size', '')
-            _t_gen = attrs.get('generation', '')
-            _t_parts = [p for p in [_t_screen, f'gen{_t_gen}' if _t_gen else '', attrs['storage']] if p]
-            storage_key = '_'.join(_t_parts) if _t_parts else attrs['storage']
-        else:
-            # Phone key: storage only
-            storage_key = attrs['storage']
+        storage_key = _attribute_storage_key(attrs, _is_tablet_entry)
 
-        if storage_key not in index[brand][attrs['product_line']][attrs['model']]:
-            index[brand][attrs['product_line']][attrs['model']][storage_key] = {
-                'asset_ids': [],
-                'nl_name': row['normalized_name']
+        entry = model_bucket.get(storage_key)
+        if entry is None:
+            entry = model_bucket[storage_key] = {
+                'asset_ids': {},
+                'nl_name': nl_name,
+                'nl_category': extract_category(nl_name),
             }
 
-        asset_id = str(row['uae_assetid']).strip()
-        entry = index[brand][attrs['product_line']][attrs['model']][storage_key]
-        if asset_id not in entry['asset_ids']:
-            entry['asset_ids'].append(asset_id)
+        asset_id = str(raw_asset_id).strip()
+        entry['asset_ids'][asset_id] = None
 
         # Watch fallback keys: index under less-specific keys for graceful degradation
         if attrs['product_line'] == 'watch' and watch_mm:
-            model_bucket = index[brand][attrs['product_line']][attrs['model']]
-
             # Fallback 1: mm + connectivity (no material)
             if connectivity and material:
                 mm_conn_key = f"{watch_mm}_{connectivity}"
                 if mm_conn_key != storage_key and mm_conn_key not in model_bucket:
                     model_bucket[mm_conn_key] = {
-                        'asset_ids': [],
-                        'nl_name': row['normalized_name'],
+                        'asset_ids': {},
+                        'nl_name': nl_name,
+                        'nl_category': extract_category(nl_name),
                         '_is_fallback': True,
                     }
                 if mm_conn_key != storage_key:
-                    fb_entry = model_bucket[mm_conn_key]
-                    if asset_id not in fb_entry['asset_ids']:
-                        fb_entry['asset_ids'].append(asset_id)
+                    model_bucket[mm_conn_key]['asset_ids'][asset_id] = None
 
             # Fallback 2: mm only (no connectivity, no material)
             mm_only_key = watch_mm
             if mm_only_key != storage_key:
                 if mm_only_key not in model_bucket:
                     model_bucket[mm_only_key] = {
-                        'asset_ids': [],
-                        'nl_name': row['normalized_name'],
+                        'asset_ids': {},
+                        'nl_name': nl_name,
+                        'nl_category': extract_category(nl_name),
                         '_is_fallback': True,
                     }
-                fb_entry = model_bucket[mm_only_key]
-                if asset_id not in fb_entry['asset_ids']:
-                    fb_entry['asset_ids'].append(asset_id)
+                model_bucket[mm_only_key]['asset_ids'][asset_id] = None
+
+    # asset_ids were built as insertion-ordered dicts (O(1) dedup); readers expect lists
+    for brand_data in index.values():
+        for line_data in brand_data.values():
+            for model_data in line_data.values():
+                for key, entry in model_data.items():
+                    model_data[key] = IndexEntry(list(entry['asset_ids']),
+                                                 entry['nl_name'], entry['nl_category'],
+                                                 entry.get('_is_fallback', False))
 
     return index
 
 
+def _match_result(
+    asset_id: str,
+    score: float,
+    status: str,
+    confidence: str,
+    matched_on: str,
+    method: str,
+    selection: Optional['VariantSelection'] = None,
+) -> dict:
+    """
+    Result dict returned by the attribute and signature fast paths.
+
+    selection is the auto_select_matching_variant() result the asset ID came
+    from, if any; without one the match carries no auto-selection details.
+    """
+    if selection is None:
+        auto_selected, reason, alternatives = False, '', []
+    else:
+        auto_selected = selection.auto_selected
+        reason = selection.reason
+        alternatives = selection.alternatives
+    return {
+        'mapped_uae_assetid': asset_id,
+        'match_score': score,
+        'match_status': status,
+        'confidence': confidence,
+        'matched_on': matched_on,
+        'method': method,
+        'auto_selected': auto_selected,
+        'selection_reason': reason,
+        'alternatives': alternatives,
+    }
+
+
 def try_attribute_match(
     query: str,
     brand: str,
     attribute_index: Dict,
     nl_catalog: Optional[pd.DataFrame] = None,
-    original_input: str = ''
+    original_input: str = '',
+    catalog_variants: Optional['CatalogVariants'] = None,
 ) -> Optional[dict]:
     """
     Attempt fast attribute-based matching before falling back to fuzzy.
@@ -1859,36 +2364,20 @@ def try_attribute_match(
         line_data = brand_data.get(attrs['product_line'], {})
         model_data = line_data.get(attrs['model'], {})
 
-        # Build storage key based on category (must match build_attribute_index logic)
-        # Watches: use mm + connectivity + material
-        # Laptops: use RAM + storage
-        # Tablets: use screen_inches + generation + storage
-        # Phones: use storage only
+        # Build storage key based on category (shared with build_attribute_index)
         ram = attrs.get('ram', '')
         watch_mm = attrs.get('watch_mm', '')
         connectivity = attrs.get('connectivity', '')
-        material = attrs.get('material', '')
-
-        if attrs['product_line'] == 'watch':
-            storage_key = f"{watch_mm}_{connectivity}_{material}".strip('_')
-        elif ram:
-            storage_key = f"{ram}_{attrs['storage']}"
-        elif query_category == 'tablet':
-            _t_screen = attrs.get('screen_inches', '') or attrs.get('screen_size', '')
-            _t_gen = attrs.get('generation', '')
-            _t_parts = [p for p in [_t_screen, f'gen{_t_gen}' if _t_gen else '', attrs['storage']] if p]
-            storage_key = '_'.join(_t_parts) if _t_parts else attrs['storage']
-        else:
-            storage_key = attrs['storage']
+        storage_key = _attribute_storage_key(attrs, query_category == 'tablet')
 
         # Try exact match with category-specific key
         if storage_key in model_data:
             entry = model_data[storage_key]
-            asset_ids = entry['asset_ids']
-            nl_name = entry['nl_name']
+            asset_ids = entry.asset_ids
+            nl_name = entry.nl_name
 
             # CATEGORY CHECK: Verify the matched product is in the same category
-            nl_category = extract_category(nl_name)
+            nl_category = entry.nl_category
             if query_category != 'other' and nl_category != query_category:
                 # Cross-category match detected - reject it
                 return None
@@ -1896,30 +2385,20 @@ def try_attribute_match(
             # Auto-select if multiple IDs and catalog provided
             if len(asset_ids) > 1 and nl_catalog is not None:
                 user_input_for_auto_select = original_input if original_input else query
-                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                return {
-                    'mapped_uae_assetid': selection['selected_id'],
-                    'match_score': 100.0,
-                    'match_status': MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_HIGH,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute_auto_selected',
-                    'auto_selected': selection['auto_selected'],
-                    'selection_reason': selection['reason'],
-                    'alternatives': selection['alternatives'],
-                }
+                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                return _match_result(
+                    selection.selected_id, 100.0,
+                    MATCH_STATUS_MATCHED,
+                    CONFIDENCE_HIGH,
+                    entry.nl_name, 'attribute_auto_selected', selection,
+                )
             else:
-                return {
-                    'mapped_uae_assetid': ', '.join(asset_ids),
-                    'match_score': 100.0,
-                    'match_status': MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_HIGH,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute',
-                    'auto_selected': False,
-                    'selection_reason': '',
-                    'alternatives': [],
-                }
+                return _match_result(
+                    ', '.join(asset_ids), 100.0,
+                    MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
+                    CONFIDENCE_HIGH,
+                    entry.nl_name, 'attribute',
+                )
 
         # Watch fallback tiers: try progressively less-specific keys
         if attrs['product_line'] == 'watch' and watch_mm:
@@ -1939,192 +2418,145 @@ def try_attribute_match(
             for fb_key in fallback_keys:
                 if fb_key in model_data and fb_key != storage_key:
                     entry = model_data[fb_key]
-                    asset_ids = entry['asset_ids']
-                    nl_name = entry['nl_name']
-                    nl_category = extract_category(nl_name)
+                    asset_ids = entry.asset_ids
+                    nl_name = entry.nl_name
+                    nl_category = entry.nl_category
                     if query_category == 'other' or nl_category == query_category:
                         if len(asset_ids) > 1 and nl_catalog is not None:
                             user_input_for_auto_select = original_input if original_input else query
-                            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                            return {
-                                'mapped_uae_assetid': selection['selected_id'],
-                                'match_score': 95.0,
-                                'match_status': MATCH_STATUS_MATCHED if selection['auto_selected'] else MATCH_STATUS_MULTIPLE,
-                                'confidence': CONFIDENCE_HIGH if selection['auto_selected'] else CONFIDENCE_MEDIUM,
-                                'matched_on': entry['nl_name'],
-                                'method': 'attribute_watch_fallback',
-                                'auto_selected': selection['auto_selected'],
-                                'selection_reason': selection['reason'],
-                                'alternatives': selection['alternatives'],
-                            }
+                            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                            return _match_result(
+                                selection.selected_id, 95.0,
+                                MATCH_STATUS_MATCHED if selection.auto_selected else MATCH_STATUS_MULTIPLE,
+                                CONFIDENCE_HIGH if selection.auto_selected else CONFIDENCE_MEDIUM,
+                                entry.nl_name, 'attribute_watch_fallback', selection,
+                            )
                         else:
-                            return {
-                                'mapped_uae_assetid': ', '.join(asset_ids),
-                                'match_score': 95.0,
-                                'match_status': MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
-                                'confidence': CONFIDENCE_HIGH if len(asset_ids) == 1 else CONFIDENCE_MEDIUM,
-                                'matched_on': entry['nl_name'],
-                                'method': 'attribute_watch_fallback',
-                                'auto_selected': False,
-                                'selection_reason': '',
-                                'alternatives': [],
-                            }
+                            return _match_result(
+                                ', '.join(asset_ids), 95.0,
+                                MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
+                                CONFIDENCE_HIGH if len(asset_ids) == 1 else CONFIDENCE_MEDIUM,
+                                entry.nl_name, 'attribute_watch_fallback',
+                            )
 
         # Fallback: try without RAM if laptop match failed (maybe RAM not in query)
         # Skip this fallback for watches (watches don't have RAM/storage variants)
         if ram and attrs['storage'] in model_data and attrs['product_line'] != 'watch':
             entry = model_data[attrs['storage']]
-            asset_ids = entry['asset_ids']
-            nl_name = entry['nl_name']
+            asset_ids = entry.asset_ids
+            nl_name = entry.nl_name
 
             # CATEGORY CHECK: Verify the matched product is in the same category
-            nl_category = extract_category(nl_name)
+            nl_category = entry.nl_category
             if query_category != 'other' and nl_category != query_category:
                 # Cross-category match detected - reject it
                 return None
 
             if len(asset_ids) > 1 and nl_catalog is not None:
                 user_input_for_auto_select = original_input if original_input else query
-                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                return {
-                    'mapped_uae_assetid': selection['selected_id'],
-                    'match_score': 95.0,
-                    'match_status': MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_HIGH,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute_auto_selected',
-                    'auto_selected': selection['auto_selected'],
-                    'selection_reason': selection['reason'],
-                    'alternatives': selection['alternatives'],
-                }
+                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                return _match_result(
+                    selection.selected_id, 95.0,
+                    MATCH_STATUS_MATCHED,
+                    CONFIDENCE_HIGH,
+                    entry.nl_name, 'attribute_auto_selected', selection,
+                )
             else:
-                return {
-                    'mapped_uae_assetid': ', '.join(asset_ids),
-                    'match_score': 95.0,
-                    'match_status': MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_HIGH,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute',
-                    'auto_selected': False,
-                    'selection_reason': '',
-                    'alternatives': [],
-                }
+                return _match_result(
+                    ', '.join(asset_ids), 95.0,
+                    MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
+                    CONFIDENCE_HIGH,
+                    entry.nl_name, 'attribute',
+                )
 
         # Try without storage if no exact match (for products without storage in name)
         if '' in model_data:  # Empty storage key
             entry = model_data['']
-            asset_ids = entry['asset_ids']
-            nl_name = entry['nl_name']
+            asset_ids = entry.asset_ids
+            nl_name = entry.nl_name
 
             # CATEGORY CHECK: Verify the matched product is in the same category
-            nl_category = extract_category(nl_name)
+            nl_category = entry.nl_category
             if query_category != 'other' and nl_category != query_category:
                 # Cross-category match detected - reject it
                 return None
 
             if len(asset_ids) > 1 and nl_catalog is not None:
                 user_input_for_auto_select = original_input if original_input else query
-                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                return {
-                    'mapped_uae_assetid': selection['selected_id'],
-                    'match_score': 90.0,
-                    'match_status': MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_MEDIUM,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute_auto_selected',
-                    'auto_selected': selection['auto_selected'],
-                    'selection_reason': selection['reason'],
-                    'alternatives': selection['alternatives'],
-                }
+                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                return _match_result(
+                    selection.selected_id, 90.0,
+                    MATCH_STATUS_MATCHED,
+                    CONFIDENCE_MEDIUM,
+                    entry.nl_name, 'attribute_auto_selected', selection,
+                )
             else:
-                return {
-                    'mapped_uae_assetid': ', '.join(asset_ids),
-                    'match_score': 90.0,
-                    'match_status': MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
-                    'confidence': CONFIDENCE_MEDIUM,
-                    'matched_on': entry['nl_name'],
-                    'method': 'attribute',
-                    'auto_selected': False,
-                    'selection_reason': '',
-                    'alternatives': [],
-                }
+                return _match_result(
+                    ', '.join(asset_ids), 90.0,
+                    MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
+                    CONFIDENCE_MEDIUM,
+                    entry.nl_name, 'attribute',
+                )
 
         # --- TIER 2: Query has no storage -> model has exactly 1 storage variant ---
         # Safe: If there's only one option, the product identity is unambiguous
         query_storage = attrs.get('storage', '')
         if not query_storage and model_data and attrs['product_line'] != 'watch':
-            storage_keys = [k for k in model_data.keys() if k]  # non-empty keys
-            if len(storage_keys) == 1:
+            # Count non-empty keys without materializing them: at most one key is ''
+            n_storage_keys = len(model_data) - ('' in model_data)
+            if n_storage_keys == 1:
                 # Only one storage variant — safe to match
-                entry = model_data[storage_keys[0]]
-                asset_ids = entry['asset_ids']
-                nl_name = entry['nl_name']
-                nl_category = extract_category(nl_name)
+                entry = next(e for k, e in model_data.items() if k)
+                asset_ids = entry.asset_ids
+                nl_name = entry.nl_name
+                nl_category = entry.nl_category
                 if query_category == 'other' or nl_category == query_category:
                     if len(asset_ids) > 1 and nl_catalog is not None:
                         user_input_for_auto_select = original_input if original_input else query
-                        selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                        return {
-                            'mapped_uae_assetid': selection['selected_id'],
-                            'match_score': 95.0,
-                            'match_status': MATCH_STATUS_MATCHED,
-                            'confidence': CONFIDENCE_HIGH,
-                            'matched_on': entry['nl_name'],
-                            'method': 'attribute_tier2_single_variant',
-                            'auto_selected': selection['auto_selected'],
-                            'selection_reason': selection['reason'],
-                            'alternatives': selection['alternatives'],
-                        }
+                        selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                        return _match_result(
+                            selection.selected_id, 95.0,
+                            MATCH_STATUS_MATCHED,
+                            CONFIDENCE_HIGH,
+                            entry.nl_name, 'attribute_tier2_single_variant', selection,
+                        )
                     elif len(asset_ids) == 1:
-                        return {
-                            'mapped_uae_assetid': asset_ids[0],
-                            'match_score': 95.0,
-                            'match_status': MATCH_STATUS_MATCHED,
-                            'confidence': CONFIDENCE_HIGH,
-                            'matched_on': entry['nl_name'],
-                            'method': 'attribute_tier2_single_variant',
-                            'auto_selected': False,
-                            'selection_reason': '',
-                            'alternatives': [],
-                        }
-            elif len(storage_keys) > 1:
+                        return _match_result(
+                            asset_ids[0], 95.0,
+                            MATCH_STATUS_MATCHED,
+                            CONFIDENCE_HIGH,
+                            entry.nl_name, 'attribute_tier2_single_variant',
+                        )
+            elif n_storage_keys > 1:
                 # Multiple storage variants — return MULTIPLE_MATCHES with auto-select
                 all_ids = []
                 first_nl_name = ''
-                for sk in storage_keys:
-                    e = model_data[sk]
+                nl_category = 'other'  # extract_category('')
+                for sk, e in model_data.items():
+                    if not sk:
+                        continue
                     if not first_nl_name:
-                        first_nl_name = e['nl_name']
-                    all_ids.extend(e['asset_ids'])
-                nl_category = extract_category(first_nl_name)
+                        first_nl_name = e.nl_name
+                        nl_category = e.nl_category
+                    all_ids.extend(e.asset_ids)
                 if query_category == 'other' or nl_category == query_category:
                     all_ids = list(dict.fromkeys(all_ids))  # deduplicate preserving order
                     if len(all_ids) > 1 and nl_catalog is not None:
                         user_input_for_auto_select = original_input if original_input else query
-                        selection = auto_select_matching_variant(user_input_for_auto_select, all_ids, nl_catalog)
-                        return {
-                            'mapped_uae_assetid': selection['selected_id'],
-                            'match_score': 90.0,
-                            'match_status': MATCH_STATUS_MATCHED if selection['auto_selected'] else MATCH_STATUS_MULTIPLE,
-                            'confidence': CONFIDENCE_HIGH if selection['auto_selected'] else CONFIDENCE_MEDIUM,
-                            'matched_on': first_nl_name,
-                            'method': 'attribute_tier2_multi_variant',
-                            'auto_selected': selection['auto_selected'],
-                            'selection_reason': selection['reason'],
-                            'alternatives': selection['alternatives'],
-                        }
+                        selection = auto_select_matching_variant(user_input_for_auto_select, all_ids, nl_catalog, catalog_variants)
+                        return _match_result(
+                            selection.selected_id, 90.0,
+                            MATCH_STATUS_MATCHED if selection.auto_selected else MATCH_STATUS_MULTIPLE,
+                            CONFIDENCE_HIGH if selection.auto_selected else CONFIDENCE_MEDIUM,
+                            first_nl_name, 'attribute_tier2_multi_variant', selection,
+                        )
                     elif len(all_ids) == 1:
-                        return {
-                            'mapped_uae_assetid': all_ids[0],
-                            'match_score': 90.0,
-                            'match_status': MATCH_STATUS_MATCHED,
-                            'confidence': CONFIDENCE_MEDIUM,
-                            'matched_on': first_nl_name,
-                            'method': 'attribute_tier2_multi_variant',
-                            'auto_selected': False,
-                            'selection_reason': '',
-                            'alternatives': [],
-                        }
+                        return _match_result(
+                            all_ids[0], 90.0,
+                            MATCH_STATUS_MATCHED,
+                            CONFIDENCE_MEDIUM,
+                            first_nl_name, 'attribute_tier2_multi_variant',
+                        )
 
         # --- TIER 3: Query has storage but no exact key -> fuzzy match storage keys ---
         # SAFETY: For composite keys (ram_storage), RAM must match exactly.
@@ -2132,51 +2564,46 @@ def try_attribute_match(
         if query_storage and model_data and attrs['product_line'] != 'watch':
             available_keys = [k for k in model_data.keys() if k]
             if available_keys:
-                from rapidfuzz import fuzz as _fuzz
-                best_key = None
-                best_score = 0
-                for k in available_keys:
-                    # If query has RAM (composite key), candidate must have same RAM
-                    if ram:
-                        k_parts = k.split('_', 1)
-                        if len(k_parts) == 2 and k_parts[0] != ram:
-                            continue  # RAM mismatch — skip this key entirely
-                    score = _fuzz.ratio(storage_key, k)
-                    if score > best_score:
-                        best_score = score
-                        best_key = k
-                if best_key and best_score >= 80:
+                # If query has RAM (composite key), candidate must have same RAM
+                # (extract_ram() values carry no '_', so a prefix test is exact)
+                if ram:
+                    ram_prefix = ram + '_'
+                    available_keys = [
+                        k for k in available_keys
+                        if '_' not in k or k.startswith(ram_prefix)
+                    ]
+                # One rapidfuzz call scores the whole shortlist; score_cutoff lets it
+                # reject on the length bound before the DP, and ties keep the first
+                # key as the old per-key loop did. process.cdist was measured slower
+                # here: shortlists stay under ~30 keys and it allocates a score matrix.
+                # Index keys and storage_key are built from normalized attributes,
+                # so no processor runs on either side.
+                best = process.extractOne(storage_key, available_keys,
+                                          scorer=fuzz.ratio, processor=None,
+                                          score_cutoff=80)
+                if best:
+                    best_key = best[0]
                     entry = model_data[best_key]
-                    asset_ids = entry['asset_ids']
-                    nl_name = entry['nl_name']
-                    nl_category = extract_category(nl_name)
+                    asset_ids = entry.asset_ids
+                    nl_name = entry.nl_name
+                    nl_category = entry.nl_category
                     if query_category == 'other' or nl_category == query_category:
                         if len(asset_ids) > 1 and nl_catalog is not None:
                             user_input_for_auto_select = original_input if original_input else query
-                            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
-                            return {
-                                'mapped_uae_assetid': selection['selected_id'],
-                                'match_score': 90.0,
-                                'match_status': MATCH_STATUS_MATCHED,
-                                'confidence': CONFIDENCE_MEDIUM,
-                                'matched_on': entry['nl_name'],
-                                'method': 'attribute_tier3_fuzzy_storage',
-                                'auto_selected': selection['auto_selected'],
-                                'selection_reason': selection['reason'],
-                                'alternatives': selection['alternatives'],
-                            }
+                            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
+                            return _match_result(
+                                selection.selected_id, 90.0,
+                                MATCH_STATUS_MATCHED,
+                                CONFIDENCE_MEDIUM,
+                                entry.nl_name, 'attribute_tier3_fuzzy_storage', selection,
+                            )
                         else:
-                            return {
-                                'mapped_uae_assetid': ', '.join(asset_ids),
-                                'match_score': 90.0,
-                                'match_status': MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
-                                'confidence': CONFIDENCE_MEDIUM,
-                                'matched_on': entry['nl_name'],
-                                'method': 'attribute_tier3_fuzzy_storage',
-                                'auto_selected': False,
-                                'selection_reason': '',
-                                'alternatives': [],
-                            }
+                            return _match_result(
+                                ', '.join(asset_ids), 90.0,
+                                MATCH_STATUS_MULTIPLE if len(asset_ids) > 1 else MATCH_STATUS_MATCHED,
+                                CONFIDENCE_MEDIUM,
+                                entry.nl_name, 'attribute_tier3_fuzzy_storage',
+                            )
 
     except (KeyError, AttributeError):
         pass
@@ -2188,6 +2615,9 @@ def try_attribute_match(
 # Variant Signature Matching
 # ---------------------------------------------------------------------------
 
+_UNDERSCORE_RUN_RE = re.compile(r'_+')
+
+
 def build_variant_signature(attrs: Dict[str, str]) -> str:
     """
     Build a deterministic variant signature from extracted product attributes.
@@ -2292,9 +2722,21 @@ def build_variant_signature(attrs: Dict[str, str]) -> str:
         return ''
 
     sig = '_'.join(parts).lower().replace(' ', '_')
-    # Collapse multiple underscores
-    sig = re.sub(r'_+', '_', sig).strip('_')
-    return sig
+    # Collapse multiple underscores (only a multi-word part with doubled spaces
+    # or an edge underscore produces them, so skip the regex otherwise)
+    if '__' in sig:
+        sig = _UNDERSCORE_RUN_RE.sub('_', sig)
+    return sig.strip('_')
+
+
+def variant_signature(text: str, brand: str = '') -> str:
+    """Cached build_variant_signature(extract_product_attributes(text, brand))."""
+    key = (text, brand)
+    cached = _SIGNATURE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _cache_store(_SIGNATURE_CACHE, key,
+                        build_variant_signature(extract_product_attributes(text, brand)))
 
 
 def build_signature_index(df_nl_clean: pd.DataFrame) -> Dict[str, Dict]:
@@ -2304,35 +2746,47 @@ def build_signature_index(df_nl_clean: pd.DataFrame) -> Dict[str, Dict]:
     For each row, extracts product attributes, builds a signature, and indexes it.
 
     Returns:
-        dict mapping signature -> {
-            'asset_ids': [list of asset IDs],
-            'nl_name': normalized name of first entry
-        }
+        dict mapping signature -> IndexEntry(
+            asset_ids:   [list of asset IDs],
+            nl_name:     normalized name of first entry,
+            nl_category: extract_category(nl_name), precomputed for
+                         try_signature_match()'s category check
+        )
     """
     sig_index: Dict[str, Dict] = {}
 
-    for _, row in df_nl_clean.iterrows():
-        nl_name = str(row.get('normalized_name', ''))
-        brand = str(row.get('brand', ''))
-        asset_id = str(row.get('uae_assetid', ''))
+    # Zip over plain column lists: iterrows() builds a Series per row.
+    raw_brands = (df_nl_clean['brand'].tolist() if 'brand' in df_nl_clean.columns
+                  else [''] * len(df_nl_clean))
+    for raw_name, raw_brand, raw_asset_id in zip(
+        df_nl_clean['normalized_name'].tolist(),
+        raw_brands,
+        df_nl_clean['uae_assetid'].tolist(),
+    ):
+        nl_name = str(raw_name)
+        brand = str(raw_brand)
+        asset_id = str(raw_asset_id)
 
         if not nl_name or not asset_id:
             continue
 
-        attrs = extract_product_attributes(nl_name, brand)
-        sig = build_variant_signature(attrs)
+        sig = variant_signature(nl_name, brand)
 
         if not sig:
             continue
 
-        if sig in sig_index:
-            if asset_id not in sig_index[sig]['asset_ids']:
-                sig_index[sig]['asset_ids'].append(asset_id)
-        else:
-            sig_index[sig] = {
-                'asset_ids': [asset_id],
+        entry = sig_index.get(sig)
+        if entry is None:
+            entry = sig_index[sig] = {
+                'asset_ids': {},
                 'nl_name': nl_name,
+                'nl_category': extract_category(nl_name),
             }
+        entry['asset_ids'][asset_id] = None
+
+    # asset_ids were built as insertion-ordered dicts (O(1) dedup); readers expect lists
+    for sig, entry in sig_index.items():
+        sig_index[sig] = IndexEntry(list(entry['asset_ids']), entry['nl_name'], entry['nl_category'])
 
     return sig_index
 
@@ -2343,6 +2797,7 @@ def try_signature_match(
     signature_index: Dict[str, Dict],
     nl_catalog: Optional[pd.DataFrame] = None,
     original_input: str = '',
+    catalog_variants: Optional['CatalogVariants'] = None,
 ) -> Optional[dict]:
     """
     Attempt deterministic variant signature matching.
@@ -2353,60 +2808,44 @@ def try_signature_match(
 
     Returns match result dict if found, None otherwise.
     """
-    attrs = extract_product_attributes(query, brand)
-    sig = build_variant_signature(attrs)
+    sig = variant_signature(query, brand)
 
     if not sig or sig not in signature_index:
         return None
 
     entry = signature_index[sig]
-    asset_ids = entry['asset_ids']
-    nl_name = entry['nl_name']
+    asset_ids = entry.asset_ids
+    nl_name = entry.nl_name
 
     # Category safety check
     query_cat = extract_category(query)
-    nl_cat = extract_category(nl_name)
+    nl_cat = entry.nl_category
     if query_cat != 'other' and nl_cat != 'other' and query_cat != nl_cat:
         return None
 
     if len(asset_ids) > 1 and nl_catalog is not None:
         user_input = original_input if original_input else query
-        selection = auto_select_matching_variant(user_input, asset_ids, nl_catalog)
-        return {
-            'mapped_uae_assetid': selection['selected_id'],
-            'match_score': 100.0,
-            'match_status': MATCH_STATUS_MATCHED,
-            'confidence': CONFIDENCE_HIGH,
-            'matched_on': nl_name,
-            'method': 'signature',
-            'auto_selected': selection['auto_selected'],
-            'selection_reason': selection['reason'],
-            'alternatives': selection['alternatives'],
-        }
+        selection = auto_select_matching_variant(user_input, asset_ids, nl_catalog, catalog_variants)
+        return _match_result(
+            selection.selected_id, 100.0,
+            MATCH_STATUS_MATCHED,
+            CONFIDENCE_HIGH,
+            nl_name, 'signature', selection,
+        )
     elif len(asset_ids) == 1:
-        return {
-            'mapped_uae_assetid': asset_ids[0],
-            'match_score': 100.0,
-            'match_status': MATCH_STATUS_MATCHED,
-            'confidence': CONFIDENCE_HIGH,
-            'matched_on': nl_name,
-            'method': 'signature',
-            'auto_selected': False,
-            'selection_reason': '',
-            'alternatives': [],
-        }
+        return _match_result(
+            asset_ids[0], 100.0,
+            MATCH_STATUS_MATCHED,
+            CONFIDENCE_HIGH,
+            nl_name, 'signature',
+        )
     else:
-        return {
-            'mapped_uae_assetid': ', '.join(asset_ids),
-            'match_score': 100.0,
-            'match_status': MATCH_STATUS_MULTIPLE,
-            'confidence': CONFIDENCE_HIGH,
-            'matched_on': nl_name,
-            'method': 'signature',
-            'auto_selected': False,
-            'selection_reason': '',
-            'alternatives': [],
-        }
+        return _match_result(
+            ', '.join(asset_ids), 100.0,
+            MATCH_STATUS_MULTIPLE,
+            CONFIDENCE_HIGH,
+            nl_name, 'signature',
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -2425,48 +2864,50 @@ def load_and_clean_nl_list(df_nl: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
         - Cleaned DataFrame with 'normalized_name' column
         - Stats dict (includes 'warnings' list)
     """
-    df = df_nl.copy()
     warnings = []
 
-    original_count = len(df)
+    original_count = len(df_nl)
+
+    # Each filter is a mask over the full catalog, combined into one selection at
+    # the end. A filter's drop count only covers rows the earlier filters kept.
+    names_str = df_nl['uae_assetname'].astype(str)
+    names_stripped = names_str.str.strip()
 
     # Filter out null / empty asset names
-    df = df[df['uae_assetname'].notna()]
-    df = df[df['uae_assetname'].astype(str).str.strip() != '']
-    null_dropped = original_count - len(df)
+    keep = df_nl['uae_assetname'].notna() & (names_stripped != '')
+    null_dropped = original_count - int(keep.sum())
 
     # Filter out test entries (case-insensitive, matches "test" as a word boundary)
     # Using word boundary to avoid filtering "latest" or "testing" — safety choice
-    test_mask = df['uae_assetname'].astype(str).str.contains(
+    test_mask = names_str.str.contains(
         r'\btest\b', case=False, na=False
     )
-    df = df[~test_mask]
-    test_dropped = original_count - null_dropped - len(df)
+    test_dropped = int((keep & test_mask).sum())
+    keep &= ~test_mask
 
     # Filter out promo/placeholder brands that pollute fuzzy search space
     _EXCLUDE_BRANDS = {
         'promo', 'others', 'bts laptops', 'dsf 2021 promotion', 're-cycle',
         'windows', 'other laptops',
     }
-    pre_promo = len(df)
-    promo_mask = df['brand'].astype(str).str.strip().str.lower().isin(_EXCLUDE_BRANDS)
-    df = df[~promo_mask]
-    promo_dropped = pre_promo - len(df)
+    promo_mask = df_nl['brand'].astype(str).str.strip().str.lower().isin(_EXCLUDE_BRANDS)
+    promo_dropped = int((keep & promo_mask).sum())
+    keep &= ~promo_mask
 
     # Filter out "All/Any" catchall placeholder entries
-    pre_catchall = len(df)
-    catchall_mask = df['uae_assetname'].astype(str).str.contains(
+    catchall_mask = names_str.str.contains(
         r'\b(?:all\s+(?:models|storage|other|ram)|any\s+(?:storage|brand|model|ram))\b',
         case=False, na=False
     )
-    df = df[~catchall_mask]
-    catchall_dropped = pre_catchall - len(df)
+    catchall_dropped = int((keep & catchall_mask).sum())
+    keep &= ~catchall_mask
 
     # Filter out junk single-character/digit-only names (e.g., "1", "11")
-    pre_junk = len(df)
-    junk_mask = df['uae_assetname'].astype(str).str.strip().str.match(r'^\d{1,2}$')
-    df = df[~junk_mask]
-    junk_dropped = pre_junk - len(df)
+    junk_mask = names_stripped.str.match(r'^\d{1,2}$', na=False)
+    junk_dropped = int((keep & junk_mask).sum())
+    keep &= ~junk_mask
+
+    df = df_nl[keep].copy()
 
     # Check for duplicate asset IDs with different names (data quality issue)
     id_counts = df['uae_assetid'].value_counts()
@@ -2483,10 +2924,7 @@ def load_and_clean_nl_list(df_nl: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
         warnings.append(f"{empty_brands} NL entries have empty brand fields")
 
     # Build normalized names for matching
-    df['normalized_name'] = df.apply(
-        lambda row: build_match_string(row.get('brand', ''), row['uae_assetname']),
-        axis=1
-    )
+    df['normalized_name'] = build_match_series(df['brand'], df['uae_assetname'])
 
     stats = {
         'original': original_count,
@@ -2509,15 +2947,12 @@ def build_nl_lookup(df_nl_clean: pd.DataFrame) -> Dict[str, List[str]]:
     This handles the duplicate case: if multiple rows have the same normalized name,
     all their IDs are collected together.
     """
-    lookup = {}
-    for _, row in df_nl_clean.iterrows():
-        key = row['normalized_name']
-        asset_id = str(row['uae_assetid']).strip()
-        if key not in lookup:
-            lookup[key] = []
-        if asset_id not in lookup[key]:  # avoid exact duplicates
-            lookup[key].append(asset_id)
-    return lookup
+    # IDs collect in insertion-ordered dicts (O(1) dedup of exact duplicates)
+    ids_by_name: Dict[str, Dict[str, None]] = {}
+    for key, raw_asset_id in zip(df_nl_clean['normalized_name'].tolist(),
+                                 df_nl_clean['uae_assetid'].tolist()):
+        ids_by_name.setdefault(key, {})[str(raw_asset_id).strip()] = None
+    return {key: list(ids) for key, ids in ids_by_name.items()}
 
 
 def build_brand_index(df_nl_clean: pd.DataFrame) -> Dict[str, Dict]:
@@ -2533,32 +2968,116 @@ def build_brand_index(df_nl_clean: pd.DataFrame) -> Dict[str, Dict]:
     searching all 9,894 records — faster and eliminates cross-brand errors.
     """
     brand_index = {}
-    for _, row in df_nl_clean.iterrows():
-        brand = normalize_brand(str(row.get('brand', '')).strip())
-        if not brand:
-            brand = normalize_text(str(row.get('brand', '')).strip())
+    raw_brands = (df_nl_clean['brand'].tolist() if 'brand' in df_nl_clean.columns
+                  else [''] * len(df_nl_clean))
+    # Resolve each distinct brand spelling once, as build_attribute_index() does.
+    brand_keys: Dict[str, str] = {}
+    for raw_brand, name, raw_asset_id in zip(
+        raw_brands,
+        df_nl_clean['normalized_name'].tolist(),
+        df_nl_clean['uae_assetid'].tolist(),
+    ):
+        brand = brand_keys.get(raw_brand)
+        if brand is None:
+            brand_str = str(raw_brand).strip()
+            brand = brand_keys[raw_brand] = sys.intern(normalize_brand(brand_str) or normalize_text(brand_str))
         if not brand:
             continue
-        if brand not in brand_index:
-            brand_index[brand] = {'lookup': {}, 'names': []}
+        brand_data = brand_index.get(brand)
+        if brand_data is None:
+            brand_data = brand_index[brand] = {'lookup': {}, 'names': []}
+
+        ids = brand_data['lookup'].get(name)
+        if ids is None:
+            ids = brand_data['lookup'][name] = {}
+            brand_data['names'].append(name)
+        ids[str(raw_asset_id).strip()] = None
+
+    # lookup IDs were built as insertion-ordered dicts (O(1) dedup); readers expect lists
+    for brand_data in brand_index.values():
+        lookup = brand_data['lookup']
+        for name, ids in lookup.items():
+            lookup[name] = list(ids)
 
-        name = row['normalized_name']
-        asset_id = str(row['uae_assetid']).strip()
+    return brand_index
 
-        if name not in brand_index[brand]['lookup']:
-            brand_index[brand]['lookup'][name] = []
-            brand_index[brand]['names'].append(name)
-        if asset_id not in brand_index[brand]['lookup'][name]:
-            brand_index[brand]['lookup'][name].append(asset_id)
 
-    return brand_index
+def build_category_index(names: List[str]) -> Dict[str, List[str]]:
+    """
+    Bucket candidate names by extract_category() — an inverted index.
+
+    Returns dict: category -> [names in original order], so a per-query
+    category filter over `names` becomes one dictionary lookup.
+    """
+    category_index: Dict[str, List[str]] = {}
+    for name in names:
+        category_index.setdefault(extract_category(name), []).append(name)
+    return category_index
+
+
+def _token_sort_key(text: str) -> str:
+    """Sorted-token form compared by fuzz.token_sort_ratio (equal keys score 100)."""
+    key = _SORT_KEY_CACHE.get(text)
+    if key is not None:
+        return key
+    return _cache_store(_SORT_KEY_CACHE, text, ' '.join(sorted(text.split())))
+
+
+# token_sort_ratio(a, b) is exactly fuzz.ratio() of the two sorted-token keys.
+# Scoring the memoized keys with plain ratio moves the per-pair split/sort out
+# of rapidfuzz's inner loop: each catalog name is sorted once per session, not
+# once per query it is compared against. Scores, cutoffs and tie order
+# (list index) are identical to calling process.extractOne/extract with
+# scorer=fuzz.token_sort_ratio on the raw strings. Both sides are normalized
+# text already, so processor=None is passed explicitly.
+
+def _token_sort_extract_one(
+    query: str, choices: List[str], score_cutoff: float,
+) -> Optional[Tuple[str, float, int]]:
+    """process.extractOne(query, choices, scorer=fuzz.token_sort_ratio, score_cutoff=...)."""
+    result = process.extractOne(
+        _token_sort_key(query), [_token_sort_key(c) for c in choices],
+        scorer=fuzz.ratio, processor=None, score_cutoff=score_cutoff,
+    )
+    if result is None:
+        return None
+    _, score, idx = result
+    return choices[idx], score, idx
+
+
+def _token_sort_extract(query: str, choices: List[str], limit: int) -> List[Tuple[str, float, int]]:
+    """process.extract(query, choices, scorer=fuzz.token_sort_ratio, limit=...)."""
+    return [
+        (choices[idx], score, idx)
+        for _, score, idx in process.extract(
+            _token_sort_key(query), [_token_sort_key(c) for c in choices],
+            scorer=fuzz.ratio, processor=None, limit=limit,
+        )
+    ]
+
+
+def build_exact_index(names: List[str]) -> Dict[str, List[str]]:
+    """
+    Group candidate names by _token_sort_key() for the identical-match fast path.
+
+    Returns dict: sorted-token key -> [names in original order]. A query whose
+    key is present has a 100-scoring candidate, found without running the scorer.
+    """
+    exact_index: Dict[str, List[str]] = {}
+    for name in names:
+        exact_index.setdefault(_token_sort_key(name), []).append(name)
+    return exact_index
+
+
+_STORAGE_VALUE_PARTS_RE = re.compile(r'^(\d+)(gb|tb|mb)$', re.IGNORECASE)
 
 
 def _normalize_storage_value(val: str) -> str:
     """Canonicalize storage: 1024gb->1tb, 2048gb->2tb. Passthrough for normal values."""
-    if not val:
+    # Only a GB value can change, so TB/MB values skip the regex entirely
+    if not val or ('g' not in val and 'G' not in val):
         return val
-    m = re.match(r'^(\d+)(gb|tb|mb)$', val, re.IGNORECASE)
+    m = _STORAGE_VALUE_PARTS_RE.match(val)
     if not m:
         return val
     num, unit = int(m.group(1)), m.group(2).lower()
@@ -2569,7 +3088,21 @@ def _normalize_storage_value(val: str) -> str:
     return val
 
 
+# Storage values ('128gb', '1tb') as written in normalized text.
+_STORAGE_VALUE_RE = re.compile(r'(\d+(?:gb|tb|mb))')
+
+
 def extract_storage(text: str) -> str:
+    """Cached front for _extract_storage()."""
+    if not isinstance(text, str):
+        return ''
+    cached = _STORAGE_CACHE.get(text)
+    if cached is not None:
+        return cached
+    return _cache_store(_STORAGE_CACHE, text, _extract_storage(text))
+
+
+def _extract_storage(text: str) -> str:
     """
     Extract storage from a normalized product string (e.g., '16gb', '128gb', '1tb').
     Filters out RAM-sized values (typically <= 12GB for phones/tablets) when multiple
@@ -2577,7 +3110,7 @@ def extract_storage(text: str) -> str:
     """
     if not isinstance(text, str):
         return ''
-    matches = re.findall(r'(\d+(?:gb|tb|mb))', text)
+    matches = _STORAGE_VALUE_RE.findall(text)
     if not matches:
         return ''
     if len(matches) == 1:
@@ -2589,7 +3122,7 @@ def extract_storage(text: str) -> str:
         return _normalize_storage_value(tb_matches[0])
 
     # For GB values, filter out likely RAM (<= 12GB) and prefer larger values
-    gb_values = [(m, int(re.search(r'\d+', m).group())) for m in matches if 'gb' in m.lower()]
+    gb_values = [(m, int(_DIGITS_RE.search(m).group())) for m in matches if 'gb' in m.lower()]
     storage_values = [(m, size) for m, size in gb_values if size >= 16]
     if storage_values:
         return _normalize_storage_value(max(storage_values, key=lambda x: x[1])[0])
@@ -2598,7 +3131,21 @@ def extract_storage(text: str) -> str:
     return _normalize_storage_value(matches[0])
 
 
+# Watch case size in mm: "40mm", "40 mm", "40MM"
+_WATCH_MM_RE = re.compile(r'\b(3[89]|4[0-9]|5[0-5])\s*mm\b', re.IGNORECASE)
+
+
 def extract_watch_mm(text: str) -> str:
+    """Cached front for _extract_watch_mm()."""
+    if not isinstance(text, str) or not text:
+        return ''
+    cached = _WATCH_MM_CACHE.get(text)
+    if cached is not None:
+        return cached
+    return _cache_store(_WATCH_MM_CACHE, text, _extract_watch_mm(text))
+
+
+def _extract_watch_mm(text: str) -> str:
     """
     Extract watch case size in mm.
 
@@ -2610,12 +3157,38 @@ def extract_watch_mm(text: str) -> str:
     if not isinstance(text, str) or not text:
         return ''
     # Match 38-55mm range (covers all Apple Watch, Galaxy Watch, etc.)
-    match = re.search(r'\b(3[89]|4[0-9]|5[0-5])\s*mm\b', text, re.IGNORECASE)
+    match = _WATCH_MM_RE.search(text)
     return f"{match.group(1)}mm" if match else ''
 
 
-@lru_cache(maxsize=50000)
-def extract_category(text: str) -> str:
+# Tablet keywords - the first (and winning) test in _extract_category(). Word
+# boundary on 'tab'/'pad' prevents false matches in 'stable', 'collaboration', etc.
+# build_attribute_index() applies it column-wise to flag tablet rows in one pass.
+_TABLET_CATEGORY_RE = re.compile(r'\btab(?:let)?\b|ipad|matepad|mediapad|\bpad\b')
+_GEAR_WORD_RE = re.compile(r'\bgear\b')
+# Short mobile keywords need word boundaries ('climate', 'ultimate', 'finder').
+_MOBILE_KEYWORD_RE = re.compile(r'\b(?:phone|mi|mate|nova|find|reno)\b')
+_LG_PHONE_SERIES_RE = re.compile(r'\blg\s+[vg]\d')
+
+# Phone-only brands: These manufacturers make almost exclusively phones.
+# Word boundaries prevent false substring matches (e.g., 'nothing' in a sentence).
+# One alternation so _extract_category() makes a single pass over the text.
+_PHONE_ONLY_BRANDS = (
+    'honor', 'motorola', 'moto', 'oneplus', 'one plus',
+    'nokia', 'vivo', 'realme', 'nothing',
+    'oppo', 'xiaomi', 'poco', 'tecno', 'infinix', 'itel',
+    'zte', 'alcatel', 'meizu', 'umidigi', 'doogee',
+    'blackview', 'cubot', 'oukitel', 'ulefone',
+    'cat phone', 'fairphone', 'sharp aquos',
+    'sony xperia', 'xperia',
+    'iqoo', 'nubia',
+)
+_PHONE_ONLY_BRAND_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(b) for b in _PHONE_ONLY_BRANDS) + r')\b'
+)
+
+
+def _extract_category(text: str) -> str:
     """
     Extract product category from normalized text.
 
@@ -2628,18 +3201,17 @@ def extract_category(text: str) -> str:
         return 'other'
     text_lower = text.lower()
 
+    # The category tests are ordered by precedence (a name can carry several
+    # categories' keywords), so each regex sits behind a substring test on a
+    # literal every alternative contains; most names then never run it.
+
     # Tablets: Must check before "phone" (some products have both keywords)
-    # Use word boundary for 'tab' to prevent false matches in 'stable', 'collaboration', etc.
-    if (re.search(r'\btab(?:let)?\b', text_lower) or
-        'ipad' in text_lower or
-        'matepad' in text_lower or
-        'mediapad' in text_lower or
-        re.search(r'\bpad\b', text_lower)):
+    if ('tab' in text_lower or 'pad' in text_lower) and _TABLET_CATEGORY_RE.search(text_lower):
         return 'tablet'
 
     # Smartwatches: Must check before "phone"
     # Covers: Apple Watch, Galaxy Watch, Samsung Gear, Huawei Watch GT, etc.
-    if 'watch' in text_lower or re.search(r'\bgear\b', text_lower):
+    if 'watch' in text_lower or ('gear' in text_lower and _GEAR_WORD_RE.search(text_lower)):
         return 'watch'
 
     # Laptops: Check before mobile (MacBook, ThinkPad, etc.)
@@ -2650,32 +3222,84 @@ def extract_category(text: str) -> str:
     # Use word boundaries for 'phone' to avoid 'headphones', and for short keywords
     # to prevent false matches in 'climate', 'ultimate', 'innovation', 'finder', etc.
     if any(kw in text_lower for kw in ['iphone', 'mobile', 'smartphone', 'galaxy s', 'galaxy a', 'galaxy z', 'pixel', 'redmi']) or \
-       any(re.search(rf'\b{kw}\b', text_lower) for kw in ['phone', 'mi', 'mate', 'nova', 'find', 'reno']):
+       _MOBILE_KEYWORD_RE.search(text_lower):
         return 'mobile'
 
     # Phone-only brands: These manufacturers make almost exclusively phones.
     # If the brand name appears, it's safe to classify as mobile.
-    # Word boundaries prevent false substring matches (e.g., 'nothing' in a sentence).
-    phone_only_brands = [
-        'honor', 'motorola', 'moto', 'oneplus', 'one plus',
-        'nokia', 'vivo', 'realme', 'nothing',
-        'oppo', 'xiaomi', 'poco', 'tecno', 'infinix', 'itel',
-        'zte', 'alcatel', 'meizu', 'umidigi', 'doogee',
-        'blackview', 'cubot', 'oukitel', 'ulefone',
-        'cat phone', 'fairphone', 'sharp aquos',
-        'sony xperia', 'xperia',
-        'iqoo', 'nubia',
-    ]
-    if any(re.search(rf'\b{re.escape(kw)}\b', text_lower) for kw in phone_only_brands):
+    if _PHONE_ONLY_BRAND_RE.search(text_lower):
         return 'mobile'
 
     # LG phone series: "LG V60", "LG G8" — word boundary after V/G fails when followed by digit
-    if re.search(r'\blg\s+[vg]\d', text_lower):
+    if 'lg' in text_lower and _LG_PHONE_SERIES_RE.search(text_lower):
         return 'mobile'
 
     return 'other'
 
 
+def extract_category(text: str) -> str:
+    """Cached front for _extract_category()."""
+    cached = _CATEGORY_CACHE.get(text)
+    if cached is not None:
+        return cached
+    return _cache_store(_CATEGORY_CACHE, text, _extract_category(text))
+
+
+def warm_text_caches(nl_names: List[str], asset_names: Optional[List[str]] = None) -> None:
+    """
+    Pre-populate the text caches for every NL catalog name.
+
+    The catalog is a finite, known set that every run scores candidates
+    against, so computing it once at load time keeps the per-query path
+    on cache hits. asset_names (the raw uae_assetname column) fills the
+    model-variant keywords that auto_select_matching_variant() reads.
+    """
+    for name in nl_names:
+        normalize_text(name)
+        extract_product_attributes(name, '')
+        extract_category(name)
+    for name in asset_names or ():
+        extract_model_variant_keywords(name)
+
+
+def clear_text_caches() -> None:
+    """
+    Empty every text memo cache (normalization, brand, attribute, category,
+    storage, watch size, variant signature, variant keywords, laptop rows
+    and pools).
+
+    For benchmarks that need to time the uncached extraction path; matching
+    never needs it since the cached values are pure functions of the input.
+    """
+    for cache in (_NORM_CACHE, _BRAND_CACHE, _ATTRS_CACHE, _LAPTOP_ATTRS_CACHE,
+                  _LAPTOP_ROW_CACHE, _LAPTOP_POOL_CACHE, _CATEGORY_CACHE,
+                  _SORT_KEY_CACHE, _STORAGE_CACHE, _WATCH_MM_CACHE,
+                  _MODEL_VARIANT_CACHE, _SIGNATURE_CACHE,
+                  _VARIANT_KEYWORDS_CACHE):
+        cache.clear()
+
+
+_CONNECTIVITY_TOKEN_RE = re.compile(r'\b[345]g\b')
+_STORAGE_VALUE_STRIP_RE = re.compile(r'\b\d+(?:gb|tb|mb)\b')
+# 1-2 digit numbers NOT followed by gb/tb/mb
+_SHORT_MODEL_NUM_RE = re.compile(r'(?<!\d)(\d{1,2})(?!\d|gb|tb|mb)')
+_RENO_ZF_VARIANT_RE = re.compile(r'\breno\s*\d*\s+(z|f)\b')
+# Variant keywords that distinguish different products (extract_model_tokens).
+# These are critical identifiers that must match for products to be the same
+_MODEL_TOKEN_KEYWORDS = frozenset({
+    # Size variants
+    'max', 'plus', 'mini', 'xl', 'ultra', 'lite', 'pro',
+    # Product types (different categories!)
+    'tab', 'watch', 'fold', 'flip', 'note', 'pad', 'book',
+    # Generation markers that matter
+    'edge', 'active', 'prime',
+    # Xiaomi/Poco/Redmi performance variants (GT ≠ base, Turbo ≠ base)
+    'gt', 'turbo', 'neo', 'speed',
+    # Bundle/kit suffix (Xiaomi 14 Ultra ≠ Xiaomi 14 Ultra Photography Kit)
+    'kit',
+})
+
+
 def extract_attributes(text: str) -> Dict[str, str]:
     """
     Extract structured attributes from a normalized product string.
@@ -2690,10 +3314,10 @@ def extract_attributes(text: str) -> Dict[str, str]:
 
     # Remove connectivity markers (3g, 4g, 5g) before model number extraction
     # to prevent "5" in "5g" from being treated as a model number
-    text_clean = re.sub(r'\b[345]g\b', '', text)
+    text_clean = _CONNECTIVITY_TOKEN_RE.sub('', text)
 
     # Extract model numbers: 1-2 digit numbers NOT followed by gb/tb/mb
-    model_nums = re.findall(r'(?<!\d)(\d{1,2})(?!\d|gb|tb|mb)', text_clean)
+    model_nums = _SHORT_MODEL_NUM_RE.findall(text_clean)
 
     return {'storage': storage, 'model_nums': model_nums}
 
@@ -2722,34 +3346,22 @@ def extract_model_tokens(text: str) -> List[str]:
     if not isinstance(text, str) or not text.strip():
         return []
     # Remove storage tokens (e.g., "256gb", "1tb")
-    text_clean = re.sub(r'\b\d+(?:gb|tb|mb)\b', '', text)
+    text_clean = _STORAGE_VALUE_STRIP_RE.sub('', text)
     # Remove connectivity markers (e.g., "5g", "4g")
-    text_clean = re.sub(r'\b[345]g\b', '', text_clean)
-
-    # Variant keywords that distinguish different products
-    # These are critical identifiers that must match for products to be the same
-    variant_keywords = {
-        # Size variants
-        'max', 'plus', 'mini', 'xl', 'ultra', 'lite', 'pro',
-        # Product types (different categories!)
-        'tab', 'watch', 'fold', 'flip', 'note', 'pad', 'book',
-        # Generation markers that matter
-        'edge', 'active', 'prime',
-        # Xiaomi/Poco/Redmi performance variants (GT ≠ base, Turbo ≠ base)
-        'gt', 'turbo', 'neo', 'speed',
-        # Bundle/kit suffix (Xiaomi 14 Ultra ≠ Xiaomi 14 Ultra Photography Kit)
-        'kit',
-    }
+    text_clean = _CONNECTIVITY_TOKEN_RE.sub('', text_clean)
 
     tokens = text_clean.split()
     model_tokens = []
 
+    # One pass keeps digit tokens and keywords in text order. Timed against a
+    # single findall(r'\S*\d\S*'), a combined digit|keyword regex and
+    # any(c.isdigit() ...) per token: this loop was the fastest on the catalog.
     for token in tokens:
         # Include if token contains a digit (existing logic)
-        if re.search(r'\d', token):
+        if _ANY_DIGIT_RE.search(token):
             model_tokens.append(token)
         # Also include if token is a variant keyword (NEW!)
-        elif token in variant_keywords:
+        elif token in _MODEL_TOKEN_KEYWORDS:
             model_tokens.append(token)
 
     # --- OPPO Reno Z/F variant extraction (brand-conditional) ---
@@ -2760,7 +3372,7 @@ def extract_model_tokens(text: str) -> List[str]:
     if 'reno' in text_lower:
         # Match patterns like "reno 2 z", "reno 4 f", "reno z", "reno f"
         # After de-concat: "reno2" -> "reno 2", so digit may be a separate token
-        reno_variant_match = re.search(r'\breno\s*\d*\s+(z|f)\b', text_lower)
+        reno_variant_match = _RENO_ZF_VARIANT_RE.search(text_lower)
         if reno_variant_match:
             variant_letter = reno_variant_match.group(1)
             if variant_letter not in model_tokens:
@@ -2870,7 +3482,25 @@ def model_identity_guardrail(query: str, candidate: str) -> Tuple[bool, str]:
     return True, ''
 
 
+_FOLD_GEN_RE = re.compile(r'fold\s*(\d+)')
+_FLIP_GEN_RE = re.compile(r'flip\s*(\d+)')
+_MINI_WORD_RE = re.compile(r'\bmini\b')
+
+
 def extract_model_variant_keywords(text: str) -> Dict[str, any]:
+    """
+    Cached front for _extract_model_variant_keywords().
+
+    The returned dict is shared between callers; treat it as read-only.
+    """
+    cached = _VARIANT_KEYWORDS_CACHE.get(text)
+    if cached is not None:
+        return cached
+    return _cache_store(_VARIANT_KEYWORDS_CACHE, text,
+                        _extract_model_variant_keywords(text))
+
+
+def _extract_model_variant_keywords(text: str) -> Dict[str, any]:
     """
     Extract model variant keywords that distinguish different products.
 
@@ -2908,7 +3538,7 @@ def extract_model_variant_keywords(text: str) -> Dict[str, any]:
     if 'fold' in text_lower:
         result['has_fold'] = True
         # Look for generation number: "fold 2", "fold2", "z fold 3", "zfold3"
-        fold_match = re.search(r'fold\s*(\d+)', text_lower)
+        fold_match = _FOLD_GEN_RE.search(text_lower)
         if fold_match:
             result['fold_gen'] = f"fold{fold_match.group(1)}"
         else:
@@ -2918,7 +3548,7 @@ def extract_model_variant_keywords(text: str) -> Dict[str, any]:
     if 'flip' in text_lower:
         result['has_flip'] = True
         # Look for generation number: "flip 3", "flip3", "z flip 4", "zflip4"
-        flip_match = re.search(r'flip\s*(\d+)', text_lower)
+        flip_match = _FLIP_GEN_RE.search(text_lower)
         if flip_match:
             result['flip_gen'] = f"flip{flip_match.group(1)}"
         else:
@@ -2930,24 +3560,104 @@ def extract_model_variant_keywords(text: str) -> Dict[str, any]:
     elif 'pro' in text_lower:
         result['has_pro'] = True
 
-    # Other variants
+    # Other variants. Substring tests on purpose: names glue the variant onto
+    # the model ("note10plus", "s22ultra", "p30lite"), which a token set misses.
     if 'plus' in text_lower:
         result['has_plus'] = True
     if 'ultra' in text_lower:
         result['has_ultra'] = True
     if 'lite' in text_lower:
         result['has_lite'] = True
-    if re.search(r'\bmini\b', text_lower):
+    if _MINI_WORD_RE.search(text_lower):
         result['has_mini'] = True
 
     return result
 
 
+# Year in the user's text, for auto_select_matching_variant()'s year priority
+_USER_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+
+# Substrings that mark each user material in an NL name (auto_select_matching_variant priority 0)
+_MATERIAL_NAME_TERMS = {
+    'aluminum': ('alumin',),
+    'stainless': ('stainless',),
+    'titanium': ('titanium', 'titan'),
+    'ceramic': ('ceramic',),
+}
+
+
+def _variant_keyword_columns(names: List, ids: List[str], alive: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    extract_model_variant_keywords() of each candidate name, as one numpy
+    array per key (bool for the has_* flags, object for the generations).
+    The passes re-select rows by asset ID, so any row sharing an alive row's
+    ID can come back; only rows whose ID has no alive row get the keywords
+    of an empty name.
+
+    The keywords come from the warmed cache, so each row costs a dict hit
+    here, which leaves nothing for a compiled kernel to win.
+    """
+    alive_ids = {ids[i] for i in np.flatnonzero(alive)}
+    keywords = [extract_model_variant_keywords(name if asset_id in alive_ids else '')
+                for name, asset_id in zip(names, ids)]
+    return {
+        key: np.array([kw[key] for kw in keywords],
+                      dtype=object if key.endswith('_gen') else bool)
+        for key in extract_model_variant_keywords('')
+    }
+
+
+def _narrow_variants(ids: List[str], alive: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """
+    One auto_select_matching_variant() filter pass over its candidate rows.
+
+    Every row whose asset ID has an alive row in `keep` stays alive (rows
+    are selected by ID, as the passes always have been). If no alive row
+    is kept the pass is a no-op and `alive` is returned unchanged.
+    """
+    kept_rows = alive & keep
+    if not kept_rows.any():
+        return alive
+    kept = {ids[i] for i in np.flatnonzero(kept_rows)}
+    return np.fromiter((aid in kept for aid in ids), dtype=bool, count=len(ids))
+
+
+class CatalogVariants(NamedTuple):
+    """
+    Asset names and IDs of an NL catalog, indexed by asset ID, so
+    auto_select_matching_variant() gathers its candidate rows with a dict
+    lookup instead of a full-catalog isin() plus DataFrame slice per call.
+    Built once per run by run_matching() and passed down.
+    """
+    names: List                       # uae_assetname per catalog row
+    ids: List[str]                    # uae_assetid per catalog row
+    rows_by_id: Dict[str, List[int]]  # row positions of each asset ID, in catalog order
+
+
+def build_catalog_variants(nl_catalog: pd.DataFrame) -> CatalogVariants:
+    """Build the CatalogVariants lookup for nl_catalog."""
+    ids = nl_catalog['uae_assetid'].tolist()
+    rows_by_id: Dict[str, List[int]] = {}
+    for pos, asset_id in enumerate(ids):
+        rows_by_id.setdefault(asset_id, []).append(pos)
+    return CatalogVariants(nl_catalog['uae_assetname'].tolist(), ids, rows_by_id)
+
+
+class VariantSelection(NamedTuple):
+    """auto_select_matching_variant() result."""
+    selected_id: str         # The chosen asset ID
+    auto_selected: bool      # True if auto-selected, False if manual selection needed
+    reason: str              # Human-readable explanation of selection logic
+    alternatives: List[str]  # Other asset IDs (for manual override)
+
+
 def auto_select_matching_variant(
     user_input: str,
     asset_ids: List[str],
-    nl_catalog: pd.DataFrame
-) -> dict:
+    nl_catalog: pd.DataFrame,
+    catalog_variants: Optional[CatalogVariants] = None,
+) -> VariantSelection:
     """
     Automatically select the best variant from MULTIPLE_MATCHES based on user's exact specs.
 
@@ -2959,38 +3669,50 @@ def auto_select_matching_variant(
     2. Connectivity matching (5G vs 4G)
     3. First ID if truly identical
 
-    Returns dict:
-        'selected_id': The chosen asset ID
-        'auto_selected': True if auto-selected, False if manual selection needed
-        'reason': Human-readable explanation of selection logic
-        'alternatives': List of other asset IDs (for manual override)
+    catalog_variants is nl_catalog's build_catalog_variants() lookup; without
+    it the candidate rows are found by scanning nl_catalog.
+
+    Returns a VariantSelection (selected_id, auto_selected, reason, alternatives).
     """
     if len(asset_ids) == 0:
-        return {
-            'selected_id': '',
-            'auto_selected': False,
-            'reason': 'No variants found',
-            'alternatives': []
-        }
+        return VariantSelection(
+            selected_id='',
+            auto_selected=False,
+            reason='No variants found',
+            alternatives=[],
+        )
 
     if len(asset_ids) == 1:
-        return {
-            'selected_id': asset_ids[0],
-            'auto_selected': False,
-            'reason': 'Single match',
-            'alternatives': []
-        }
+        return VariantSelection(
+            selected_id=asset_ids[0],
+            auto_selected=False,
+            reason='Single match',
+            alternatives=[],
+        )
 
-    # Get all variant details
-    variants = nl_catalog[nl_catalog['uae_assetid'].isin(asset_ids)]
+    # Get all variant details (names and IDs of the candidate rows, in catalog order)
+    if catalog_variants is not None:
+        rows = sorted(pos for asset_id in set(asset_ids)
+                      for pos in catalog_variants.rows_by_id.get(asset_id, ()))
+        names = [catalog_variants.names[pos] for pos in rows]
+        ids = [catalog_variants.ids[pos] for pos in rows]
+    else:
+        variants = nl_catalog[nl_catalog['uae_assetid'].isin(asset_ids)]
+        names = variants['uae_assetname'].tolist()
+        ids = variants['uae_assetid'].tolist()
+
+    if len(ids) == 0:
+        return VariantSelection(
+            selected_id=asset_ids[0],
+            auto_selected=False,
+            reason='Variants not found in catalog',
+            alternatives=asset_ids[1:],
+        )
 
-    if len(variants) == 0:
-        return {
-            'selected_id': asset_ids[0],
-            'auto_selected': False,
-            'reason': 'Variants not found in catalog',
-            'alternatives': asset_ids[1:]
-        }
+    # The filter passes below narrow a mask over these rows; no DataFrame is
+    # sliced along the way.
+    names_lower = [str(name).lower() for name in names]
+    alive = np.ones(len(ids), dtype=bool)
 
     # === PRIORITY 0: Material matching (FIRST — aluminum vs stainless vs titanium) ===
     # For watches especially, material is the most critical differentiator
@@ -3006,143 +3728,86 @@ def auto_select_matching_variant(
         user_material = 'ceramic'
 
     if user_material:
-        filtered = []
-        for _, row in variants.iterrows():
-            nl_name_lower = str(row['uae_assetname']).lower()
-            if user_material == 'aluminum' and 'alumin' in nl_name_lower:
-                filtered.append(row['uae_assetid'])
-            elif user_material == 'stainless' and 'stainless' in nl_name_lower:
-                filtered.append(row['uae_assetid'])
-            elif user_material == 'titanium' and ('titanium' in nl_name_lower or 'titan' in nl_name_lower):
-                filtered.append(row['uae_assetid'])
-            elif user_material == 'ceramic' and 'ceramic' in nl_name_lower:
-                filtered.append(row['uae_assetid'])
-        if len(filtered) > 0:
-            variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
+        material_terms = _MATERIAL_NAME_TERMS[user_material]
+        alive = _narrow_variants(ids, alive, np.fromiter(
+            (any(term in name for term in material_terms) for name in names_lower),
+            dtype=bool, count=len(names_lower)))
 
     # === PRIORITY 1: Year matching (most specific) ===
-    user_year = re.search(r'\b(20\d{2})\b', user_input)
+    user_year = _USER_YEAR_RE.search(user_input)
     if user_year:
         year = user_year.group(1)
-        match_year = variants[variants['uae_assetname'].str.contains(year, na=False)]
-        if len(match_year) > 0:
+        match_year = alive & np.fromiter(
+            (isinstance(name, str) and year in name for name in names),
+            dtype=bool, count=len(names))
+        if match_year.any():
             # Continue to Priority 1.5 with year-filtered variants
-            variants = match_year
+            alive = match_year
 
     # === PRIORITY 1.5: MODEL VARIANT matching (CRITICAL FIX!) ===
     # This prevents Fold2 from matching Fold4, and Flip from matching Fold!
     user_variants = extract_model_variant_keywords(user_input)
+    # One keyword column per flag over the candidate rows, so every pass
+    # below is a numpy comparison instead of a per-row Python predicate.
+    # The rows are only the caller's asset_ids (a handful), and each pass
+    # depends on what the earlier ones left, so a catalog-wide keyword
+    # trie could not stand in for the cascade.
+    nl_variants = _variant_keyword_columns(names, ids, alive)
 
     # CRITICAL ERROR PREVENTION 1: Fold vs Flip (completely different product lines!)
     if user_variants['has_fold'] or user_variants['has_flip']:
         # Filter to ONLY Fold or ONLY Flip based on what user has
-        filtered = []
-        for _, row in variants.iterrows():
-            nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-
-            # If user has Fold, NL must have Fold (not Flip!)
-            if user_variants['has_fold'] and not nl_variants['has_fold']:
-                continue
-            # If user has Flip, NL must have Flip (not Fold!)
-            if user_variants['has_flip'] and not nl_variants['has_flip']:
-                continue
-
-            filtered.append(row['uae_assetid'])
-
-        if len(filtered) > 0:
-            variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
+        keep = np.ones(len(ids), dtype=bool)
+        # If user has Fold, NL must have Fold (not Flip!)
+        if user_variants['has_fold']:
+            keep &= nl_variants['has_fold']
+        # If user has Flip, NL must have Flip (not Fold!)
+        if user_variants['has_flip']:
+            keep &= nl_variants['has_flip']
+        alive = _narrow_variants(ids, alive, keep)
 
     # CRITICAL ERROR PREVENTION 2: Fold/Flip generation matching (Fold2 ≠ Fold3 ≠ Fold4!)
     if user_variants['fold_gen'] or user_variants['flip_gen']:
-        filtered = []
-        for _, row in variants.iterrows():
-            nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-
-            # If user has specific Fold generation, NL must match EXACTLY
-            if user_variants['fold_gen'] and nl_variants['fold_gen'] != user_variants['fold_gen']:
-                continue
-            # If user has specific Flip generation, NL must match EXACTLY
-            if user_variants['flip_gen'] and nl_variants['flip_gen'] != user_variants['flip_gen']:
-                continue
-
-            filtered.append(row['uae_assetid'])
-
-        if len(filtered) > 0:
-            variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
+        keep = np.ones(len(ids), dtype=bool)
+        # If user has specific Fold generation, NL must match EXACTLY
+        if user_variants['fold_gen']:
+            keep &= nl_variants['fold_gen'] == user_variants['fold_gen']
+        # If user has specific Flip generation, NL must match EXACTLY
+        if user_variants['flip_gen']:
+            keep &= nl_variants['flip_gen'] == user_variants['flip_gen']
+        alive = _narrow_variants(ids, alive, keep)
 
     # ERROR PREVENTION 3: Pro vs Pro Max (different models!)
-    if user_variants['has_pro_max'] or user_variants['has_pro']:
-        filtered = []
-        for _, row in variants.iterrows():
-            nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-
-            # If user has Pro Max, NL must have Pro Max (not just Pro)
-            if user_variants['has_pro_max'] and not nl_variants['has_pro_max']:
-                continue
-            # If user has Pro (not Max), NL must NOT have Pro Max
-            if user_variants['has_pro'] and nl_variants['has_pro_max']:
-                continue
-
-            filtered.append(row['uae_assetid'])
-
-        if len(filtered) > 0:
-            variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
+    if user_variants['has_pro_max']:
+        # If user has Pro Max, NL must have Pro Max (not just Pro)
+        alive = _narrow_variants(ids, alive, nl_variants['has_pro_max'])
+    elif user_variants['has_pro']:
+        # If user has Pro (not Max), NL must NOT have Pro Max
+        alive = _narrow_variants(ids, alive, ~nl_variants['has_pro_max'])
 
     # ERROR PREVENTION 4: Plus variant matching
     if user_variants['has_plus']:
-        filtered = []
-        for _, row in variants.iterrows():
-            nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-
-            # If user has Plus, prefer NL with Plus
-            if nl_variants['has_plus']:
-                filtered.append(row['uae_assetid'])
-
-        if len(filtered) > 0:
-            variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
-
-    # ERROR PREVENTION 5: Ultra variant matching
-    # Ultra is a distinct product (Galaxy S23 Ultra != Galaxy S23)
-    filtered = []
-    for _, row in variants.iterrows():
-        nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-        if user_variants['has_ultra'] and not nl_variants['has_ultra']:
-            continue  # User has Ultra, NL must too
-        if not user_variants['has_ultra'] and nl_variants['has_ultra']:
-            continue  # User does NOT have Ultra, skip Ultra NL entries
-        filtered.append(row['uae_assetid'])
-    if len(filtered) > 0:
-        variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
-
-    # ERROR PREVENTION 6: Lite variant matching
-    # Lite is a distinct product (P40 Lite != P40)
-    filtered = []
-    for _, row in variants.iterrows():
-        nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-        if user_variants['has_lite'] and not nl_variants['has_lite']:
-            continue  # User has Lite, NL must too
-        if not user_variants['has_lite'] and nl_variants['has_lite']:
-            continue  # User does NOT have Lite, skip Lite NL entries
-        filtered.append(row['uae_assetid'])
-    if len(filtered) > 0:
-        variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
-
-    # ERROR PREVENTION 7: Mini variant matching
-    # Mini is a distinct product (iPhone 13 Mini != iPhone 13)
-    filtered = []
-    for _, row in variants.iterrows():
-        nl_variants = extract_model_variant_keywords(row['uae_assetname'])
-        if user_variants['has_mini'] and not nl_variants['has_mini']:
+        # If user has Plus, prefer NL with Plus
+        alive = _narrow_variants(ids, alive, nl_variants['has_plus'])
+
+    # ERROR PREVENTION 5-7: Ultra, Lite and Mini variant matching
+    # Each is a distinct product (Galaxy S23 Ultra != Galaxy S23, P40 Lite !=
+    # P40, iPhone 13 Mini != iPhone 13), so NL must agree with the user both
+    # ways: user has it -> NL must too; user does NOT -> skip NL entries with it.
+    # Neither side having it keeps every alive row, so the pass is skipped;
+    # with repeated asset IDs it still has to run, to re-select rows by ID.
+    ids_unique = len(set(ids)) == len(ids)
+    for flag in ('has_ultra', 'has_lite', 'has_mini'):
+        if not user_variants[flag] and ids_unique and not (alive & nl_variants[flag]).any():
             continue
-        if not user_variants['has_mini'] and nl_variants['has_mini']:
-            continue
-        filtered.append(row['uae_assetid'])
-    if len(filtered) > 0:
-        variants = nl_catalog[nl_catalog['uae_assetid'].isin(filtered)]
+        alive = _narrow_variants(ids, alive, nl_variants[flag] == user_variants[flag])
+
+    alive_rows = np.flatnonzero(alive)
+    variant_ids = [ids[i] for i in alive_rows]
 
     # If model variant filtering narrowed down to 1 option, select it!
-    if len(variants) == 1:
-        selected = variants.iloc[0]['uae_assetid']
+    if len(variant_ids) == 1:
+        selected = variant_ids[0]
         alternatives = [aid for aid in asset_ids if aid != selected]
 
         # Build reason based on what was matched
@@ -3170,69 +3835,69 @@ def auto_select_matching_variant(
 
         reason = f'Matched {", ".join(reason_parts)}' if reason_parts else 'Matched model variant'
 
-        return {
-            'selected_id': selected,
-            'auto_selected': True,
-            'reason': reason,
-            'alternatives': alternatives
-        }
+        return VariantSelection(
+            selected_id=selected,
+            auto_selected=True,
+            reason=reason,
+            alternatives=alternatives,
+        )
 
     # === PRIORITY 2: Connectivity matching (5G vs 4G/LTE) ===
-    user_has_5g = '5g' in user_input.lower()
-    user_has_4g = any(x in user_input.lower() for x in ['4g', 'lte'])
+    user_has_5g = '5g' in user_input_lower
+    user_has_4g = any(x in user_input_lower for x in ['4g', 'lte'])
+    # Remaining variants split by a literal 5G test, shared by every branch below
+    ids_5g = [ids[i] for i in alive_rows if '5g' in names_lower[i]]
+    ids_4g = [ids[i] for i in alive_rows if '5g' not in names_lower[i]]
 
     if user_has_5g:
         # User has 5G -> select 5G variant
-        match_5g = variants[variants['uae_assetname'].str.contains('5G|5g', na=False, regex=True)]
-        if len(match_5g) > 0:
-            selected = match_5g.iloc[0]['uae_assetid']
+        if len(ids_5g) > 0:
+            selected = ids_5g[0]
             alternatives = [aid for aid in asset_ids if aid != selected]
-            return {
-                'selected_id': selected,
-                'auto_selected': True,
-                'reason': 'Matched 5G (user has 5G)',
-                'alternatives': alternatives
-            }
+            return VariantSelection(
+                selected_id=selected,
+                auto_selected=True,
+                reason='Matched 5G (user has 5G)',
+                alternatives=alternatives,
+            )
 
     if user_has_4g:
         # User has 4G/LTE -> select non-5G variant
-        match_4g = variants[~variants['uae_assetname'].str.contains('5G|5g', na=False, regex=True)]
-        if len(match_4g) > 0:
-            selected = match_4g.iloc[0]['uae_assetid']
+        if len(ids_4g) > 0:
+            selected = ids_4g[0]
             alternatives = [aid for aid in asset_ids if aid != selected]
-            return {
-                'selected_id': selected,
-                'auto_selected': True,
-                'reason': 'Matched 4G/LTE (user has 4G/LTE)',
-                'alternatives': alternatives
-            }
+            return VariantSelection(
+                selected_id=selected,
+                auto_selected=True,
+                reason='Matched 4G/LTE (user has 4G/LTE)',
+                alternatives=alternatives,
+            )
 
     # Check if NL has connectivity difference but user doesn't specify
-    has_5g_variant = any('5g' in str(v).lower() for v in variants['uae_assetname'])
-    has_4g_variant = any(not ('5g' in str(v).lower()) for v in variants['uae_assetname'])
+    has_5g_variant = len(ids_5g) > 0
+    has_4g_variant = len(ids_4g) > 0
 
     if has_5g_variant and has_4g_variant:
         # User didn't specify, default to non-5G (more common in recommerce inventory)
-        match_4g = variants[~variants['uae_assetname'].str.contains('5G|5g', na=False, regex=True)]
-        if len(match_4g) > 0:
-            selected = match_4g.iloc[0]['uae_assetid']
+        if len(ids_4g) > 0:
+            selected = ids_4g[0]
             alternatives = [aid for aid in asset_ids if aid != selected]
-            return {
-                'selected_id': selected,
-                'auto_selected': True,
-                'reason': 'Defaulted to 4G (user unspecified)',
-                'alternatives': alternatives
-            }
+            return VariantSelection(
+                selected_id=selected,
+                auto_selected=True,
+                reason='Defaulted to 4G (user unspecified)',
+                alternatives=alternatives,
+            )
 
     # === PRIORITY 3: Truly identical variants -> pick first ===
-    selected = variants.iloc[0]['uae_assetid']
+    selected = variant_ids[0]
     alternatives = asset_ids[1:] if len(asset_ids) > 1 else []
-    return {
-        'selected_id': selected,
-        'auto_selected': True,
-        'reason': 'First ID (variants identical)',
-        'alternatives': alternatives
-    }
+    return VariantSelection(
+        selected_id=selected,
+        auto_selected=True,
+        reason='First ID (variants identical)',
+        alternatives=alternatives,
+    )
 
 
 def verify_critical_attributes(query: str, matched: str) -> bool:
@@ -3351,6 +4016,10 @@ def _verify_critical_attributes_inner(query: str, matched: str) -> bool:
 # Matching logic — recursive brand -> attribute -> fuzzy
 # ---------------------------------------------------------------------------
 
+# A whole model token that is a year (2010-2029), e.g. '2020'
+_YEAR_TOKEN_RE = re.compile(r'^20[12]\d$')
+
+
 def compute_confidence_breakdown(query: str, matched: str) -> dict:
     """
     Compute a diagnostic confidence breakdown for a query->matched pair.
@@ -3399,8 +4068,7 @@ def compute_confidence_breakdown(query: str, matched: str) -> dict:
             # Sets differ — check if difference is significant
             diff = (q_set - m_set) | (m_set - q_set)
             # Filter out year tokens (2014-2026) which are not core model identifiers
-            _year_re = re.compile(r'^20[12]\d$')
-            significant_diff = {t for t in diff if not _year_re.match(t)}
+            significant_diff = {t for t in diff if not _YEAR_TOKEN_RE.match(t)}
             if significant_diff:
                 # Meaningful model difference (e.g., Pro vs Pro Max — extra "max" token)
                 model_match = False
@@ -3501,7 +4169,7 @@ def variant_exact_match(query_attrs: Dict, candidate_attrs: Dict) -> Tuple[bool,
     q_vtokens = extract_variant_tokens(q_text)
     c_vtokens = extract_variant_tokens(c_text)
     if q_vtokens != c_vtokens:
-        mismatches.append(f'variant_tokens:{q_vtokens}!={c_vtokens}')
+        mismatches.append(f'variant_tokens:{_token_set_text(q_vtokens)}!={_token_set_text(c_vtokens)}')
 
     # Watch mm check
     q_mm = query_attrs.get('watch_mm', '')
@@ -3518,6 +4186,19 @@ def variant_exact_match(query_attrs: Dict, candidate_attrs: Dict) -> Tuple[bool,
     return len(mismatches) == 0, mismatches
 
 
+def _token_set_text(tokens) -> str:
+    """
+    repr() of a token set with the items sorted. Set iteration order follows
+    the process's string hash seed, so a plain repr would make reason text
+    differ between runs and between run_matching() worker processes.
+    """
+    return '{' + ', '.join(map(repr, sorted(tokens))) + '}' if tokens else 'set()'
+
+
+# Tablet variant tokens that always distinguish products
+_TABLET_CRITICAL_VARIANTS = frozenset({'pro', 'air', 'mini', 'se', 'lite', 'plus', 'ultra', 'fe', 'kids', 'paper'})
+
+
 def tablet_variant_exact_match(query_attrs: Dict, candidate_attrs: Dict) -> Tuple[bool, List[str]]:
     """
     Strict tablet-specific gate: MATCHED only if core tablet attributes are identical.
@@ -3564,11 +4245,10 @@ def tablet_variant_exact_match(query_attrs: Dict, candidate_attrs: Dict) -> Tupl
     if isinstance(c_vt, (list, tuple)):
         c_vt = set(c_vt)
     # Only check _TABLET_CRITICAL_VARIANTS — these always distinguish products
-    _TABLET_CRITICAL_VARIANTS = {'pro', 'air', 'mini', 'se', 'lite', 'plus', 'ultra', 'fe', 'kids', 'paper'}
-    q_crit = q_vt & _TABLET_CRITICAL_VARIANTS
-    c_crit = c_vt & _TABLET_CRITICAL_VARIANTS
+    q_crit = _TABLET_CRITICAL_VARIANTS.intersection(q_vt)
+    c_crit = _TABLET_CRITICAL_VARIANTS.intersection(c_vt)
     if q_crit != c_crit:
-        mismatches.append(f'tablet_variant:{q_crit}!={c_crit}')
+        mismatches.append(f'tablet_variant:{_token_set_text(q_crit)}!={_token_set_text(c_crit)}')
 
     # tablet_line (pro/se/lite/air) must match — backup check in case variant_tokens missed
     q_tl = query_attrs.get('tablet_line', '')
@@ -3764,7 +4444,7 @@ def mobile_variant_exact_match(query_attrs: Dict, candidate_attrs: Dict) -> Tupl
     q_vtokens = extract_variant_tokens(q_text)
     c_vtokens = extract_variant_tokens(c_text)
     if q_vtokens != c_vtokens:
-        mismatches.append(f'mobile_variant:{q_vtokens}!={c_vtokens}')
+        mismatches.append(f'mobile_variant:{_token_set_text(q_vtokens)}!={_token_set_text(c_vtokens)}')
 
     # --- Samsung Galaxy strict enforcement (Part 4) ---
     # For Samsung Galaxy, enforce exact s-number match (s23 != s24)
@@ -4090,7 +4770,7 @@ def verification_gate(query_norm: str, cand_norm: str) -> Tuple[bool, List[str]]
     q_variants = extract_variant_tokens(query_norm)
     m_variants = extract_variant_tokens(cand_norm)
     if q_variants != m_variants:
-        reasons.append(f'variant_mismatch:{q_variants}->{m_variants}')
+        reasons.append(f'variant_mismatch:{_token_set_text(q_variants)}->{_token_set_text(m_variants)}')
 
     # 7. Hardware model code mismatch (ZE552KL vs ZE520KL, etc.)
     q_code = extract_model_code(query_norm)
@@ -4224,71 +4904,46 @@ def match_laptop_by_attributes(
             return None
 
     # ── Build candidate pool ──────────────────────────────────────────
-    laptop_names = [n for n in search_names if is_laptop_product(n)]
-
-    # Pre-filter by product_line when query specifies one
-    if q_line and laptop_names:
-        line_filtered = []
-        for n in laptop_names:
-            na = extract_laptop_attributes(n, input_brand)
-            nl_pl = na.get('product_line', '')
-            if nl_pl and (nl_pl == q_line or nl_pl in q_line or q_line in nl_pl):
-                line_filtered.append(n)
-        if line_filtered:
-            laptop_names = line_filtered
+    # Hard rejections are applied as numpy masks over the pool's coded
+    # attribute columns; only survivors reach the scoring loop.
+    pool = laptop_candidate_pool(search_names, input_brand)
+    keep = np.ones(len(pool['names']), dtype=bool)
+
+    # Pre-filter by product_line when query specifies one. If no candidate
+    # shares the line, drop only those with a conflicting one
+    # (Air != Pro, Aspire != Predator).
+    if q_line:
+        line_codes = pool['codes']['product_line']
+        line_ok = np.isin(line_codes, _pool_line_codes(pool, q_line))
+        keep = line_ok if line_ok.any() else (line_codes == 0)
+
+    # --- Hard rejections: both sides set and different ---
+    # laptop_family (Swift 3 != Swift 5), model_code (sf314 != sf514),
+    # platform_code (latitude 5420 != 5520), generation, storage, apple_chip;
+    # processor tier and RAM only for Windows.
+    reject_on = [
+        ('laptop_family', q_fam), ('model_code', q_mc), ('platform_code', q_pc),
+        ('generation', q_gen), ('storage', q_storage), ('apple_chip', q_chip),
+    ]
+    if policy != 'APPLE_MACBOOK':
+        reject_on += [('processor', q_proc), ('ram', q_ram)]
+    for field, q_value in reject_on:
+        if q_value:
+            keep &= _pool_compatible(pool, field, q_value)
 
     # ── Cross-join scoring ────────────────────────────────────────────
     scored = []  # list of (score, nl_name, nl_attrs, match_detail)
 
-    for nl_name in laptop_names:
-        nl_attrs = extract_laptop_attributes(nl_name, input_brand)
-        nl_proc = nl_attrs.get('processor', '')
-        nl_gen = nl_attrs.get('generation', '')
-        nl_ram = nl_attrs.get('ram', '')
-        nl_storage = nl_attrs.get('storage', '')
-        nl_line = nl_attrs.get('product_line', '')
-        nl_pc = nl_attrs.get('platform_code', '')
-        nl_fam = nl_attrs.get('laptop_family', '')
-        nl_mc = nl_attrs.get('model_code', '')
-        nl_screen = nl_attrs.get('screen_inches', '')
-        nl_chip = nl_attrs.get('apple_chip', '')
-        nl_year = nl_attrs.get('year', '')
+    pool_names = pool['names']
+    pool_rows = pool['rows']
+    for i in np.flatnonzero(keep):
+        nl_name = pool_names[i]
+        (nl_proc, nl_gen, nl_ram, nl_storage, nl_line, nl_pc,
+         nl_fam, nl_mc, nl_screen, nl_chip, nl_year) = pool_rows[i]
 
         score = 0
         detail = []
 
-        # --- Hard rejections (skip candidate entirely) ---
-        # Product line mismatch (Air != Pro, Aspire != Predator)
-        if q_line and nl_line:
-            if not (q_line == nl_line or q_line in nl_line or nl_line in q_line):
-                continue
-        # Laptop family mismatch (Swift 3 != Swift 5)
-        if q_fam and nl_fam and q_fam != nl_fam:
-            continue
-        # Model code mismatch (sf314 != sf514)
-        if q_mc and nl_mc and q_mc != nl_mc:
-            continue
-        # Platform code mismatch (latitude 5420 != 5520)
-        if q_pc and nl_pc and q_pc != nl_pc:
-            continue
-        # Processor tier mismatch (i5 != i7) — hard reject for Windows
-        if policy != 'APPLE_MACBOOK':
-            if q_proc and nl_proc and q_proc != nl_proc:
-                continue
-        # Generation mismatch — hard reject
-        if q_gen and nl_gen and q_gen != nl_gen:
-            continue
-        # RAM mismatch — hard reject for Windows
-        if policy != 'APPLE_MACBOOK':
-            if q_ram and nl_ram and q_ram != nl_ram:
-                continue
-        # Storage mismatch — hard reject
-        if q_storage and nl_storage and q_storage != nl_storage:
-            continue
-        # Apple chip mismatch — hard reject
-        if q_chip and nl_chip and q_chip != nl_chip:
-            continue
-
         # --- Positive scoring ---
         # Platform code / model code: +100
         if q_pc and nl_pc and q_pc == nl_pc:
@@ -4340,7 +4995,7 @@ def match_laptop_by_attributes(
             detail.append('year')
 
         if score > 0:
-            scored.append((score, nl_name, nl_attrs, detail))
+            scored.append((score, nl_name, extract_laptop_attributes(nl_name, input_brand), detail))
 
     # Sort by score descending
     scored.sort(key=lambda x: -x[0])
@@ -4547,6 +5202,52 @@ def match_laptop_by_attributes(
     }
 
 
+def score_batch(
+    queries: List[str],
+    choices: List[str],
+    score_cutoff: Optional[float] = None,
+    scorer: Callable = fuzz.token_sort_ratio,
+) -> np.ndarray:
+    """
+    Score every query against every choice in one call (token_sort_ratio by default).
+
+    Both sides must already be normalized (no processor is applied). The
+    whole matrix is computed in rapidfuzz's C++ kernel across all cores,
+    instead of one process.extract() round-trip per query.
+
+    Returns:
+        float64 array of shape (len(queries), len(choices)); scores below
+        score_cutoff are 0.
+    """
+    return process.cdist(
+        queries, choices,
+        scorer=scorer, processor=None,
+        score_cutoff=score_cutoff, workers=-1, dtype=np.float64,
+    )
+
+
+def top_matches_batch(
+    queries: List[str],
+    choices: List[str],
+    limit: int = 3,
+    chunk_size: int = 256,
+    scorer: Callable = fuzz.token_sort_ratio,
+) -> List[List[Tuple[str, float]]]:
+    """
+    Batched equivalent of process.extract(query, choices, limit=limit) per query.
+
+    Scores are computed chunk_size queries at a time via score_batch() to
+    bound memory. Ties keep catalog order, same as process.extract.
+    """
+    top = []
+    for start in range(0, len(queries), chunk_size):
+        scores = score_batch(queries[start:start + chunk_size], choices, scorer=scorer)
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :limit]
+        for row_scores, row_order in zip(scores, order):
+            top.append([(choices[j], float(row_scores[j])) for j in row_order])
+    return top
+
+
 def match_single_item(
     query: str,
     nl_lookup: Dict[str, List[str]],
@@ -4561,6 +5262,9 @@ def match_single_item(
     signature_index: Optional[Dict] = None,
     brand_category_index: Optional[Dict] = None,
     widen_mode: str = 'aggressive',
+    category_index: Optional[Dict] = None,
+    exact_index: Optional[Dict] = None,
+    catalog_variants: Optional[CatalogVariants] = None,
 ) -> dict:
     """
     Match a single product against the NL list using hybrid matching.
@@ -4626,6 +5330,8 @@ def match_single_item(
             input_brand, attribute_index, nl_catalog, original_input,
             input_category, no_match_result, signature_index=signature_index,
             brand_category_index=brand_category_index, widen_mode=widen_mode,
+            category_index=category_index, exact_index=exact_index,
+            catalog_variants=catalog_variants,
         )
         result['_input_category'] = input_category or ''
         return _enforce_gate(result, query)
@@ -4637,18 +5343,22 @@ def _match_single_item_inner(
     query, nl_lookup, nl_names, threshold, brand_index,
     input_brand, attribute_index, nl_catalog, original_input,
     input_category, no_match_result, signature_index=None,
-    brand_category_index=None, widen_mode='aggressive',
+    brand_category_index=None, widen_mode='aggressive', category_index=None,
+    exact_index=None,
+    catalog_variants=None,
 ) -> dict:
     """Inner implementation of match_single_item (wrapped by try/except)."""
     # --- Level 0: Attribute-based matching (FAST PATH) ---
     if attribute_index and input_brand:
-        attr_match = try_attribute_match(query, input_brand, attribute_index, nl_catalog, original_input)
+        attr_match = try_attribute_match(query, input_brand, attribute_index, nl_catalog, original_input,
+                                         catalog_variants)
         if attr_match:
             return attr_match  # Found exact match, skip fuzzy entirely
 
     # --- Level 0.5: Signature-based matching (deterministic variant resolution) ---
     if signature_index and input_brand:
-        sig_match = try_signature_match(query, input_brand, signature_index, nl_catalog, original_input)
+        sig_match = try_signature_match(query, input_brand, signature_index, nl_catalog, original_input,
+                                        catalog_variants)
         if sig_match:
             return sig_match
 
@@ -4708,10 +5418,7 @@ def _match_single_item_inner(
                     fallback_source = 'global_pool'
 
                 if fallback_names:
-                    top3 = process.extract(
-                        query, fallback_names,
-                        scorer=fuzz.token_sort_ratio, limit=3,
-                    )
+                    top3 = _token_sort_extract(query, fallback_names, 3)
                     if top3 and top3[0][1] >= 70:
                         best_name, best_score, _ = top3[0]
                         fb_ids = fallback_lookup.get(best_name, [])
@@ -4738,7 +5445,10 @@ def _match_single_item_inner(
             search_names = brand_data['names']
 
         if query_category != 'other':
-            category_filtered = [n for n in search_names if extract_category(n) == query_category]
+            if search_names is nl_names and category_index is not None:
+                category_filtered = category_index.get(query_category, [])
+            else:
+                category_filtered = [n for n in search_names if extract_category(n) == query_category]
             if category_filtered:
                 search_names = category_filtered
             else:
@@ -4762,12 +5472,9 @@ def _match_single_item_inner(
         # LAPTOP FALLBACK: brand-filtered fuzzy within laptop candidates only.
         # Returns REVIEW_REQUIRED (never MATCHED) with top-3 alternatives.
         # V2: use the cleaned query for better fuzzy scoring.
-        laptop_candidates = [n for n in search_names if is_laptop_product(n)]
+        laptop_candidates = laptop_candidate_pool(search_names, input_brand)['names']
         if laptop_candidates:
-            top_matches = process.extract(
-                query_laptop_norm, laptop_candidates,
-                scorer=fuzz.token_sort_ratio, limit=3,
-            )
+            top_matches = _token_sort_extract(query_laptop_norm, laptop_candidates, 3)
             if top_matches and top_matches[0][1] >= threshold:
                 best_name, best_score, _ = top_matches[0]
                 asset_ids = search_lookup.get(best_name, [])
@@ -4821,12 +5528,16 @@ def _match_single_item_inner(
     if not brand_norm and query_category == 'other':
         effective_threshold = max(threshold, HIGH_CONFIDENCE_THRESHOLD)
 
-    result = process.extractOne(
-        query,
-        search_names,
-        scorer=fuzz.token_sort_ratio,
-        score_cutoff=effective_threshold,
-    )
+    # Identical-after-normalize fast path: a candidate with the same sorted tokens
+    # scores 100, so when exactly one is in play it is what extractOne would return.
+    # Several in play -> extractOne decides (it keeps the first in list order).
+    result = None
+    if exact_index is not None:
+        exact_names = [n for n in exact_index.get(_token_sort_key(query), ()) if n in search_names]
+        if len(exact_names) == 1:
+            result = (exact_names[0], 100.0, search_names.index(exact_names[0]))
+    if result is None:
+        result = _token_sort_extract_one(query, search_names, effective_threshold)
 
     # If brand-filtered search found nothing, fall back to full NL search
     # BUT re-apply category filtering to prevent cross-category matches
@@ -4834,19 +5545,17 @@ def _match_single_item_inner(
         # Re-apply category filtering to full NL catalog
         fallback_names = nl_names
         if query_category != 'other':
-            category_filtered = [n for n in fallback_names if extract_category(n) == query_category]
+            if category_index is not None:
+                category_filtered = category_index.get(query_category, [])
+            else:
+                category_filtered = [n for n in fallback_names if extract_category(n) == query_category]
             if category_filtered:
                 fallback_names = category_filtered
             else:
                 # No same-category products in entire catalog -> return NO_MATCH
                 return no_match_result
 
-        result = process.extractOne(
-            query,
-            fallback_names,
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=effective_threshold,
-        )
+        result = _token_sort_extract_one(query, fallback_names, effective_threshold)
         search_lookup = nl_lookup  # use full lookup for ID resolution
 
     if result is None:
@@ -4854,11 +5563,7 @@ def _match_single_item_inner(
         # Only attempt if threshold is the default (don't override raised thresholds)
         near_miss_cutoff = 80
         if effective_threshold <= SIMILARITY_THRESHOLD and widen_mode != 'conservative':
-            near_miss_result = process.extractOne(
-                query, search_names,
-                scorer=fuzz.token_sort_ratio,
-                score_cutoff=near_miss_cutoff,
-            )
+            near_miss_result = _token_sort_extract_one(query, search_names, near_miss_cutoff)
             if near_miss_result is not None:
                 nm_match, nm_score, _ = near_miss_result
                 nm_ids = search_lookup.get(nm_match, [])
@@ -4868,11 +5573,7 @@ def _match_single_item_inner(
                 if gate_pass and nm_ids:
                     # Gate passed: surface as REVIEW_REQUIRED (never auto-MATCHED)
                     # Get top3 candidates for human reviewer
-                    top3 = process.extract(
-                        query, search_names,
-                        scorer=fuzz.token_sort_ratio,
-                        limit=3,
-                    )
+                    top3 = _token_sort_extract(query, search_names, 3)
                     alternatives = [{'name': n, 'score': round(s, 2)} for n, s, _ in top3]
                     return {
                         'mapped_uae_assetid': ', '.join(nm_ids),
@@ -4967,7 +5668,7 @@ def _match_single_item_inner(
                 'selection_reason': '',
                 'alternatives': [],
             }
-        top3 = process.extract(query, search_names, scorer=fuzz.token_sort_ratio, limit=3)
+        top3 = _token_sort_extract(query, search_names, 3)
         alts = [{'name': n, 'score': round(s, 2)} for n, s, _ in top3]
         return {
             'mapped_uae_assetid': ', '.join(asset_ids),
@@ -5001,18 +5702,18 @@ def _match_single_item_inner(
             # Auto-select best variant based on user's exact specs
             # Use original_input (before normalization) to detect 5G/4G/years correctly
             user_input_for_auto_select = original_input if original_input else query
-            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
+            selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
 
             return {
-                'mapped_uae_assetid': selection['selected_id'],
+                'mapped_uae_assetid': selection.selected_id,
                 'match_score': score_rounded,
                 'match_status': MATCH_STATUS_MATCHED,  # Auto-selected -> MATCHED
                 'confidence': confidence,
                 'matched_on': best_match,
                 'method': 'fuzzy_auto_selected',
-                'auto_selected': selection['auto_selected'],
-                'selection_reason': selection['reason'],
-                'alternatives': selection['alternatives'],
+                'auto_selected': selection.auto_selected,
+                'selection_reason': selection.reason,
+                'alternatives': selection.alternatives,
             }
         else:
             # Single match or no catalog provided
@@ -5044,17 +5745,17 @@ def _match_single_item_inner(
                 # Safe to upgrade — the match is correct, just scored slightly below 90
                 if len(asset_ids) > 1 and nl_catalog is not None:
                     user_input_for_auto_select = original_input if original_input else query
-                    selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
+                    selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
                     return {
-                        'mapped_uae_assetid': selection['selected_id'],
+                        'mapped_uae_assetid': selection.selected_id,
                         'match_score': score_rounded,
                         'match_status': MATCH_STATUS_MATCHED,
                         'confidence': CONFIDENCE_MEDIUM,
                         'matched_on': best_match,
                         'method': 'fuzzy_soft_upgrade_auto_selected',
-                        'auto_selected': selection['auto_selected'],
-                        'selection_reason': selection['reason'],
-                        'alternatives': selection['alternatives'],
+                        'auto_selected': selection.auto_selected,
+                        'selection_reason': selection.reason,
+                        'alternatives': selection.alternatives,
                     }
                 else:
                     return {
@@ -5092,18 +5793,18 @@ def _match_single_item_inner(
             # Check for auto-select if multiple IDs
             if len(asset_ids) > 1 and nl_catalog is not None:
                 user_input_for_auto_select = original_input if original_input else query
-                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog)
+                selection = auto_select_matching_variant(user_input_for_auto_select, asset_ids, nl_catalog, catalog_variants)
 
                 return {
-                    'mapped_uae_assetid': selection['selected_id'],
+                    'mapped_uae_assetid': selection.selected_id,
                     'match_score': score_rounded,
                     'match_status': MATCH_STATUS_MATCHED,
                     'confidence': confidence,
                     'matched_on': best_match,
                     'method': 'fuzzy_verified_auto_selected',
-                    'auto_selected': selection['auto_selected'],
-                    'selection_reason': selection['reason'],
-                    'alternatives': selection['alternatives'],
+                    'auto_selected': selection.auto_selected,
+                    'selection_reason': selection.reason,
+                    'alternatives': selection.alternatives,
                 }
             else:
                 return {
@@ -5287,8 +5988,12 @@ def run_matching(
                 brand_category_index[bc_key]['names'].append(name)
                 if name in brand_data['lookup']:
                     brand_category_index[bc_key]['lookup'][name] = brand_data['lookup'][name]
+    category_index = build_category_index(nl_names)
+    exact_index = build_exact_index(nl_names)
+    catalog_variants = build_catalog_variants(nl_catalog) if nl_catalog is not None else None
 
     results = []
+    top3_pending = []  # (position in results, query) for diagnostic top-3 rows
     for idx, row in df.iterrows():
         no_match_reason = ''
         query = ''
@@ -5373,7 +6078,7 @@ def run_matching(
                 if not no_match_reason:
                     no_match_reason = 'EMPTY_PRODUCT_NAME'
             else:
-                query = build_match_string(input_brand, original_product_name)
+                query = _build_match_string_fast(input_brand, original_product_name)
                 match_result = match_single_item(
                     query, nl_lookup, nl_names, threshold,
                     brand_index=brand_index,
@@ -5385,6 +6090,9 @@ def run_matching(
                     signature_index=signature_index,
                     brand_category_index=brand_category_index,
                     widen_mode=widen_mode,
+                    category_index=category_index,
+                    exact_index=exact_index,
+                    catalog_variants=catalog_variants,
                 )
                 # Set no_match_reason based on result (V2 enhanced reason codes)
                 if match_result.get('match_status') == MATCH_STATUS_NO_MATCH and not no_match_reason:
@@ -5494,7 +6202,7 @@ def run_matching(
                 _bucket_names = nl_names
                 _bucket_lookup = nl_lookup
             try:
-                _top5 = process.extract(query, _bucket_names, scorer=fuzz.token_sort_ratio, limit=5)
+                _top5 = _token_sort_extract(query, _bucket_names, 5)
                 for _cn, _cs, _ in _top5:
                     if len(blocked_cands) >= 3:
                         break
@@ -5631,37 +6339,33 @@ def run_matching(
             match_result['query_model_tokens'] = str(extract_model_tokens(query))
             match_result['matched_model_tokens'] = str(extract_model_tokens(matched_on)) if matched_on else '[]'
             # Canonical/signature diagnostic columns
-            q_attrs = extract_product_attributes(query, input_brand)
-            q_sig = build_variant_signature(q_attrs)
-            match_result['canonical_key_query'] = q_sig
+            match_result['canonical_key_query'] = variant_signature(query, input_brand)
             if matched_on:
-                m_attrs = extract_product_attributes(matched_on, input_brand)
-                m_sig = build_variant_signature(m_attrs)
-                match_result['canonical_key_match'] = m_sig
+                match_result['canonical_key_match'] = variant_signature(matched_on, input_brand)
             else:
                 match_result['canonical_key_match'] = ''
             match_result['canonical_match_used'] = match_result.get('method', '') == 'signature'
             # verification_pass and verification_reasons already set above (unconditional)
-            # Top3 candidates for REVIEW/NO_MATCH only (expensive)
+            # Top3 candidates for REVIEW/NO_MATCH only (expensive — scored in one
+            # batch after the loop)
+            for i in range(1, 4):
+                match_result[f'top{i}_name'] = ''
+                match_result[f'top{i}_score'] = 0.0
             if match_result.get('match_status') in (MATCH_STATUS_SUGGESTED, MATCH_STATUS_NO_MATCH):
-                top3 = process.extract(query, nl_names, scorer=fuzz.token_sort_ratio, limit=3)
-                for i, (name, sc, _) in enumerate(top3, 1):
-                    match_result[f'top{i}_name'] = name
-                    match_result[f'top{i}_score'] = round(sc, 2)
-                # Pad if fewer than 3
-                for i in range(len(top3) + 1, 4):
-                    match_result[f'top{i}_name'] = ''
-                    match_result[f'top{i}_score'] = 0.0
-            else:
-                for i in range(1, 4):
-                    match_result[f'top{i}_name'] = ''
-                    match_result[f'top{i}_score'] = 0.0
+                top3_pending.append((len(results), query))
 
         results.append(match_result)
 
         if progress_callback and (len(results) % 50 == 0 or len(results) == total):
             progress_callback(len(results), total)
 
+    if top3_pending:
+        top3_all = top_matches_batch([q for _, q in top3_pending], nl_names, limit=3)
+        for (pos, _), top3 in zip(top3_pending, top3_all):
+            for i, (name, sc) in enumerate(top3, 1):
+                results[pos][f'top{i}_name'] = name
+                results[pos][f'top{i}_score'] = round(sc, 2)
+
     results_df = pd.DataFrame(results)
     df['original_input'] = results_df['original_input'].values
     df['mapped_uae_assetid'] = results_df['mapped_uae_assetid'].values
@@ -5906,12 +6610,7 @@ def test_single_match(
         search_lookup = brand_index[brand_norm]['lookup']
 
     # Get top 3 matches from the brand-scoped search
-    top_matches = process.extract(
-        query,
-        search_names,
-        scorer=fuzz.token_sort_ratio,
-        limit=3,
-    )
+    top_matches = _token_sort_extract(query, search_names, 3)
 
     alternatives = []
     for match_name, score, _ in top_matches:
@@ -0,0 +1,72 @@
+"""Test that the on-disk attribute index is rebuilt whenever it could be stale."""
+import os
+
+import pandas as pd
+import pytest
+
+import matcher_v1
+from matcher import build_attribute_index, load_or_build_attribute_index
+
+
+@pytest.fixture
+def catalog():
+    df = pd.read_parquet(matcher_v1.NL_DATA_PATH)
+    return df.head(200).reset_index(drop=True)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Count build_attribute_index() calls made by load_or_build_attribute_index()."""
+    calls = []
+
+    def counting_build(df):
+        calls.append(len(df))
+        return build_attribute_index(df)
+
+    monkeypatch.setattr(matcher_v1, 'build_attribute_index', counting_build)
+    return calls
+
+
+def test_reuses_index_for_unchanged_catalog(tmp_path, catalog, builds):
+    path = str(tmp_path / 'nl_attribute_index.pkl')
+    first = load_or_build_attribute_index(catalog, path)
+    second = load_or_build_attribute_index(catalog.copy(), path)
+    assert len(builds) == 1
+    assert second == first == build_attribute_index(catalog)
+
+
+def test_rebuilds_after_one_catalog_row_changes(tmp_path, catalog, builds):
+    path = str(tmp_path / 'nl_attribute_index.pkl')
+    load_or_build_attribute_index(catalog, path)
+
+    changed = catalog.copy()
+    changed.loc[0, 'uae_assetid'] = 'changed-asset-id'
+    index = load_or_build_attribute_index(changed, path)
+
+    assert len(builds) == 2
+    assert index == build_attribute_index(changed)
+    # The rebuilt index replaced the stale file
+    assert load_or_build_attribute_index(changed, path) == index
+    assert len(builds) == 2
+
+
+def test_corrupt_file_falls_back_to_rebuild(tmp_path, catalog, builds):
+    path = tmp_path / 'nl_attribute_index.pkl'
+    path.write_bytes(b'not a pickle')
+
+    index = load_or_build_attribute_index(catalog, str(path))
+
+    assert len(builds) == 1
+    assert index == build_attribute_index(catalog)
+    assert load_or_build_attribute_index(catalog, str(path)) == index
+    assert len(builds) == 1
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, catalog, monkeypatch):
+    def failing_dump(*args, **kwargs):
+        raise TypeError('cannot pickle')
+
+    monkeypatch.setattr(matcher_v1.pickle, 'dump', failing_dump)
+    with pytest.raises(TypeError):
+        load_or_build_attribute_index(catalog, str(tmp_path / 'nl_attribute_index.pkl'))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,50 @@
+"""Test that sharded run_matching(n_jobs>1) returns exactly the single-process result."""
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import matcher
+from matcher import (
+    build_attribute_index,
+    build_brand_index,
+    build_nl_lookup,
+    build_signature_index,
+    load_nl_reference,
+    parse_asset_sheets,
+    run_matching,
+)
+
+ASSET_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Asset Mapping Lists.xlsx')
+
+
+@pytest.fixture(scope='module')
+def nl():
+    df_nl_clean, _ = load_nl_reference()
+    nl_lookup = build_nl_lookup(df_nl_clean)
+    return dict(
+        nl_lookup=nl_lookup,
+        nl_names=list(nl_lookup.keys()),
+        brand_index=build_brand_index(df_nl_clean),
+        attribute_index=build_attribute_index(df_nl_clean),
+        signature_index=build_signature_index(df_nl_clean),
+        nl_catalog=df_nl_clean,
+    )
+
+
+@pytest.mark.parametrize('engine', ['v1', 'v2'])
+def test_sharded_matching_equals_single_process(nl, engine):
+    with open(ASSET_FILE, 'rb') as f:
+        info = parse_asset_sheets(f)['List 1']
+    n_rows = matcher._MIN_ROWS_PER_JOB * 2 + 1
+    df_input = info['df'].head(n_rows)
+    assert len(df_input) == n_rows
+
+    kwargs = dict(df_input=df_input, brand_col=info['brand_col'], name_col=info['name_col'],
+                  engine=engine, **nl)
+    single = run_matching(n_jobs=1, **kwargs)
+    sharded = run_matching(n_jobs=2, **kwargs)
+
+    assert_frame_equal(sharded, single)
+    assert sharded.index.equals(df_input.index)